@@ -0,0 +1,266 @@
+"""Blob store for attached documents, so graph state carries small descriptors instead of file bytes.
+
+A document attached to a request arrives as base64 ``data``; the graph's
+first node writes it to the blob store, off the event loop, and state keeps
+only a descriptor ``{blob_id, name, mimetype, size, sha256}``. Every later
+checkpoint, subgraph call and trace then copies a few hundred bytes instead
+of the file. Consumers such as ``pre_process_documents`` read the bytes back
+when they need them. Blobs are content-addressed, so requests attaching the
+same file share one blob; none of them deletes it, it is swept once it has
+not been stored again for KB_BLOB_STORE_TTL seconds.
+
+The default ``FileBlobStore`` keeps content-addressed files under
+KB_BLOB_STORE_PATH and serves them through read-only memory maps, so reads
+do not copy the file. ``MemoryBlobStore`` (KB_BLOB_STORE=memory) keeps
+blobs in the process, for development and single-process runs.
+"""
+
+import binascii
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+# A multiple of 3, so chunks base64 encode without carrying bytes over to the next one
+CHUNK_SIZE = 192 * 1024
+
+
+def iter_base64_decoded(base64_content: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Decode base64 text into chunks of about ``chunk_size`` bytes, never the whole document at once."""
+
+    step = chunk_size // 3 * 4
+    pending = ""
+    for start in range(0, len(base64_content), step):
+        text = pending + "".join(base64_content[start:start + step].split())
+        usable = len(text) - len(text) % 4
+        pending = text[usable:]
+        if usable:
+            yield binascii.a2b_base64(text[:usable])
+    if pending:
+        raise binascii.Error("Incomplete base64 data")
+
+
+def is_blob_descriptor(document: Dict[str, Any]) -> bool:
+    return "blob_id" in document and "data" not in document
+
+
+class BlobStore(ABC):
+    """Content-addressed store of document bytes; a blob's id is the SHA-256 of its content."""
+
+    @abstractmethod
+    def put(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        """Store the bytes given in ``chunks``; returns ``{'blob_id', 'size', 'sha256'}``."""
+
+    @abstractmethod
+    def open(self, blob_id: str) -> ContextManager[memoryview]:
+        """Give read access to a blob's bytes for the duration of the ``with`` block."""
+
+    @abstractmethod
+    def exists(self, blob_id: str) -> bool:
+        """Whether a blob with this id is stored."""
+
+    @abstractmethod
+    def delete(self, blob_id: str) -> None:
+        """Remove a blob; removing one that is not stored does nothing."""
+
+    @abstractmethod
+    def sweep(self, max_age: float) -> int:
+        """Remove blobs last stored more than ``max_age`` seconds ago; returns how many were removed."""
+
+    def iter_chunks(self, blob_id: str, chunk_size: int = CHUNK_SIZE) -> Iterator[memoryview]:
+        """Slices of a blob, read in order; no slice should be kept past the next one."""
+
+        with self.open(blob_id) as content:
+            for start in range(0, len(content), chunk_size):
+                yield content[start:start + chunk_size]
+
+
+class MemoryBlobStore(BlobStore):
+    """Blobs kept in memory, visible to this process only."""
+
+    def __init__(self):
+        # blob_id -> (content, stored_at)
+        self._blobs: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        content = b"".join(chunks)
+        blob_id = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            self._blobs[blob_id] = (content, time.time())
+        return {'blob_id': blob_id, 'size': len(content), 'sha256': blob_id}
+
+    @contextmanager
+    def open(self, blob_id: str) -> Iterator[memoryview]:
+        with self._lock:
+            blob = self._blobs.get(blob_id)
+        if blob is None:
+            raise FileNotFoundError(f"Blob not found: {blob_id}")
+        yield memoryview(blob[0])
+
+    def exists(self, blob_id: str) -> bool:
+        with self._lock:
+            return blob_id in self._blobs
+
+    def delete(self, blob_id: str) -> None:
+        with self._lock:
+            self._blobs.pop(blob_id, None)
+
+    def sweep(self, max_age: float) -> int:
+        cutoff = time.time() - max_age
+        with self._lock:
+            expired = [blob_id for blob_id, (_, stored_at) in self._blobs.items() if stored_at < cutoff]
+            for blob_id in expired:
+                del self._blobs[blob_id]
+        return len(expired)
+
+
+class FileBlobStore(BlobStore):
+    """Blobs as files under ``root``, named by their SHA-256 and read through memory maps.
+
+    Writes go to a temporary file renamed into place, so a blob is either
+    complete or absent, and storing the same content twice keeps one file
+    (whose age then restarts, as far as ``sweep`` is concerned).
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, blob_id: str) -> Path:
+        if len(blob_id) != 64 or not all(c in "0123456789abcdef" for c in blob_id):
+            raise ValueError(f"Invalid blob id: {blob_id}")
+        return self.root / blob_id[:2] / blob_id
+
+    def put(self, chunks: Iterable[bytes]) -> Dict[str, Any]:
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".incoming-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            blob_id = digest.hexdigest()
+            path = self._path(blob_id)
+            if path.exists():
+                os.remove(temp_path)
+                os.utime(path)
+            else:
+                path.parent.mkdir(exist_ok=True)
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return {'blob_id': blob_id, 'size': size, 'sha256': blob_id}
+
+    @contextmanager
+    def open(self, blob_id: str) -> Iterator[memoryview]:
+        with open(self._path(blob_id), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files cannot be memory mapped
+                yield memoryview(b"")
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+                try:
+                    mapped.close()
+                except BufferError:
+                    # A caller still holds a slice; the map is closed once that is released
+                    pass
+
+    def exists(self, blob_id: str) -> bool:
+        return self._path(blob_id).exists()
+
+    def delete(self, blob_id: str) -> None:
+        try:
+            os.remove(self._path(blob_id))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, max_age: float) -> int:
+        cutoff = time.time() - max_age
+        removed = 0
+        # Blobs, and temporary files of writes that never finished
+        for path in [*self.root.glob("??/*"), *self.root.glob(".incoming-*")]:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+_store: Optional[BlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Return the process-wide blob store chosen by KB_BLOB_STORE ("file" or "memory")."""
+
+    global _store
+    with _store_lock:
+        if _store is None:
+            if os.getenv("KB_BLOB_STORE", "file") == "memory":
+                _store = MemoryBlobStore()
+            else:
+                _store = FileBlobStore(os.getenv("KB_BLOB_STORE_PATH", str(BASE_DIR / 'document_blobs')))
+        return _store
+
+
+def store_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    """Write an attached document's base64 ``data`` to the blob store and return its descriptor.
+
+    Descriptors (and anything without ``data``) are returned unchanged.
+    """
+
+    if "data" not in document:
+        return document
+    stored = get_blob_store().put(iter_base64_decoded(document["data"]))
+    return {'blob_id': stored['blob_id'], 'name': document.get('name'), 'mimetype': document.get('mimetype'),
+            'size': stored['size'], 'sha256': stored['sha256']}
+
+
+def store_documents(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Store the inline data of attached documents; a document that cannot be stored is kept as it came."""
+
+    stored = []
+    for document in documents:
+        try:
+            stored.append(store_document(document))
+        except (binascii.Error, ValueError, OSError) as e:
+            # Ingestion reads inline data too, and reports the document if it is unusable
+            logger.warning("Could not store '%s' in the blob store, keeping it inline: %s", document.get('name'), e)
+            stored.append(document)
+    return stored
+
+
+def sweep_expired_blobs() -> int:
+    """Remove blobs older than KB_BLOB_STORE_TTL seconds (default a day; 0 keeps them); returns how many."""
+
+    ttl = float(os.getenv("KB_BLOB_STORE_TTL", "86400"))
+    if ttl <= 0:
+        return 0
+    removed = get_blob_store().sweep(ttl)
+    if removed:
+        logger.info("Removed %d expired document blobs", removed)
+    return removed
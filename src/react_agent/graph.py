@@ -18,6 +18,7 @@ from langgraph.runtime import Runtime
 from langfuse.langchain import CallbackHandler
 
 from react_agent.context import Context
+from react_agent.knowledge_base import get_knowledge_base_client
 from react_agent.state import InputState, State, remove_messages_in_state, get_file_binary_list
 from react_agent.tools import TOOLS
 from react_agent.utils import load_chat_model
@@ -52,6 +53,8 @@ def pre_process_documents(state: State):
  
           if response.status_code == 200:
                result = response.json
+               # Cached searches may not know about the new document yet
+               get_knowledge_base_client().invalidate_cache()
                return f"Document processed sucessfully: '{filename}'"
           else:
                return f"Failed to process document: '{filename}'. API returned status code:{response.status_code}"
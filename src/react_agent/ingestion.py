@@ -0,0 +1,280 @@
+"""Upload attached documents to the document processing API, which stores them in the knowledge base.
+
+Documents of a request are uploaded concurrently over one pooled ``httpx``
+client, at most KB_UPLOAD_CONCURRENCY at a time, and each upload reports
+its own outcome and timing. Documents whose content is already in the
+ingestion ledger are skipped, and report the source they were stored under.
+
+By default a document is posted as base64 inside JSON. With
+KB_UPLOAD_MODE=multipart its bytes are instead decoded from base64 a chunk
+at a time and streamed as a chunked ``multipart/form-data`` body, so the
+upload is a quarter smaller and no decoded or JSON-encoded copy of the
+whole file is held in memory. Documents kept in the blob store (descriptors
+with a ``blob_id``) are read straight from it in either mode.
+"""
+
+import asyncio
+import binascii
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, replace
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from react_agent.blob_store import (
+    get_blob_store,
+    is_blob_descriptor,
+    iter_base64_decoded,
+)
+from react_agent.ingestion_ledger import document_hash, get_ingestion_ledger
+from react_agent.knowledge_base import get_knowledge_base_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DocumentUploadResult:
+    """Outcome of uploading one document; ``status`` is "processed", "skipped", "failed" or "error".
+
+    ``source`` is what the knowledge base stored the document under, usable
+    as the source filter of searches.
+    """
+
+    filename: str
+    status: str
+    message: str
+    elapsed: float
+    status_code: Optional[int] = None
+    sha256: Optional[str] = None
+    source: Optional[str] = None
+    ingestion_id: Optional[str] = None
+    bytes_sent: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _stored_as(response: httpx.Response, filename: str) -> tuple:
+    """The source and id the processing API stored a document under; the source defaults to its filename."""
+
+    try:
+        body = response.json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict):
+        return filename, None
+    ingestion_id = next((body[key] for key in ('document_id', 'ingestion_id', 'id') if body.get(key)), None)
+    return body.get('source') or body.get('filename') or filename, str(ingestion_id) if ingestion_id else None
+
+
+def _content_hash(document: Dict[str, Any]) -> Optional[str]:
+    if is_blob_descriptor(document):
+        return document.get("sha256")
+    try:
+        return document_hash(iter_base64_decoded(document["data"]))
+    except (binascii.Error, ValueError, TypeError):
+        return None
+
+
+def _file_chunks(document: Dict[str, Any]) -> Iterable[bytes]:
+    """The document's bytes in chunks, from the blob store or decoded from its inline base64."""
+
+    if is_blob_descriptor(document):
+        return get_blob_store().iter_chunks(document["blob_id"])
+    return iter_base64_decoded(document["data"])
+
+
+def _form_field(boundary: str, name: str, value: str) -> bytes:
+    return (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n').encode()
+
+
+async def _multipart_body(boundary: str, chunks: Iterable[bytes], filename: str, content_type: str,
+                          sent: List[int]) -> AsyncIterator[bytes]:
+    """Stream the multipart form: filename and content_type fields, then the decoded file as ``file``."""
+
+    quoted = filename.replace('"', '%22')
+    parts = [_form_field(boundary, "filename", filename), _form_field(boundary, "content_type", content_type),
+             (f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{quoted}"\r\n'
+              f'Content-Type: {content_type}\r\n\r\n').encode()]
+    for part in parts:
+        sent[0] += len(part)
+        yield part
+    for chunk in chunks:
+        sent[0] += len(chunk)
+        yield chunk
+        # Let other uploads run between chunks
+        await asyncio.sleep(0)
+    closing = f'\r\n--{boundary}--\r\n'.encode()
+    sent[0] += len(closing)
+    yield closing
+
+
+def _json_body_parts(filename: str, content_type: str) -> tuple:
+    """The JSON upload body around ``file_data``, so the base64 text can be streamed in between."""
+
+    prefix = '{"filename": %s, "file_data": "' % json.dumps(filename)
+    suffix = '", "content_type": %s}' % json.dumps(content_type)
+    return prefix.encode(), suffix.encode()
+
+
+async def _json_body(chunks: Iterable[bytes], prefix: bytes, suffix: bytes) -> AsyncIterator[bytes]:
+    """Stream the JSON upload body, base64 encoding the file a chunk at a time."""
+
+    yield prefix
+    pending = b""
+    for chunk in chunks:
+        data = pending + bytes(chunk) if pending else chunk
+        usable = len(data) - len(data) % 3
+        pending = bytes(data[usable:])
+        yield binascii.b2a_base64(data[:usable], newline=False)
+        # Let other uploads run between chunks
+        await asyncio.sleep(0)
+    if pending:
+        yield binascii.b2a_base64(pending, newline=False)
+    yield suffix
+
+
+async def upload_document(client: httpx.AsyncClient, api_endpoint: str, document: Dict[str, Any],
+                          mode: str = "json") -> DocumentUploadResult:
+    """Send one document to the processing API, as JSON or as a streamed multipart form.
+
+    ``document`` holds either inline base64 ``data`` or a blob store descriptor.
+    """
+
+    filename, content_type = document["name"], document["mimetype"]
+    started = time.perf_counter()
+    try:
+        if mode == "multipart":
+            boundary = uuid.uuid4().hex
+            sent = [0]
+            response = await client.post(
+                api_endpoint,
+                content=_multipart_body(boundary, _file_chunks(document), filename, content_type, sent),
+                headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+            bytes_sent = sent[0]
+        elif is_blob_descriptor(document):
+            # Same body as below, encoded while it is sent; its length is known from the blob size
+            prefix, suffix = _json_body_parts(filename, content_type)
+            bytes_sent = len(prefix) + 4 * -(-document["size"] // 3) + len(suffix)
+            response = await client.post(
+                api_endpoint,
+                content=_json_body(_file_chunks(document), prefix, suffix),
+                headers={"Content-Type": "application/json", "Content-Length": str(bytes_sent)})
+        else:
+            base64_content = document["data"]
+            payload = {
+                "filename": filename,
+                "file_data": base64_content,
+                "content_type": content_type
+            }
+            response = await client.post(api_endpoint, json=payload, headers={"Content-Type": "application/json"})
+            bytes_sent = int(response.request.headers.get("Content-Length", 0))
+
+        if response.status_code == 200:
+            source, ingestion_id = _stored_as(response, filename)
+            return DocumentUploadResult(filename, "processed", f"Document processed sucessfully: '{filename}'",
+                                        time.perf_counter() - started, response.status_code,
+                                        source=source, ingestion_id=ingestion_id, bytes_sent=bytes_sent)
+        return DocumentUploadResult(filename, "failed",
+                                    f"Failed to process document: '{filename}'. "
+                                    f"API returned status code:{response.status_code}",
+                                    time.perf_counter() - started, response.status_code, bytes_sent=bytes_sent)
+    except Exception as e:
+        return DocumentUploadResult(filename, "error", f"Error processing document ' {filename}' : {str(e)}",
+                                    time.perf_counter() - started)
+
+
+async def ingest_documents(documents: List[Dict[str, Any]], concurrency: Optional[int] = None,
+                           on_result: Optional[Callable[[DocumentUploadResult], None]] = None
+                           ) -> List[DocumentUploadResult]:
+    """Upload ``documents`` (blob store descriptors, or dicts with base64 ``data``, ``name`` and ``mimetype``) concurrently.
+
+    Results come back in the order of ``documents``; ``on_result`` is called
+    as each upload finishes. Documents with content already in the ingestion
+    ledger, or earlier in ``documents``, are not uploaded again. Cached
+    knowledge base searches are dropped once any document was processed.
+    """
+
+    if not documents:
+        return []
+
+    # "json" (base64 in the body) or "multipart" (streamed raw bytes; the API must accept a "file" form field)
+    mode = os.getenv("KB_UPLOAD_MODE", "json")
+    api_endpoint = os.getenv("DOC_API_ENDPOINT_UPLOAD")
+    if mode == "multipart":
+        api_endpoint = os.getenv("DOC_API_ENDPOINT_UPLOAD_MULTIPART", api_endpoint)
+    concurrency = concurrency or int(os.getenv("KB_UPLOAD_CONCURRENCY", "4"))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    timeout = httpx.Timeout(float(os.getenv("KB_UPLOAD_TIMEOUT", "300")),
+                            connect=float(os.getenv("KB_CONNECT_TIMEOUT", "5")))
+
+    ledger = get_ingestion_ledger()
+    uploads: Dict[str, asyncio.Future] = {}
+
+    async with httpx.AsyncClient(timeout=timeout, limits=httpx.Limits(max_connections=concurrency)) as client:
+
+        async def upload(document: Dict[str, Any], sha256: Optional[str]) -> DocumentUploadResult:
+            async with semaphore:
+                result = await upload_document(client, api_endpoint, document, mode)
+            result.sha256 = sha256
+            if result.status == "processed" and ledger is not None and sha256 is not None:
+                ledger.record(sha256, result.filename, document["mimetype"], result.source, result.ingestion_id)
+            return result
+
+        async def ingest(document: Dict[str, Any]) -> DocumentUploadResult:
+            started = time.perf_counter()
+            sha256 = await asyncio.to_thread(_content_hash, document) if ledger is not None else None
+            entry = ledger.get(sha256) if sha256 is not None else None
+
+            if entry is None and sha256 in uploads:
+                # The same content attached twice: wait for the first upload instead of sending it again
+                first = await asyncio.shield(uploads[sha256])
+                if first.status != "processed":
+                    return replace(first, filename=document["name"], elapsed=time.perf_counter() - started)
+                entry = {'source': first.source, 'ingestion_id': first.ingestion_id}
+
+            if entry is not None:
+                return DocumentUploadResult(document["name"], "skipped",
+                                            f"Document already processed: '{document['name']}'",
+                                            time.perf_counter() - started, sha256=sha256,
+                                            source=entry["source"], ingestion_id=entry["ingestion_id"])
+
+            task = asyncio.ensure_future(upload(document, sha256))
+            if sha256 is not None:
+                uploads[sha256] = task
+            return await task
+
+        async def one(document: Dict[str, Any]) -> DocumentUploadResult:
+            result = await ingest(document)
+            logger.info("%s (%.2fs)", result.message, result.elapsed)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        results = await asyncio.gather(*(one(document) for document in documents))
+
+    if any(result.status == "processed" for result in results):
+        # Cached searches may not know about the new documents yet
+        get_knowledge_base_client().invalidate_cache()
+    return list(results)
+
+
+def ingestion_summary(results: List[DocumentUploadResult], elapsed: float) -> str:
+    """One line per document with its outcome and upload time, for the agent's message history."""
+
+    lines = [f"{result.message} ({result.elapsed:.2f}s)" for result in results]
+    processed = sum(1 for result in results if result.status == "processed")
+    skipped = sum(1 for result in results if result.status == "skipped")
+    lines.append(f"{processed} of {len(results)} documents processed, {skipped} already in the knowledge base, "
+                 f"in {elapsed:.2f}s.")
+    return "\n".join(lines)
+
+
+def document_sources(results: List[DocumentUploadResult]) -> List[str]:
+    """Distinct sources of the documents now in the knowledge base, to filter searches by."""
+    return list(dict.fromkeys(result.source for result in results
+                              if result.status in ("processed", "skipped") and result.source))
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def document_hash(chunks: Iterable[bytes]) -> str:
+    """SHA-256 of a document's bytes (given in chunks), the key it is recorded under in the ledger."""
+
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IngestionLedger:
+    """SQLite record of the documents already stored in the knowledge base, keyed by content hash.
+
+    A document whose bytes were ingested before is not uploaded again; its
+    ledger entry gives the ``source`` it was stored under, which later
+    searches use as their source filter. Entries older than ``ttl`` seconds
+    are ignored (0 keeps them forever). ``path`` defaults to an in-memory
+    database; give a file to keep the ledger across restarts.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 0):
+        self.path = path or ':memory:'
+        self.ttl = ttl
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " sha256 TEXT PRIMARY KEY, filename TEXT, content_type TEXT, source TEXT,"
+                " ingestion_id TEXT, ingested_at REAL)")
+
+    def get(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Return the ledger entry of an ingested document, or None if it was not ingested (or expired)."""
+
+        with self._lock:
+            row = self._conn.execute("SELECT filename, source, ingestion_id, ingested_at FROM documents"
+                                     " WHERE sha256 = ?", (sha256,)).fetchone()
+            if row is None or (self.ttl and time.time() - row[3] > self.ttl):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return {'sha256': sha256, 'filename': row[0], 'source': row[1], 'ingestion_id': row[2],
+                    'ingested_at': row[3]}
+
+    def record(self, sha256: str, filename: str, content_type: str, source: str,
+               ingestion_id: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO documents"
+                               " (sha256, filename, content_type, source, ingestion_id, ingested_at)"
+                               " VALUES (?, ?, ?, ?, ?, ?)",
+                               (sha256, filename, content_type, source, ingestion_id, time.time()))
+
+    def discard(self, sha256: str) -> None:
+        """Forget a document, e.g. after it was removed from the knowledge base, so it is uploaded again."""
+
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE sha256 = ?", (sha256,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses}
+
+
+_ledger: Optional[IngestionLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ingestion_ledger() -> Optional[IngestionLedger]:
+    """Return the process-wide ledger, or None when KB_INGESTION_LEDGER=false (every upload goes through)."""
+
+    global _ledger
+    if os.getenv("KB_INGESTION_LEDGER", "true").lower() != "true":
+        return None
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = IngestionLedger(os.getenv("KB_INGESTION_LEDGER_PATH",
+                                                str(BASE_DIR / 'kb_ingestion_ledger.sqlite3')),
+                                      ttl=float(os.getenv("KB_INGESTION_LEDGER_TTL", "0")))
+        return _ledger
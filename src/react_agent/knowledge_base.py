@@ -0,0 +1,521 @@
+"""Pooled client for the document knowledge base (vector search) API.
+
+Every agent's ``search_knowledge_base`` tool goes through one
+``KnowledgeBaseClient``, which keeps keep-alive connections to the search
+service open between calls. The async variant never blocks the event loop,
+so concurrent graph runs keep progressing while a search is in flight.
+Answers are cached briefly, since agents repeat the same queries across
+documents and ReAct iterations; ingesting a document clears the cache.
+Concurrent identical searches share a single request to the API, and a batch
+of queries (e.g. one per form field) is searched concurrently and merged.
+The tool-level functions shape answers for the model: ranked, deduplicated
+and cut to a token budget (see ``react_agent.search_results``).
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from react_agent.search_results import (
+    shape_results,
+    token_budget_from_env,
+    tokenizer_from_env,
+    warm_tokenizer,
+)
+
+# Request body defaults of the search endpoint; tools override what they need
+DEFAULT_SEARCH_OPTIONS: Dict[str, Any] = {
+    "max_results": 3,
+    "min_similarity_threshold": 0.5,
+    "source_filter": "",
+    "enable_query_enhancement": False,
+    "enable_context": True,
+    "full_content": False,
+}
+
+
+class KnowledgeBaseError(Exception):
+    """Raised when the search API answers with a non-200 status."""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(f"Knowledge base API returned status code: {status_code}. Details: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as its cache key."""
+    return ' '.join(query.lower().split())
+
+
+class SearchCache:
+    """Bounded LRU cache of search answers whose entries expire after ``ttl`` seconds.
+
+    ``invalidate`` drops everything, e.g. after a document was ingested; a
+    search that started before the invalidation does not store its answer.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # key -> (answer, stored_at)
+        self._entries: 'OrderedDict[Tuple, Tuple[Any, float]]' = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> Tuple:
+        options = {k: v for k, v in payload.items() if k != 'query'}
+        return normalize_query(payload['query']), json.dumps(options, sort_keys=True, default=str)
+
+    def get(self, key: Tuple) -> Tuple[Optional[Any], int]:
+        """Return ``(answer, generation)``; the answer is None on a miss."""
+
+        with self._lock:
+            if not self.enabled:
+                return None, self._generation
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0], self._generation
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None, self._generation
+
+    def put(self, key: Tuple, answer: Any, generation: int) -> None:
+        with self._lock:
+            if not self.enabled or generation != self._generation:
+                return
+            self._entries[key] = (answer, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+class _SharedSearch:
+    """A sync search in flight, awaited by the threads that asked for the same thing."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.answer: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class KnowledgeBaseClient:
+    """Owner of the pooled ``httpx`` clients used for knowledge base searches.
+
+    One sync client serves the sync tools; async clients are bound to the
+    event loop that created them, so one is kept per running loop. The search
+    URL defaults to DOC_API_ENDPOINT_SEARCH, read when a search is made.
+    Successful answers are served from ``cache`` when the same normalized
+    query and options were searched within its TTL; identical searches made
+    while one is in flight wait for its answer instead of sending their own.
+    """
+
+    def __init__(self, search_url: Optional[str] = None, timeout: float = 30, connect_timeout: float = 5,
+                 max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30, http2: bool = False, cache: Optional[SearchCache] = None,
+                 batch_concurrency: int = 10):
+        self.search_url = search_url
+        self.cache = cache or SearchCache()
+        self.batch_concurrency = max(1, batch_concurrency)
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections,
+                                   keepalive_expiry=keepalive_expiry)
+        self.http2 = http2
+
+        self._client: Optional[httpx.Client] = None
+        self._async_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+        # (cache key, cache generation) -> search in flight
+        self._sync_searches: Dict[Tuple, _SharedSearch] = {}
+        self._async_searches: Dict[Tuple, asyncio.Task] = {}
+
+        self.searches = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.clients_created = 0
+
+    @classmethod
+    def from_env(cls) -> 'KnowledgeBaseClient':
+        """Build a client from the KB_* environment variables."""
+        return cls(timeout=float(os.getenv("KB_HTTP_TIMEOUT", "30")),
+                   connect_timeout=float(os.getenv("KB_CONNECT_TIMEOUT", "5")),
+                   max_connections=int(os.getenv("KB_MAX_CONNECTIONS", "20")),
+                   max_keepalive_connections=int(os.getenv("KB_MAX_KEEPALIVE_CONNECTIONS", "10")),
+                   keepalive_expiry=float(os.getenv("KB_KEEPALIVE_EXPIRY", "30")),
+                   # HTTP/2 needs the h2 package (pip install "httpx[http2]")
+                   http2=os.getenv("KB_HTTP2", "false").lower() == "true",
+                   # Set KB_CACHE_TTL=0 to always ask the search API
+                   cache=SearchCache(max_entries=int(os.getenv("KB_CACHE_MAX_ENTRIES", "256")),
+                                     ttl=float(os.getenv("KB_CACHE_TTL", "300"))),
+                   batch_concurrency=int(os.getenv("KB_BATCH_CONCURRENCY", "10")))
+
+    def _url(self) -> str:
+        url = self.search_url or os.getenv("DOC_API_ENDPOINT_SEARCH")
+        if not url:
+            raise ValueError("DOC_API_ENDPOINT_SEARCH is not set")
+        return url
+
+    def _sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.Client(timeout=self.timeout, limits=self.limits, http2=self.http2)
+                self.clients_created += 1
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale_loop in [other for other in self._async_clients if other.is_closed()]:
+                del self._async_clients[stale_loop]
+
+            client = self._async_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits, http2=self.http2)
+                self._async_clients[loop] = client
+                self.clients_created += 1
+            return client
+
+    @staticmethod
+    def _payload(query: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        return {"query": query, **DEFAULT_SEARCH_OPTIONS, **options}
+
+    def _parse(self, response: httpx.Response) -> Any:
+        if response.status_code == 200:
+            return response.json()
+
+        self.errors += 1
+        # Get error details from response if available
+        try:
+            detail = response.json().get('detail', response.text)
+        except Exception:
+            detail = response.text
+        raise KnowledgeBaseError(response.status_code, detail)
+
+    def search(self, query: str, **options: Any) -> Any:
+        """Search the knowledge base and return the API's JSON answer; raises ``KnowledgeBaseError``."""
+
+        payload = self._payload(query, options)
+        key = SearchCache.make_key(payload)
+        answer, generation = self.cache.get(key)
+        if answer is not None:
+            return answer
+
+        flight_key = (key, generation)
+        with self._lock:
+            shared = self._sync_searches.get(flight_key)
+            leader = shared is None
+            if leader:
+                shared = self._sync_searches[flight_key] = _SharedSearch()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            shared.done.wait()
+            if shared.error is not None:
+                raise shared.error
+            return shared.answer
+
+        try:
+            shared.answer = self._post(payload)
+            self.cache.put(key, shared.answer, generation)
+            return shared.answer
+        except BaseException as e:
+            shared.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._sync_searches[flight_key]
+            shared.done.set()
+
+    async def asearch(self, query: str, **options: Any) -> Any:
+        """Async variant of ``search``."""
+
+        payload = self._payload(query, options)
+        key = SearchCache.make_key(payload)
+        answer, generation = self.cache.get(key)
+        if answer is not None:
+            return answer
+
+        flight_key = (key, generation)
+        task = self._async_searches.get(flight_key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._async_searches[flight_key] = asyncio.ensure_future(
+                self._asearch_once(key, generation, payload))
+
+            def forget(done: asyncio.Task) -> None:
+                if self._async_searches.get(flight_key) is done:
+                    del self._async_searches[flight_key]
+
+            task.add_done_callback(forget)
+        else:
+            self.coalesced += 1
+        # Shielded: a caller giving up does not cancel the search for the others
+        return await asyncio.shield(task)
+
+    async def _asearch_once(self, key: Tuple, generation: int, payload: Dict[str, Any]) -> Any:
+        answer = await self._apost(payload)
+        self.cache.put(key, answer, generation)
+        return answer
+
+    def _post(self, payload: Dict[str, Any]) -> Any:
+        self.searches += 1
+        return self._parse(self._sync_client().post(self._url(), json=payload))
+
+    async def _apost(self, payload: Dict[str, Any]) -> Any:
+        self.searches += 1
+        return self._parse(await self._async_client().post(self._url(), json=payload))
+
+    def search_batch(self, queries: List[str], **options: Any) -> List[Any]:
+        """Search several queries concurrently; each slot holds the answer or the exception it raised."""
+        return self.search_many([(query, options) for query in queries])
+
+    async def asearch_batch(self, queries: List[str], **options: Any) -> List[Any]:
+        """Async variant of ``search_batch``."""
+        return await self.asearch_many([(query, options) for query in queries])
+
+    def search_many(self, searches: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Run ``(query, options)`` searches concurrently; each slot holds the answer or the exception raised."""
+
+        def one(search: Tuple[str, Dict[str, Any]]) -> Any:
+            try:
+                return self.search(search[0], **search[1])
+            except Exception as e:
+                return e
+
+        if len(searches) <= 1:
+            return [one(search) for search in searches]
+        with ThreadPoolExecutor(max_workers=min(len(searches), self.batch_concurrency)) as executor:
+            return list(executor.map(one, searches))
+
+    async def asearch_many(self, searches: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Async variant of ``search_many``."""
+
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def one(query: str, options: Dict[str, Any]) -> Any:
+            async with semaphore:
+                return await self.asearch(query, **options)
+
+        return await asyncio.gather(*(one(query, options) for query, options in searches), return_exceptions=True)
+
+    def invalidate_cache(self) -> None:
+        """Forget cached answers; call after documents were added to the knowledge base."""
+        self.cache.invalidate()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections; the next search opens new ones."""
+
+        with self._lock:
+            client, self._client = self._client, None
+            async_client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            client.close()
+        if async_client is not None:
+            await async_client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'searches': self.searches, 'coalesced': self.coalesced, 'errors': self.errors,
+                'clients_created': self.clients_created, 'cache': self.cache.stats()}
+
+
+_client: Optional[KnowledgeBaseClient] = None
+_client_lock = threading.Lock()
+
+
+def get_knowledge_base_client() -> KnowledgeBaseClient:
+    """Return the process-wide knowledge base client, built from the environment on first use."""
+
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = KnowledgeBaseClient.from_env()
+        return _client
+
+
+def _error_message(error: BaseException) -> str:
+    if isinstance(error, KnowledgeBaseError):
+        return (f"Failed to retrieve document. API returned status code: {error.status_code}. "
+                f"Details: {error.detail}")
+    if isinstance(error, httpx.HTTPError):
+        return f"Network error retrieving document from vector database: {str(error)}"
+    return f"Error retrieving document from vector database: {str(error)}"
+
+
+def _unique_queries(queries: List[str]) -> List[str]:
+    seen = set()
+    unique = []
+    for query in queries:
+        normalized = normalize_query(query)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            unique.append(query)
+    return unique
+
+
+def _answer_items(answer: Any) -> List[Any]:
+    """The hits of one search answer: its ``results`` list when it has one, else the answer itself."""
+
+    if isinstance(answer, list):
+        return answer
+    if isinstance(answer, dict) and isinstance(answer.get('results'), list):
+        return answer['results']
+    return [answer]
+
+
+def _item_identity(item: Any) -> str:
+    if isinstance(item, dict):
+        for field in ('id', 'chunk_id', 'document_id'):
+            if item.get(field) is not None:
+                return f"{field}:{item[field]}"
+    return json.dumps(item, sort_keys=True, default=str)
+
+
+def merge_search_answers(queries: List[str], answers: List[Any], token_budget: int = 0) -> Dict[str, Any]:
+    """Merge the answers of a batch into one result list, each distinct hit once with the queries that found it.
+
+    ``queries`` may repeat a query, e.g. once per source it was searched in.
+    With a ``token_budget`` the merged hits are shaped like single answers.
+    """
+
+    results: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    for query, answer in zip(queries, answers):
+        if isinstance(answer, BaseException):
+            errors.setdefault(query, _error_message(answer))
+            continue
+        for item in _answer_items(answer):
+            merged = results.setdefault(_item_identity(item), {'result': item, 'queries': []})
+            if query not in merged['queries']:
+                merged['queries'].append(query)
+
+    merged_answer: Dict[str, Any] = {'queries': list(dict.fromkeys(queries)), 'results': list(results.values())}
+    if token_budget > 0:
+        merged = merged_answer['results']
+        merged_answer.update(shape_results([entry['result'] for entry in merged], token_budget, tokenizer_from_env(),
+                                           extra=lambda i: {'queries': merged[i]['queries']}))
+    if errors:
+        merged_answer['errors'] = errors
+    return merged_answer
+
+
+def shape_answer(answer: Any, token_budget: int) -> Any:
+    """Shape one search answer for the model; answers without a list of hits are returned as they are."""
+
+    if token_budget <= 0 or not (isinstance(answer, list) or isinstance(answer, dict) and 'results' in answer):
+        return answer
+    return shape_results(_answer_items(answer), token_budget, tokenizer_from_env())
+
+
+def _source_searches(queries: List[str], sources: Optional[List[str]],
+                     options: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """One search per query, or per query and source when searches are limited to the given sources."""
+
+    if not sources:
+        return [(query, options) for query in queries]
+    return [(query, {**options, 'source_filter': source}) for query in queries for source in sources]
+
+
+async def _async_token_budget() -> int:
+    """The answer token budget, with the tokenizer loaded off the event loop if shaping needs it."""
+
+    token_budget = token_budget_from_env()
+    if token_budget > 0:
+        await warm_tokenizer()
+    return token_budget
+
+
+def search_knowledge_base(query: str, sources: Optional[List[str]] = None, **options: Any) -> Any:
+    """Search the knowledge base for a tool: the API's answer, or an error message the model can read.
+
+    With ``sources`` (e.g. the documents attached to the request) only those
+    are searched; answers from several sources are merged.
+    """
+
+    try:
+        searches = _source_searches([query], sources, options)
+        if len(searches) == 1:
+            return shape_answer(get_knowledge_base_client().search(query, **searches[0][1]), token_budget_from_env())
+        return merge_search_answers([query] * len(searches), get_knowledge_base_client().search_many(searches),
+                                    token_budget_from_env())
+    except Exception as e:
+        return _error_message(e)
+
+
+async def asearch_knowledge_base(query: str, sources: Optional[List[str]] = None, **options: Any) -> Any:
+    """Async variant of ``search_knowledge_base``."""
+
+    try:
+        searches = _source_searches([query], sources, options)
+        token_budget = await _async_token_budget()
+        if len(searches) == 1:
+            return shape_answer(await get_knowledge_base_client().asearch(query, **searches[0][1]), token_budget)
+        return merge_search_answers([query] * len(searches), await get_knowledge_base_client().asearch_many(searches),
+                                    token_budget)
+    except Exception as e:
+        return _error_message(e)
+
+
+def search_knowledge_base_batch(queries: List[str], sources: Optional[List[str]] = None, **options: Any) -> Any:
+    """Search several queries at once for a tool: one merged, deduplicated answer, or an error message."""
+
+    try:
+        searches = _source_searches(_unique_queries(queries), sources, options)
+        return merge_search_answers([query for query, _ in searches],
+                                    get_knowledge_base_client().search_many(searches), token_budget_from_env())
+    except Exception as e:
+        return _error_message(e)
+
+
+async def asearch_knowledge_base_batch(queries: List[str], sources: Optional[List[str]] = None,
+                                       **options: Any) -> Any:
+    """Async variant of ``search_knowledge_base_batch``."""
+
+    try:
+        searches = _source_searches(_unique_queries(queries), sources, options)
+        token_budget = await _async_token_budget()
+        return merge_search_answers([query for query, _ in searches],
+                                    await get_knowledge_base_client().asearch_many(searches), token_budget)
+    except Exception as e:
+        return _error_message(e)
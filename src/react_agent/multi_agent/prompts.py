@@ -40,6 +40,7 @@ Your main responsibility is to utilize your extraction tools to process incoming
 If an "authority to trade" document was uploaded successfully, perform searching the knowledge base using the query below to get the needed values:
 Search query: PropertyName AND TenantLegalEntity AND ShopNumber AND SAPProjectNumber AND HandoverDate AND FitoutDuration AND OpenForTradeDate AND RentStartDate AND SignedLeaseReceived.
 Include in the search query the file name also if available.
+To get all the values in one step, use the batch search tool with one query per value (e.g. "PropertyName", "ShopNumber", ...).
 
 System time: {system_time}
 """
@@ -9,17 +9,19 @@ from typing_extensions import Annotated
 from dataclasses import asdict
 
 from langgraph.prebuilt import InjectedState
-from langchain_core.tools import tool, InjectedToolCallId
+from langchain_core.tools import BaseTool, StructuredTool, tool, InjectedToolCallId
 from langgraph.types import Command, Send
 from langgraph.runtime import get_runtime
 from langgraph.graph import MessagesState
 
 from react_agent.multi_agent.state import State, InputState
+from react_agent.knowledge_base import asearch_knowledge_base as kb_asearch
+from react_agent.knowledge_base import asearch_knowledge_base_batch as kb_asearch_batch
+from react_agent.knowledge_base import search_knowledge_base as kb_search
+from react_agent.knowledge_base import search_knowledge_base_batch as kb_search_batch
 
 from uipath.call_uipath_process import run_uipath_process_sync
 
-import os
-import requests
 
 #handoff tool for supervisor
 def create_handoff_tool(*, agent_name: str, description: str | None = None):
@@ -57,48 +59,41 @@ assign_to_rpa_agent = create_handoff_tool(
 
 def search_knowledge_base(
     query: str
-) -> str:
+) -> Any:
     """
     Get document contents on user query coming from vector database.
     """
 
     print("SEARCHING KNOWLEDGE BASE...")
 
-    api_endpoint = os.getenv("DOC_API_ENDPOINT_SEARCH")
+    return kb_search(query)
 
-    try:
-        payload = {
-            "query": query,
-            "max_results": 3,
-            "min_similarity_threshold": 0.5,
-            "source_filter": "",
-            "enable_query_enhancement": False,
-            "enable_context": True,
-            "full_content": False
-        }
- 
-        headers = {
-            "Content-Type": "application/json",
-        }
- 
-        response = requests.post(api_endpoint, json=payload, headers=headers)
- 
-        if response.status_code == 200:
-            result = response.json()  # Fixed: Added parentheses
-            return result  
-               
-        else:
-            # Get error details from response if available
-            try:
-                error_detail = response.json().get('detail', response.text)
-            except:
-                error_detail = response.text
-            return f"Failed to retrieve document. API returned status code: {response.status_code}. Details: {error_detail}"
- 
-    except requests.exceptions.RequestException as e:
-        return f"Network error retrieving document from vector database: {str(e)}"
-    except Exception as e:
-        return f"Error retrieving document from vector database: {str(e)}"
+async def asearch_knowledge_base(
+    query: str
+) -> Any:
+    """Async variant of search_knowledge_base, so searches do not block the graph's loop."""
+
+    print("SEARCHING KNOWLEDGE BASE...")
+
+    return await kb_asearch(query)
+
+def search_knowledge_base_batch(queries: List[str]) -> Any:
+    """
+    Search the knowledge base for several queries at once, e.g. one per form field.
+
+    Returns one merged result set; each distinct result lists the queries that found it.
+    """
+
+    print("SEARCHING KNOWLEDGE BASE...")
+
+    return kb_search_batch(queries)
+
+async def asearch_knowledge_base_batch(queries: List[str]) -> Any:
+    """Async variant of search_knowledge_base_batch; the queries are searched concurrently."""
+
+    print("SEARCHING KNOWLEDGE BASE...")
+
+    return await kb_asearch_batch(queries)
 
 def create_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
                           HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
@@ -128,10 +123,17 @@ def create_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, Sh
         print(f"An error occurred: {e}")
         return None
 
+search_knowledge_base_tool = StructuredTool.from_function(
+    func=search_knowledge_base, coroutine=asearch_knowledge_base)
+search_knowledge_base_batch_tool = StructuredTool.from_function(
+    func=search_knowledge_base_batch, coroutine=asearch_knowledge_base_batch)
+
 SUPERVISOR_AGENT_TOOLS: List[Callable[..., Any]] = [assign_to_extraction_agent,assign_to_rpa_agent]
 
-LEASE_PROCESSOR_AGENT_TOOLS: List[Callable[..., Any]] = [search_knowledge_base, create_authority_to_trade_form]
+LEASE_PROCESSOR_AGENT_TOOLS: List[Callable[..., Any] | BaseTool] = [search_knowledge_base_tool,
+                                                                     create_authority_to_trade_form]
     
-EXTRACTION_AGENT_TOOLS: List[Callable[..., Any]] = [search_knowledge_base]
+EXTRACTION_AGENT_TOOLS: List[Callable[..., Any] | BaseTool] = [search_knowledge_base_tool,
+                                                                search_knowledge_base_batch_tool]
 
 RPA_AGENT_TOOLS: List[Callable[..., Any]] = [create_authority_to_trade_form]
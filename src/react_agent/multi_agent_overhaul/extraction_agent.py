@@ -4,17 +4,20 @@ Works with a chat model with tool calling support.
 """
 
 from datetime import UTC, datetime
-from typing import Dict, List, Literal, cast
+from typing import Callable, Dict, List, Literal, Optional, cast
 from dotenv import load_dotenv
 
-import os
-import requests
+import asyncio
+import time
 
 from langchain_core.messages import AIMessage
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph
 from langgraph.prebuilt import ToolNode
 from langgraph.runtime import Runtime
 
+from react_agent.blob_store import store_documents
+from react_agent.ingestion import DocumentUploadResult, document_sources, ingest_documents, ingestion_summary
 from react_agent.multi_agent_overhaul.context import Context
 from react_agent.multi_agent_overhaul.state import InputState, State
 from react_agent.multi_agent_overhaul.tools import EXTRACTION_AGENT_TOOLS, update_workflow_status
@@ -22,64 +25,44 @@ from react_agent.multi_agent_overhaul.utils import load_chat_model
 
 load_dotenv()
 
+# Write attached file data to the blob store, so later checkpoints only carry descriptors
+async def store_attachments(state: State):
+
+    if not any("data" in document for document in state.documents):
+        return {}
+    return {"documents": await asyncio.to_thread(store_documents, state.documents)}
+
 # Pre-process attached documents and upload to vector DB
-def pre_process_documents(state: State):
+async def pre_process_documents(state: State):
 
     print("extraction_agent: pre_process_documents")
-    
-    def process_document_with_api(base64_content: str, filename: str, content_type: str) -> str:
-     """
-    Process a document by converting it to base64 and sending to your API.
-   
-    This tool acts as the bridge between your LangGraph application and your
-    document processing API that stores content in the vector database.
-    """
-     
-     api_endpoint = os.getenv("DOC_API_ENDPOINT_UPLOAD")
- 
-     try:
-          payload = {
-               "filename" : filename,
-               "file_data": base64_content,
-               "content_type": content_type
-          }
- 
-          headers = {
-               "Content-Type": "application/json",
-          }
- 
-          response = requests.post(api_endpoint, json=payload, headers=headers)
- 
-          if response.status_code == 200:
-               result = response.json
-               return f"Document processed sucessfully: '{filename}'"
-          else:
-               return f"Failed to process document: '{filename}'. API returned status code:{response.status_code}"
-   
-     except Exception as e:
-          return f"Error processing document ' {filename}' : {str(e)}"
-     
-    try: 
-        document_list = []
-
-        for document in state.documents:
-            document_list.append([document["data"],document["name"], document["mimetype"]]) #this is the file binary data
-
-        #if has binary files, pre-process it
-        if(len(document_list) > 0):
-            for binary in document_list:
-                result = process_document_with_api(binary[0], binary[1], binary[2])
 
+    try:
+        started = time.perf_counter()
+        results = await ingest_documents(state.documents, on_result=_ingestion_forwarder())
+        if not results:
+            return {}
+
+        # Blobs are left to the TTL sweep: another request may hold a descriptor for the same content
         return {
             "messages": [
                 AIMessage(
-                    content=result,
+                    content=ingestion_summary(results, time.perf_counter() - started),
                 )
-            ]
+            ],
+            "document_sources": document_sources(results),
         }
     except Exception as e:
         print("An error occured while trying to pre-process documents. " + str(e))
 
+def _ingestion_forwarder() -> Optional[Callable[[DocumentUploadResult], None]]:
+    """Forward each finished document upload to the graph's custom stream."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return None
+    return lambda result: writer({"document_ingestion": result.to_dict()})
+
 async def call_model(
     state: State, runtime: Runtime[Context]
 ) -> Dict[str, List[AIMessage]]:
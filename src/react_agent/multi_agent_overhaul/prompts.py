@@ -40,6 +40,7 @@ Your main responsibility is to utilize your extraction tools to process incoming
 If an "authority to trade" document was uploaded successfully, perform searching the knowledge base using the query below to get the needed values:
 Search query: PropertyName AND TenantLegalEntity AND ShopNumber AND SAPProjectNumber AND HandoverDate AND FitoutDuration AND OpenForTradeDate AND RentStartDate AND SignedLeaseReceived.
 Include in the search query the file name also if available.
+To get all the values in one step, use the batch search tool with one query per value (e.g. "PropertyName", "ShopNumber", ...).
 
 System time: {system_time}
 """
@@ -48,6 +49,8 @@ RPA_AGENT_SYSTEM_PROMPT = """You are a worker agent that executes different proc
         You can execute the following:
         1. Search Knowledge base - search knowledge base coming from uploaded documents. 
         2. Create Authority to trade - which creates an authority to trade record.
+           To avoid waiting on the robot, submit the form and check its result later with the returned job id.
+           When several forms are needed, submit them together in one batch.
 
 You may be called upon by other agents to execute specific workflows.
 
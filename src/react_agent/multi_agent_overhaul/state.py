@@ -22,6 +22,8 @@ class InputState:
         default_factory=list
     )
 
+    # Attached files are written to the blob store by the graph's store_attachments node;
+    # from then on state keeps {blob_id, name, mimetype, size, sha256} descriptors instead of the file data
     documents: list = field(default_factory=list)
     requestid: str = field(default="")
 
@@ -55,3 +57,10 @@ class State(InputState):
     This is a 'managed' variable, controlled by the state machine rather than user code.
     It is set to 'True' when the step count reaches recursion_limit - 1.
     """
+
+    document_sources: list = field(default_factory=list)
+    """
+    Knowledge base sources of the attached documents, set once they are ingested (or found already ingested).
+
+    Knowledge base searches of the request are limited to these sources.
+    """
@@ -1,5 +1,5 @@
 from react_agent.multi_agent_overhaul.rpa_agent import rpa_agent
-from react_agent.multi_agent_overhaul.extraction_agent import extraction_agent
+from react_agent.multi_agent_overhaul.extraction_agent import extraction_agent, store_attachments
 
 from react_agent.multi_agent_overhaul.tools import SUPERVISOR_AGENT_TOOLS
 from react_agent.multi_agent_overhaul.state import InputState, State
@@ -128,7 +128,9 @@ builder = StateGraph(State, input_schema=InputState, context_schema=Context)
 builder.add_node(supervisor_agent, destinations=("extraction_agent", "rpa_agent", END))
 builder.add_node(extraction_agent)
 builder.add_node(rpa_agent)
-builder.add_edge(START, "supervisor_agent")
+builder.add_node(store_attachments)
+builder.add_edge(START, "store_attachments")
+builder.add_edge("store_attachments", "supervisor_agent")
 # always return back to the supervisor
 builder.add_edge("extraction_agent", "supervisor_agent")
 builder.add_edge("rpa_agent", "supervisor_agent")
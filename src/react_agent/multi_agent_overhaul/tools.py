@@ -10,16 +10,23 @@ from typing_extensions import Annotated
 from dataclasses import asdict
 
 from langgraph.prebuilt import InjectedState
-from langchain_core.tools import tool, InjectedToolCallId
+from langchain_core.tools import BaseTool, StructuredTool, tool, InjectedToolCallId
 from langgraph.types import Command, Send
 from langgraph.runtime import get_runtime
+from langgraph.config import get_config, get_stream_writer
 from langgraph.graph import MessagesState
 
 from react_agent.multi_agent_overhaul.state import State, InputState
+from react_agent.knowledge_base import asearch_knowledge_base as kb_asearch
+from react_agent.knowledge_base import asearch_knowledge_base_batch as kb_asearch_batch
+from react_agent.knowledge_base import search_knowledge_base as kb_search
+from react_agent.knowledge_base import search_knowledge_base_batch as kb_search_batch
 
-from uipath.call_uipath_process import run_uipath_process_sync
+from uipath.call_uipath_process import (call_uipath_process, run_uipath_process_sync, make_idempotency_key,
+                                        submit_uipath_job, submit_uipath_job_sync,
+                                        submit_uipath_jobs, submit_uipath_jobs_sync,
+                                        get_uipath_job_result, get_uipath_job_result_sync)
 
-import os
 import requests
 
 #handoff tool for supervisor
@@ -57,74 +64,227 @@ assign_to_rpa_agent = create_handoff_tool(
 )
 
 def search_knowledge_base(
-    query: str
-) -> str:
+    query: str,
+    state: Annotated[State, InjectedState]
+) -> Any:
     """
     Get document contents on user query coming from vector database.
     """
 
     print("SEARCHING KNOWLEDGE BASE...")
 
-    api_endpoint = os.getenv("DOC_API_ENDPOINT_SEARCH")
+    # Only the documents attached to this request, when they are known
+    return kb_search(query, sources=state.document_sources)
 
-    try:
-        payload = {
-            "query": query,
-            "max_results": 3,
-            "min_similarity_threshold": 0.5,
-            "source_filter": "",
-            "enable_query_enhancement": False,
-            "enable_context": True,
-            "full_content": False
-        }
- 
-        headers = {
-            "Content-Type": "application/json",
+async def asearch_knowledge_base(
+    query: str,
+    state: Annotated[State, InjectedState]
+) -> Any:
+    """Async variant of search_knowledge_base, so searches do not block the graph's loop."""
+
+    print("SEARCHING KNOWLEDGE BASE...")
+
+    return await kb_asearch(query, sources=state.document_sources)
+
+def search_knowledge_base_batch(queries: List[str], state: Annotated[State, InjectedState]) -> Any:
+    """
+    Search the knowledge base for several queries at once, e.g. one per form field.
+
+    Returns one merged result set; each distinct result lists the queries that found it.
+    """
+
+    print("SEARCHING KNOWLEDGE BASE...")
+
+    return kb_search_batch(queries, sources=state.document_sources)
+
+async def asearch_knowledge_base_batch(queries: List[str], state: Annotated[State, InjectedState]) -> Any:
+    """Async variant of search_knowledge_base_batch; the queries are searched concurrently."""
+
+    print("SEARCHING KNOWLEDGE BASE...")
+
+    return await kb_asearch_batch(queries, sources=state.document_sources)
+
+ATT_PROCESS_NAME = "Create.Authority.to.Trade.Form"
+
+def _authority_to_trade_form_input(form: dict[str, Any]) -> dict[str, Any]:
+    """Map the tool arguments of an authority to trade form onto the UiPath process arguments."""
+    return {
+        "in_PropertyName": form.get("PropertyName"),
+        "in_TenantLegalEntity": form.get("TenantLegalEntity"),
+        "in_ShopNumber": form.get("ShopNumber"),
+        "in_SAPProjectNumber": form.get("SAPProjectNumber"),
+        "in_HandoverDaters": form.get("HandoverDate"),
+        "in_FitoutDuration": form.get("FitoutDuration"),
+        "in_OpenForTradeDate": form.get("OpenForTradeDate"),
+        "in_RentStartDate": form.get("RentStartDate"),
+        "in_SignedLeaseReceived": form.get("SignedLeaseReceived")
         }
- 
-        response = requests.post(api_endpoint, json=payload, headers=headers)
- 
-        if response.status_code == 200:
-            result = response.json()  # Fixed: Added parentheses
-            return result  
-               
-        else:
-            # Get error details from response if available
-            try:
-                error_detail = response.json().get('detail', response.text)
-            except:
-                error_detail = response.text
-            return f"Failed to retrieve document. API returned status code: {response.status_code}. Details: {error_detail}"
- 
-    except requests.exceptions.RequestException as e:
-        return f"Network error retrieving document from vector database: {str(e)}"
-    except Exception as e:
-        return f"Error retrieving document from vector database: {str(e)}"
+
+def _idempotency_key(input_args: dict[str, Any], state: State) -> Optional[str]:
+    """Key under which repeated identical form calls of one request (or conversation thread) share a job.
+
+    Without a request id or thread id there is nothing to scope the key to,
+    so the call is not deduplicated rather than shared across conversations.
+    """
+    scope = state.requestid
+    if not scope:
+        try:
+            scope = get_config().get("configurable", {}).get("thread_id")
+        except RuntimeError:
+            scope = None
+    if not scope:
+        return None
+    return make_idempotency_key(ATT_PROCESS_NAME, input_args, str(scope))
+
+def _job_status_forwarder() -> Optional[Callable[[Any], None]]:
+    """Forward UiPath job state transitions to the graph's custom stream, when run inside a graph."""
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:
+        return None
+    return lambda event: writer({"uipath_job": {"process_name": ATT_PROCESS_NAME, **event.to_dict()}})
+
+def _bulk_submission_summary(submissions: List[Any]) -> dict[str, Any]:
+    items = [submission.to_dict() for submission in submissions]
+    return {
+        "submitted": sum(1 for item in items if item["status"] == "Submitted"),
+        "failed": sum(1 for item in items if item["status"] == "error"),
+        "items": items,
+    }
+
+def _job_result_summary(job_id: str, job_data: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+    if job_data is None:
+        return None
+    return {
+        "job_id": job_id,
+        "status": job_data.get("State"),
+        "is_success": job_data.get("IsSuccess", False),
+        "outputs": job_data.get("ParsedOutputArguments"),
+        "error": job_data.get("ErrorDetails"),
+    }
 
 def create_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
                           HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
-                          SignedLeaseReceived: str) -> Optional[dict[str, Any]]:
+                          SignedLeaseReceived: str,
+                          state: Annotated[State, InjectedState]) -> Optional[dict[str, Any]]:
     """
     Create authority to trade form by calling Uipath Process.
     """
 
     print("CREATING AUTHORITY TO TRADE FORM...")
 
-    input_data = {
-        "in_PropertyName": PropertyName,
-        "in_TenantLegalEntity": TenantLegalEntity,
-        "in_ShopNumber": ShopNumber,
-        "in_SAPProjectNumber": SAPProjectNumber,
-        "in_HandoverDaters": HandoverDate,
-        "in_FitoutDuration": FitoutDuration,
-        "in_OpenForTradeDate": OpenForTradeDate,
-        "in_RentStartDate": RentStartDate,
-        "in_SignedLeaseReceived": SignedLeaseReceived
-        }
+    try:
+        input_args = _authority_to_trade_form_input(locals())
+        return run_uipath_process_sync(ATT_PROCESS_NAME, input_args,
+                                       on_status=_job_status_forwarder(),
+                                       idempotency_key=_idempotency_key(input_args, state))
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+async def acreate_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
+                          HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
+                          SignedLeaseReceived: str,
+                          state: Annotated[State, InjectedState]) -> Optional[dict[str, Any]]:
+    """Async variant of create_authority_to_trade_form, awaited directly on the graph's loop."""
+
+    print("CREATING AUTHORITY TO TRADE FORM...")
+
+    try:
+        input_args = _authority_to_trade_form_input(locals())
+        return await call_uipath_process(ATT_PROCESS_NAME, input_args,
+                                         on_status=_job_status_forwarder(),
+                                         idempotency_key=_idempotency_key(input_args, state))
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def submit_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
+                          HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
+                          SignedLeaseReceived: str) -> Optional[dict[str, Any]]:
+    """
+    Start creating the authority to trade form without waiting for it to finish.
+    Returns the job id (or queue item reference); collect the outcome later with
+    get_authority_to_trade_form_result.
+    """
+
+    print("SUBMITTING AUTHORITY TO TRADE FORM...")
+
+    try:
+        handle = submit_uipath_job_sync(ATT_PROCESS_NAME, _authority_to_trade_form_input(locals()))
+        return {"status": "Submitted", **handle.to_dict()}
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+async def asubmit_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
+                          HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
+                          SignedLeaseReceived: str) -> Optional[dict[str, Any]]:
+    """Async variant of submit_authority_to_trade_form."""
+
+    print("SUBMITTING AUTHORITY TO TRADE FORM...")
 
     try:
-        result = run_uipath_process_sync("Create.Authority.to.Trade.Form", input_data)
-        return result
+        handle = await submit_uipath_job(ATT_PROCESS_NAME, _authority_to_trade_form_input(locals()))
+        return {"status": "Submitted", **handle.to_dict()}
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def submit_authority_to_trade_forms(forms: List[dict[str, str]]) -> Optional[dict[str, Any]]:
+    """
+    Start creating many authority to trade forms at once without waiting for them to finish.
+    Each form is a dict with the keys PropertyName, TenantLegalEntity, ShopNumber, SAPProjectNumber,
+    HandoverDate, FitoutDuration, OpenForTradeDate, RentStartDate and SignedLeaseReceived.
+    Returns a job id (or queue item reference) or an error per form, in the same order;
+    collect outcomes with get_authority_to_trade_form_result.
+    """
+
+    print(f"SUBMITTING {len(forms)} AUTHORITY TO TRADE FORMS...")
+
+    try:
+        submissions = submit_uipath_jobs_sync(ATT_PROCESS_NAME,
+                                              [_authority_to_trade_form_input(form) for form in forms])
+        return _bulk_submission_summary(submissions)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+async def asubmit_authority_to_trade_forms(forms: List[dict[str, str]]) -> Optional[dict[str, Any]]:
+    """Async variant of submit_authority_to_trade_forms."""
+
+    print(f"SUBMITTING {len(forms)} AUTHORITY TO TRADE FORMS...")
+
+    try:
+        submissions = await submit_uipath_jobs(ATT_PROCESS_NAME,
+                                               [_authority_to_trade_form_input(form) for form in forms])
+        return _bulk_submission_summary(submissions)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+def get_authority_to_trade_form_result(job_id: str, wait_seconds: int = 0) -> Optional[dict[str, Any]]:
+    """
+    Get the status or result of a submitted authority to trade form job.
+    job_id is the job id or queue item reference returned on submission.
+    Set wait_seconds to wait for the job to finish; 0 returns the current status immediately.
+    """
+
+    print("GETTING AUTHORITY TO TRADE FORM RESULT...")
+
+    try:
+        return _job_result_summary(job_id, get_uipath_job_result_sync(job_id, timeout=wait_seconds))
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+async def aget_authority_to_trade_form_result(job_id: str, wait_seconds: int = 0) -> Optional[dict[str, Any]]:
+    """Async variant of get_authority_to_trade_form_result."""
+
+    print("GETTING AUTHORITY TO TRADE FORM RESULT...")
+
+    try:
+        return _job_result_summary(job_id, await get_uipath_job_result(job_id, timeout=wait_seconds))
     except Exception as e:
         print(f"An error occurred: {e}")
         return None
@@ -165,10 +325,30 @@ def update_workflow_status(request_id: str, step_id: str, status: str = "complet
     except Exception as e:
         return f"Error retrieving document from vector database: {str(e)}"
 
+# UiPath tools carry both variants: ToolNode awaits the coroutine on the graph's loop,
+# while sync callers go through the shared background loop of the UiPath client
+search_knowledge_base_tool = StructuredTool.from_function(
+    func=search_knowledge_base, coroutine=asearch_knowledge_base)
+search_knowledge_base_batch_tool = StructuredTool.from_function(
+    func=search_knowledge_base_batch, coroutine=asearch_knowledge_base_batch)
+create_authority_to_trade_form_tool = StructuredTool.from_function(
+    func=create_authority_to_trade_form, coroutine=acreate_authority_to_trade_form)
+submit_authority_to_trade_form_tool = StructuredTool.from_function(
+    func=submit_authority_to_trade_form, coroutine=asubmit_authority_to_trade_form)
+submit_authority_to_trade_forms_tool = StructuredTool.from_function(
+    func=submit_authority_to_trade_forms, coroutine=asubmit_authority_to_trade_forms)
+get_authority_to_trade_form_result_tool = StructuredTool.from_function(
+    func=get_authority_to_trade_form_result, coroutine=aget_authority_to_trade_form_result)
+
 SUPERVISOR_AGENT_TOOLS: List[Callable[..., Any]] = [assign_to_extraction_agent,assign_to_rpa_agent]
 
-LEASE_PROCESSOR_AGENT_TOOLS: List[Callable[..., Any]] = [search_knowledge_base, create_authority_to_trade_form]
+LEASE_PROCESSOR_AGENT_TOOLS: List[Callable[..., Any] | BaseTool] = [search_knowledge_base_tool,
+                                                                     create_authority_to_trade_form_tool]
     
-EXTRACTION_AGENT_TOOLS: List[Callable[..., Any]] = [search_knowledge_base]
+EXTRACTION_AGENT_TOOLS: List[Callable[..., Any] | BaseTool] = [search_knowledge_base_tool,
+                                                                search_knowledge_base_batch_tool]
 
-RPA_AGENT_TOOLS: List[Callable[..., Any]] = [create_authority_to_trade_form]
+RPA_AGENT_TOOLS: List[Callable[..., Any] | BaseTool] = [create_authority_to_trade_form_tool,
+                                                        submit_authority_to_trade_form_tool,
+                                                        submit_authority_to_trade_forms_tool,
+                                                        get_authority_to_trade_form_result_tool]
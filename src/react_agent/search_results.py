@@ -0,0 +1,243 @@
+"""Shape knowledge base answers before they are handed to the model.
+
+The search API returns every hit with its full metadata, and whatever a tool
+returns is re-sent to the model on each later turn of the conversation.
+``shape_results`` keeps what the model needs (text, source, score), ranks
+hits by score, drops chunks that repeat text already kept and truncates the
+rest to a token budget.
+
+Token counts come from tiktoken, built from a BPE file vendored in the
+``tokenizers`` directory of this package (``make tokenizers`` fetches it), so
+it is never downloaded at runtime. ``warm_tokenizer`` loads it at server
+start, off the event loop, so no search waits on that I/O. A tokenizer that
+cannot be loaded is logged and shown in ``tokenizer_stats``; until it loads,
+tokens are estimated from text length and loading is retried every
+TOKENIZER_RETRY_INTERVAL seconds.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Keys the search API may use for the parts of a hit worth keeping
+TEXT_FIELDS = ("content", "text", "chunk", "chunk_text", "page_content")
+SCORE_FIELDS = ("similarity", "similarity_score", "score", "relevance_score")
+SOURCE_FIELDS = ("source", "filename", "file_name", "document_name", "title")
+
+# Share of a chunk's word shingles found in an already kept chunk above which it counts as a repeat
+OVERLAP_THRESHOLD = 0.8
+SHINGLE_SIZE = 5
+# Chunks are not cut below this many tokens; they are left out instead
+MIN_TRUNCATED_TOKENS = 32
+
+TOKENIZER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tokenizers")
+TOKENIZER_RETRY_INTERVAL = 60.0
+
+# Split pattern, special tokens and BPE file hash of the encodings that can be vendored, as defined by tiktoken
+ENCODINGS: Dict[str, Dict[str, Any]] = {
+    "cl100k_base": {
+        "pat_str": r"""'(?i:[sdmt]|ll|ve|re)|[^\r\n\p{L}\p{N}]?+\p{L}++|\p{N}{1,3}+| ?[^\s\p{L}\p{N}]++[\r\n]*+|\s++$|\s*[\r\n]|\s+(?!\S)|\s""",
+        "special_tokens": {"<|endoftext|>": 100257, "<|fim_prefix|>": 100258, "<|fim_middle|>": 100259,
+                           "<|fim_suffix|>": 100260, "<|endofprompt|>": 100276},
+        "sha256": "223921b76ee99bde995b7ff738513eef100fb51d18c93597a113bcffe865b2a7",
+    },
+    "o200k_base": {
+        "pat_str": "|".join([
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]*[\p{Ll}\p{Lm}\p{Lo}\p{M}]+(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""[^\r\n\p{L}\p{N}]?[\p{Lu}\p{Lt}\p{Lm}\p{Lo}\p{M}]+[\p{Ll}\p{Lm}\p{Lo}\p{M}]*(?i:'s|'t|'re|'ve|'m|'ll|'d)?""",
+            r"""\p{N}{1,3}""",
+            r""" ?[^\s\p{L}\p{N}]+[\r\n/]*""",
+            r"""\s*[\r\n]+""",
+            r"""\s+(?!\S)""",
+            r"""\s+""",
+        ]),
+        "special_tokens": {"<|endoftext|>": 199999, "<|endofprompt|>": 200018},
+        "sha256": "446a9538cb6c348e3516120d7c08b09f57c36495e2acfffe59a5bf8b0cfb1a2d",
+    },
+}
+
+_encoders: Dict[str, Any] = {}
+# Encoding name -> (time of the failed load, error)
+_load_errors: Dict[str, tuple] = {}
+_encoders_lock = threading.Lock()
+
+
+def tokenizer_file(encoding: str) -> str:
+    return os.path.join(TOKENIZER_DIR, f"{encoding}.tiktoken")
+
+
+def _load_encoding(encoding: str) -> Any:
+    import tiktoken  # comes with langchain-openai
+
+    if encoding not in ENCODINGS:
+        raise ValueError(f"unknown encoding, expected one of {sorted(ENCODINGS)}")
+    spec = ENCODINGS[encoding]
+    path = tokenizer_file(encoding)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} is missing; run `make tokenizers` and commit it")
+    # Read here rather than with tiktoken's loader, which copies even local files into its download cache
+    with open(path, "rb") as f:
+        contents = f.read()
+    if hashlib.sha256(contents).hexdigest() != spec["sha256"]:
+        raise ValueError(f"{path} does not match the SHA-256 of {encoding}")
+    ranks = {}
+    for line in contents.splitlines():
+        if line:
+            token, rank = line.split()
+            ranks[base64.b64decode(token)] = int(rank)
+    return tiktoken.Encoding(encoding, pat_str=spec["pat_str"], special_tokens=spec["special_tokens"],
+                             mergeable_ranks=ranks)
+
+
+def _encoder(encoding: str) -> Optional[Any]:
+    """The tiktoken encoding, or None while it cannot be loaded (retried every TOKENIZER_RETRY_INTERVAL)."""
+
+    with _encoders_lock:
+        if encoding in _encoders:
+            return _encoders[encoding]
+        failed = _load_errors.get(encoding)
+        if failed is not None and time.monotonic() - failed[0] < TOKENIZER_RETRY_INTERVAL:
+            return None
+        try:
+            _encoders[encoding] = _load_encoding(encoding)
+        except Exception as e:
+            _load_errors[encoding] = (time.monotonic(), f"{type(e).__name__}: {e}")
+            logger.error("Tokenizer '%s' could not be loaded (%s); search results are cut to an estimate "
+                         "of four characters a token until it can.", encoding, _load_errors[encoding][1])
+            return None
+        _load_errors.pop(encoding, None)
+        return _encoders[encoding]
+
+
+class TokenCounter:
+    """Counts and truncates text in tokens of ``encoding``; about four characters a token without tiktoken."""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        self._encoding = _encoder(encoding)
+
+    def count(self, text: str) -> int:
+        if self._encoding is None:
+            return (len(text) + 3) // 4
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, tokens: int) -> str:
+        if self._encoding is None:
+            return text[:tokens * 4]
+        return self._encoding.decode(self._encoding.encode(text, disallowed_special=())[:tokens])
+
+
+def _field(item: Dict[str, Any], names: tuple) -> Any:
+    metadata = item.get("metadata") if isinstance(item.get("metadata"), dict) else {}
+    for name in names:
+        if item.get(name) not in (None, ""):
+            return item[name]
+        if metadata.get(name) not in (None, ""):
+            return metadata[name]
+    return None
+
+
+def _compact(hit: Any) -> Dict[str, Any]:
+    """Reduce a hit to its text, source and score; hits without a known text field are kept whole."""
+
+    if not isinstance(hit, dict):
+        return {"text": hit if isinstance(hit, str) else json.dumps(hit, default=str)}
+
+    text = _field(hit, TEXT_FIELDS)
+    if text is None:
+        return {"text": json.dumps(hit, default=str)}
+
+    compact: Dict[str, Any] = {}
+    source = _field(hit, SOURCE_FIELDS)
+    if source is not None:
+        compact["source"] = source
+    score = _field(hit, SCORE_FIELDS)
+    if isinstance(score, (int, float)):
+        compact["score"] = round(float(score), 3)
+    compact["text"] = str(text)
+    return compact
+
+
+def _shingles(text: str) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words)}
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def shape_results(hits: List[Any], token_budget: int, counter: Optional[TokenCounter] = None,
+                  extra: Optional[Callable[[int], Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Rank, dedupe and trim search hits to at most ``token_budget`` tokens of text.
+
+    ``extra(i)`` may add fields (e.g. the queries that found hit ``i``) to
+    the compact form of each hit. Returns ``{"results": [...]}``, plus
+    ``"omitted"`` when hits were left out for the budget.
+    """
+
+    counter = counter or TokenCounter()
+    compact = [dict(_compact(hit), **(extra(i) if extra else {})) for i, hit in enumerate(hits)]
+    # Stable: hits without a score keep the API's order after the scored ones
+    ranked = sorted(compact, key=lambda hit: -hit.get("score", float("-inf")))
+
+    kept: List[Dict[str, Any]] = []
+    kept_shingles: List[set] = []
+    remaining = token_budget
+    omitted = 0
+    for hit in ranked:
+        shingles = _shingles(hit["text"])
+        if any(len(shingles & seen) >= OVERLAP_THRESHOLD * len(shingles) for seen in kept_shingles):
+            continue
+
+        tokens = counter.count(hit["text"])
+        if tokens > remaining:
+            if remaining < MIN_TRUNCATED_TOKENS:
+                omitted += 1
+                continue
+            hit["text"] = counter.truncate(hit["text"], remaining) + "..."
+            hit["truncated"] = True
+            tokens = remaining
+        kept.append(hit)
+        kept_shingles.append(shingles)
+        remaining -= tokens
+
+    shaped: Dict[str, Any] = {"results": kept}
+    if omitted:
+        shaped["omitted"] = omitted
+    return shaped
+
+
+def token_budget_from_env() -> int:
+    """Token budget for the text of one tool answer; KB_RESULT_TOKEN_BUDGET=0 returns raw API answers."""
+    return int(os.getenv("KB_RESULT_TOKEN_BUDGET", "2000"))
+
+
+def tokenizer_encoding_from_env() -> str:
+    return os.getenv("KB_TOKENIZER_ENCODING", "cl100k_base")
+
+
+def tokenizer_from_env() -> TokenCounter:
+    return TokenCounter(tokenizer_encoding_from_env())
+
+
+async def warm_tokenizer() -> TokenCounter:
+    """Load the configured tokenizer in a worker thread, so the event loop never waits on its BPE file."""
+
+    if tokenizer_encoding_from_env() in _encoders:
+        return tokenizer_from_env()
+    return await asyncio.to_thread(tokenizer_from_env)
+
+
+def tokenizer_stats() -> Dict[str, Any]:
+    """Loaded encodings, and the error of each encoding that falls back to the length estimate."""
+
+    with _encoders_lock:
+        return {"dir": TOKENIZER_DIR, "encodings": sorted(_encoders),
+                "errors": {name: error for name, (_, error) in _load_errors.items()}}
@@ -6,56 +6,43 @@ consider implementing more robust and specialized tools tailored to your needs.
 
 from typing import Any, Callable, List, Optional, cast
 
+from langchain_core.tools import BaseTool, StructuredTool
 from langgraph.runtime import get_runtime
 
+from react_agent.knowledge_base import asearch_knowledge_base as kb_asearch
+from react_agent.knowledge_base import asearch_knowledge_base_batch as kb_asearch_batch
+from react_agent.knowledge_base import search_knowledge_base as kb_search
+from react_agent.knowledge_base import search_knowledge_base_batch as kb_search_batch
 from uipath.call_uipath_process import call_uipath_process, run_uipath_process_sync
 
 from dotenv import load_dotenv
 
-import requests
-import os
     
-def search_knowledge_base(query: str) -> str:
+def search_knowledge_base(query: str) -> Any:
     """
     Get document contents on user query coming from vector database.
     """
 
-    api_endpoint = os.getenv("DOC_API_ENDPOINT_SEARCH")
+    return kb_search(query, max_results=10, enable_query_enhancement=True)
 
-    try:
-        payload = {
-            "query": query,
-            "max_results": 10,
-            "min_similarity_threshold": 0.5,
-            "source_filter": "",
-            "enable_query_enhancement": True,
-            "enable_context": True,
-            "full_content": False
-        }
- 
-        headers = {
-            "Content-Type": "application/json",
-        }
- 
-        response = requests.post(api_endpoint, json=payload, headers=headers)
- 
-        if response.status_code == 200:
-            result = response.json()  # Fixed: Added parentheses
-            return result
-           
-               
-        else:
-            # Get error details from response if available
-            try:
-                error_detail = response.json().get('detail', response.text)
-            except:
-                error_detail = response.text
-            return f"Failed to retrieve document. API returned status code: {response.status_code}. Details: {error_detail}"
- 
-    except requests.exceptions.RequestException as e:
-        return f"Network error retrieving document from vector database: {str(e)}"
-    except Exception as e:
-        return f"Error retrieving document from vector database: {str(e)}"
+async def asearch_knowledge_base(query: str) -> Any:
+    """Async variant of search_knowledge_base, so searches do not block the graph's loop."""
+
+    return await kb_asearch(query, max_results=10, enable_query_enhancement=True)
+
+def search_knowledge_base_batch(queries: List[str]) -> Any:
+    """
+    Search the knowledge base for several queries at once, e.g. one per form field.
+
+    Returns one merged result set; each distinct result lists the queries that found it.
+    """
+
+    return kb_search_batch(queries, max_results=10, enable_query_enhancement=True)
+
+async def asearch_knowledge_base_batch(queries: List[str]) -> Any:
+    """Async variant of search_knowledge_base_batch; the queries are searched concurrently."""
+
+    return await kb_asearch_batch(queries, max_results=10, enable_query_enhancement=True)
 
 def create_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
                           HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
@@ -85,4 +72,33 @@ def create_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, Sh
         print(f"An error occurred: {e}")
         return None
 
-TOOLS: List[Callable[..., Any]] = [search_knowledge_base,create_authority_to_trade_form]
+async def acreate_authority_to_trade_form(PropertyName: str, TenantLegalEntity: str, ShopNumber: str, SAPProjectNumber: str, 
+                          HandoverDate: str, FitoutDuration: str, OpenForTradeDate: str, RentStartDate: str, 
+                          SignedLeaseReceived: str) -> Optional[dict[str, Any]]:
+    """Async variant of create_authority_to_trade_form, awaited directly on the graph's loop."""
+
+    print("CREATING AUTHORITY TO TRADE FORM...")
+
+    input_data = {
+        "in_PropertyName": PropertyName,
+        "in_TenantLegalEntity": TenantLegalEntity,
+        "in_ShopNumber": ShopNumber,
+        "in_SAPProjectNumber": SAPProjectNumber,
+        "in_HandoverDaters": HandoverDate,
+        "in_FitoutDuration": FitoutDuration,
+        "in_OpenForTradeDate": OpenForTradeDate,
+        "in_RentStartDate": RentStartDate,
+        "in_SignedLeaseReceived": SignedLeaseReceived
+        }
+
+    try:
+        return await call_uipath_process("Create.Authority.to.Trade.Form", input_data)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+TOOLS: List[Callable[..., Any] | BaseTool] = [
+    StructuredTool.from_function(func=search_knowledge_base, coroutine=asearch_knowledge_base),
+    StructuredTool.from_function(func=search_knowledge_base_batch, coroutine=asearch_knowledge_base_batch),
+    StructuredTool.from_function(func=create_authority_to_trade_form, coroutine=acreate_authority_to_trade_form),
+]
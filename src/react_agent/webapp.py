@@ -0,0 +1,74 @@
+"""Custom HTTP app mounted into the LangGraph server.
+
+It hooks the server lifespan so long-lived clients (such as the pooled UiPath
+Orchestrator session and the knowledge base connections) are warmed up on
+start and shut down cleanly when the server stops. While it runs, expired
+document blobs are swept every KB_BLOB_SWEEP_INTERVAL seconds. Client
+counters (e.g. the knowledge base search cache hit rate and whether the
+tokenizer loaded) are served at ``GET /knowledge-base/stats``.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from react_agent.blob_store import sweep_expired_blobs
+from react_agent.knowledge_base import get_knowledge_base_client
+from react_agent.search_results import tokenizer_stats, warm_tokenizer
+from uipath.call_uipath_process import cfg as uipath_cfg
+from uipath.call_uipath_process import (
+    close_orchestrator_client,
+    preload_release_keys,
+    start_webhook_receiver,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def sweep_blobs_periodically(interval: float) -> None:
+    """Remove expired document blobs every ``interval`` seconds, off the event loop."""
+    while True:
+        try:
+            await asyncio.to_thread(sweep_expired_blobs)
+        except Exception as e:
+            logger.warning("Could not sweep expired document blobs: %s", e)
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """Warm shared client caches on startup and release them on shutdown."""
+    # Load the BPE file before the first search needs it; logs if it falls back to estimates
+    await warm_tokenizer()
+    if uipath_cfg["preload_releases"]:
+        try:
+            await preload_release_keys()
+        except Exception as e:
+            # Not fatal: release keys are then looked up on first use
+            logger.warning("Could not preload UiPath release keys: %s", e)
+    if uipath_cfg["completion_mode"] == "webhook":
+        try:
+            await start_webhook_receiver()
+        except Exception as e:
+            # Jobs then fall back to polling until the receiver can be started
+            logger.warning("Could not start UiPath webhook receiver: %s", e)
+    blob_sweeper = asyncio.create_task(
+        sweep_blobs_periodically(float(os.getenv("KB_BLOB_SWEEP_INTERVAL", "3600"))))
+    yield
+    blob_sweeper.cancel()
+    await close_orchestrator_client()
+    await get_knowledge_base_client().aclose()
+
+
+async def knowledge_base_stats(request: Request) -> JSONResponse:
+    """Search, error and cache hit-rate counters of the knowledge base client."""
+    return JSONResponse({**get_knowledge_base_client().stats(), "tokenizer": tokenizer_stats()})
+
+
+app = Starlette(routes=[Route("/knowledge-base/stats", knowledge_base_stats)], lifespan=lifespan)
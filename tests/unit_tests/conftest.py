@@ -0,0 +1,219 @@
+import asyncio
+import base64
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uipath.fake_orchestrator import FakeOrchestrator
+from uipath.orchestrator_client import OrchestratorClient
+from utils.uipath_config import get_uipath_config
+
+PROCESS_NAME = 'Create.Authority.to.Trade.Form'
+
+
+def pytest_configure(config):
+    """Keep the idempotency keys of clients built at import (``uipath.call_uipath_process``) in a temp dir."""
+
+    state_dir = tempfile.mkdtemp(prefix='uipath-tests-')
+    os.environ['UIPATH_IDEMPOTENCY_PATH'] = os.path.join(state_dir, 'idempotency.sqlite3')
+    config.add_cleanup(lambda: shutil.rmtree(state_dir, ignore_errors=True))
+
+
+@pytest.fixture
+def uipath_config(monkeypatch, tmp_path):
+    """Build a UiPath config for a client of a local FakeOrchestrator, with ``UIPATH_*`` overrides."""
+
+    def configure(base_url: str, **env: str):
+        defaults = {
+            'UIPATH_CLOUD_URL': base_url,
+            'UIPATH_CLOUD_ORG_NAME': 'org',
+            'UIPATH_OAUTH_TENANT': 'tenant',
+            'UIPATH_FOLDER_ID': '1',
+            'UIPATH_PRELOAD_RELEASES': 'false',
+            'UIPATH_IDEMPOTENCY_PATH': str(tmp_path / 'idempotency.sqlite3'),
+            'UIPATH_JOB_POLL_STRATEGY': 'fixed',
+            'UIPATH_JOB_POLL_INTERVAL': '0.05',
+        }
+        for name, value in {**defaults, **env}.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.delenv('UIPATH_RELEASE_CACHE_PATH', raising=False)
+        return get_uipath_config()
+
+    return configure
+
+
+@pytest.fixture
+def orchestrator(uipath_config):
+    """Async context manager yielding ``(fake, client)``: an OrchestratorClient talking to a FakeOrchestrator."""
+
+    @asynccontextmanager
+    async def connect(env=None, **fake_options):
+        fake_options.setdefault('job_duration', 0.05)
+        fake_options.setdefault('pending_delay', 0)
+        fake = FakeOrchestrator(**fake_options)
+        server = TestServer(fake.create_app())
+        await server.start_server()
+        client = OrchestratorClient(uipath_config(str(server.make_url('')).rstrip('/'), **(env or {})))
+        try:
+            yield fake, client
+        finally:
+            await client.close()
+            await server.close()
+
+    return connect
+
+
+class SearchServer:
+    """Local stand-in for the knowledge base search API, served from a background thread.
+
+    Each hit echoes the query and source filter it was found for; set
+    ``status`` to answer with an error, ``delay`` to keep requests in flight.
+    """
+
+    def __init__(self):
+        self.payloads = []
+        self.delay = 0.0
+        self.status = 200
+        self.hits_per_query = 2
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with server._lock:
+                    server.payloads.append(payload)
+                time.sleep(server.delay)
+                body = json.dumps(server.answer(payload) if server.status == 200 else {'detail': 'Search failed'})
+                self.send_response(server.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._httpd.server_port}/search'
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def answer(self, payload):
+        source = payload.get('source_filter') or 'lease.pdf'
+        return {'results': [{'id': f"{source}:{payload['query']}:{i}", 'content': f"{payload['query']} hit {i}",
+                             'metadata': {'source': source}, 'similarity': 0.9 - i / 10}
+                            for i in range(self.hits_per_query)]}
+
+    @property
+    def queries(self):
+        return [payload['query'] for payload in self.payloads]
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def search_server(monkeypatch):
+    """A running SearchServer, set as DOC_API_ENDPOINT_SEARCH, with a fresh process-wide client."""
+
+    from react_agent import knowledge_base
+
+    server = SearchServer()
+    monkeypatch.setenv('DOC_API_ENDPOINT_SEARCH', server.url)
+    monkeypatch.setattr(knowledge_base, '_client', None)
+    yield server
+    server.close()
+
+
+class UploadServer:
+    """Local stand-in for the document processing API, accepting JSON and multipart uploads.
+
+    Each upload is recorded as ``{filename, content_type, data, headers}``
+    with the decoded file bytes. Uploads named in ``fail`` get a 500 and
+    ``delay`` keeps uploads in flight, so ``max_in_flight`` shows how many
+    were sent at once.
+    """
+
+    def __init__(self):
+        self.uploads = []
+        self.fail = set()
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if request.content_type == 'multipart/form-data':
+                form = await request.post()
+                upload = {'filename': form['filename'], 'content_type': form['content_type'],
+                          'data': form['file'].file.read()}
+            else:
+                body = await request.json()
+                upload = {'filename': body['filename'], 'content_type': body['content_type'],
+                          'data': base64.b64decode(body['file_data'])}
+            upload['headers'] = dict(request.headers)
+            self.uploads.append(upload)
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if upload['filename'] in self.fail:
+            return web.json_response({'detail': 'Processing failed'}, status=500)
+        return web.json_response({'source': f"kb/{upload['filename']}", 'document_id': len(self.uploads)})
+
+    @property
+    def filenames(self):
+        return [upload['filename'] for upload in self.uploads]
+
+
+def inline_document(name: str, content: bytes, mimetype: str = 'application/pdf'):
+    """An attached document the way it arrives in a request: base64 ``data``, ``name`` and ``mimetype``."""
+    return {'name': name, 'mimetype': mimetype, 'data': base64.b64encode(content).decode()}
+
+
+@pytest.fixture
+def upload_server(monkeypatch, tmp_path):
+    """Async context manager yielding an UploadServer set as the upload endpoint.
+
+    The ingestion ledger, blob store and knowledge base client are fresh
+    per test and kept under ``tmp_path``.
+    """
+
+    from react_agent import blob_store, ingestion_ledger, knowledge_base
+
+    monkeypatch.setenv('KB_INGESTION_LEDGER_PATH', str(tmp_path / 'ledger.sqlite3'))
+    monkeypatch.setenv('KB_BLOB_STORE_PATH', str(tmp_path / 'blobs'))
+    monkeypatch.setattr(ingestion_ledger, '_ledger', None)
+    monkeypatch.setattr(blob_store, '_store', None)
+    monkeypatch.setattr(knowledge_base, '_client', None)
+
+    @asynccontextmanager
+    async def serve():
+        server = UploadServer()
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post('/upload', server.handle)
+        app.router.add_post('/upload/multipart', server.handle)
+        test_server = TestServer(app)
+        await test_server.start_server()
+        monkeypatch.setenv('DOC_API_ENDPOINT_UPLOAD', str(test_server.make_url('/upload')))
+        monkeypatch.setenv('DOC_API_ENDPOINT_UPLOAD_MULTIPART', str(test_server.make_url('/upload/multipart')))
+        try:
+            yield server
+        finally:
+            await test_server.close()
+
+    return serve
@@ -0,0 +1,106 @@
+import asyncio
+
+from tests.unit_tests.conftest import PROCESS_NAME
+from uipath.admission import AdmissionController
+
+
+def capacity_fetcher(capacity):
+    async def fetch(folder_id):
+        return capacity
+
+    return fetch
+
+
+async def admitted_now(controller, count, **kwargs):
+    """Start ``count`` acquires and return how many got a slot without waiting."""
+
+    tasks = [asyncio.ensure_future(controller.acquire('1', **kwargs)) for _ in range(count)]
+    await asyncio.sleep(0.01)
+    admitted = sum(task.done() for task in tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return admitted
+
+
+def test_no_reported_robots_leaves_capacity_unknown():
+    controller = AdmissionController(fetch_capacity=capacity_fetcher(0))
+    assert asyncio.run(admitted_now(controller, 20)) == 20
+    assert controller.stats()['1']['capacity'] is None
+
+
+def test_failed_capacity_fetch_admits_everything():
+    async def failing(folder_id):
+        raise RuntimeError('Sessions unavailable')
+
+    controller = AdmissionController(fetch_capacity=failing)
+    assert asyncio.run(admitted_now(controller, 5)) == 5
+
+
+def test_learned_capacity_holds_back_extra_starts():
+    controller = AdmissionController(fetch_capacity=capacity_fetcher(3))
+    assert asyncio.run(admitted_now(controller, 5)) == 3
+
+
+def test_release_admits_the_next_waiter_by_priority():
+    controller = AdmissionController(capacity=1)
+
+    async def run():
+        await controller.acquire('1')
+        order = []
+
+        async def start(name, priority):
+            await controller.acquire('1', priority=priority)
+            order.append(name)
+            controller.release('1')
+
+        tasks = [asyncio.ensure_future(start('low', 0)), asyncio.ensure_future(start('high', 5))]
+        await asyncio.sleep(0.01)
+        assert order == []
+        controller.release('1')
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(run()) == ['high', 'low']
+
+
+def test_process_limit_caps_one_process_only():
+    controller = AdmissionController(process_limits={'Slow': 2})
+
+    async def run():
+        slow = await admitted_now(controller, 4, process_name='Slow')
+        other = await admitted_now(controller, 4, process_name='Other')
+        return slow, other
+
+    assert asyncio.run(run()) == (2, 4)
+
+
+def test_admission_control_is_off_unless_capacity_is_configured(uipath_config, monkeypatch):
+    monkeypatch.delenv('UIPATH_ADMISSION_CONTROL', raising=False)
+    monkeypatch.delenv('UIPATH_ROBOT_CAPACITY', raising=False)
+    assert not uipath_config('http://localhost')['admission_control']
+    assert uipath_config('http://localhost', UIPATH_ROBOT_CAPACITY='4')['admission_control']
+    assert uipath_config('http://localhost', UIPATH_ADMISSION_CONTROL='true')['admission_control']
+
+
+def test_jobs_are_not_serialized_when_no_robots_are_reported(orchestrator):
+    async def run():
+        async with orchestrator(env={'UIPATH_ADMISSION_CONTROL': 'true'}, job_duration=0.3) as (fake, client):
+            key = await client.get_release_key(PROCESS_NAME)
+            await asyncio.wait_for(asyncio.gather(*(client.start_jobs(key, {'n': i}, process_name=PROCESS_NAME)
+                                                    for i in range(5))), 1)
+            return len(fake.jobs)
+
+    assert asyncio.run(run()) == 5
+
+
+def test_custom_poll_interval_applies_while_admission_tracks_the_job(orchestrator):
+    async def run():
+        env = {'UIPATH_ADMISSION_CONTROL': 'true', 'UIPATH_JOB_POLL_INTERVAL': '30'}
+        async with orchestrator(env=env, job_duration=0.05) as (fake, client):
+            key = await client.get_release_key(PROCESS_NAME)
+            [job] = (await client.start_jobs(key, process_name=PROCESS_NAME))['value']
+            # The admission slot's own wait is already tracking the job at the configured 30s
+            return await asyncio.wait_for(client.wait_for_job(job['Id'], poll_interval=0.05, timeout=5), 2)
+
+    assert asyncio.run(run())['State'] == 'Successful'
@@ -0,0 +1,173 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from langgraph.graph import StateGraph
+
+from react_agent import blob_store
+from react_agent.blob_store import (
+    BlobStore,
+    FileBlobStore,
+    MemoryBlobStore,
+    get_blob_store,
+    store_document,
+    store_documents,
+    sweep_expired_blobs,
+)
+from react_agent.multi_agent_overhaul.extraction_agent import (
+    pre_process_documents,
+    store_attachments,
+)
+from react_agent.multi_agent_overhaul.state import InputState, State
+from tests.unit_tests.conftest import inline_document
+
+CONTENT = os.urandom(500 * 1024)
+
+
+@pytest.fixture(params=['file', 'memory'])
+def store(request, tmp_path):
+    return FileBlobStore(str(tmp_path / 'blobs')) if request.param == 'file' else MemoryBlobStore()
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    monkeypatch.setenv('KB_BLOB_STORE', 'memory')
+    monkeypatch.setattr(blob_store, '_store', None)
+    return get_blob_store()
+
+
+def test_blob_store_is_abstract():
+    class Incomplete(BlobStore):
+        def put(self, chunks):
+            return {}
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_blobs_are_stored_by_content_and_read_back_in_chunks(store):
+    stored = store.put([CONTENT[:1000], CONTENT[1000:]])
+
+    assert stored == store.put([CONTENT])
+    assert stored['size'] == len(CONTENT)
+    assert b''.join(bytes(chunk) for chunk in store.iter_chunks(stored['blob_id'], chunk_size=64 * 1024)) == CONTENT
+
+    store.delete(stored['blob_id'])
+    store.delete(stored['blob_id'])
+    assert not store.exists(stored['blob_id'])
+
+
+def test_sweep_removes_only_expired_blobs(store, monkeypatch):
+    old = store.put([b'old'])['blob_id']
+    if isinstance(store, FileBlobStore):
+        aged = time.time() - 120
+        os.utime(store._path(old), (aged, aged))
+        # A write that never finished
+        (store.root / '.incoming-abandoned').write_bytes(b'partial')
+        os.utime(store.root / '.incoming-abandoned', (aged, aged))
+        new = store.put([b'new'])['blob_id']
+        expected = 2
+    else:
+        now = time.time()
+        monkeypatch.setattr(blob_store.time, 'time', lambda: now + 120)
+        new = store.put([b'new'])['blob_id']
+        expected = 1
+
+    assert store.sweep(60) == expected
+    assert not store.exists(old)
+    assert store.exists(new)
+
+
+def test_storing_again_restarts_a_file_blobs_age(tmp_path):
+    store = FileBlobStore(str(tmp_path))
+    blob_id = store.put([b'lease'])['blob_id']
+    aged = time.time() - 120
+    os.utime(store._path(blob_id), (aged, aged))
+
+    store.put([b'lease'])
+
+    assert store.sweep(60) == 0
+
+
+def test_zero_ttl_keeps_blobs(memory_store, monkeypatch):
+    monkeypatch.setenv('KB_BLOB_STORE_TTL', '0')
+    memory_store.put([b'lease'])
+    monkeypatch.setattr(blob_store.time, 'time', lambda: 10 ** 12)
+
+    assert sweep_expired_blobs() == 0
+    monkeypatch.setenv('KB_BLOB_STORE_TTL', '60')
+    assert sweep_expired_blobs() == 1
+
+
+def test_unusable_documents_are_kept_inline(memory_store):
+    broken = {'name': 'broken.pdf', 'mimetype': 'application/pdf', 'data': 'abc'}
+
+    lease, kept = store_documents([inline_document('lease.pdf', b'lease'), broken])
+
+    assert lease == {'blob_id': lease['sha256'], 'name': 'lease.pdf', 'mimetype': 'application/pdf',
+                     'size': 5, 'sha256': lease['sha256']}
+    assert kept is broken
+
+
+def test_attachments_are_stored_off_the_event_loop(memory_store, monkeypatch):
+    threads = []
+    monkeypatch.setattr(memory_store, 'put', lambda chunks, put=memory_store.put: (
+        threads.append(threading.current_thread()), put(chunks))[1])
+
+    update = asyncio.run(store_attachments(State(documents=[inline_document('lease.pdf', b'lease')])))
+
+    assert 'data' not in update['documents'][0]
+    assert threads and threads[0] is not threading.main_thread()
+    assert asyncio.run(store_attachments(State(documents=update['documents']))) == {}
+
+
+def test_documents_state_is_replaced_as_given(memory_store):
+    builder = StateGraph(State, input_schema=InputState)
+    builder.add_node(store_attachments)
+    builder.add_edge('__start__', 'store_attachments')
+    graph = builder.compile()
+
+    result = asyncio.run(graph.ainvoke({'documents': [inline_document('lease.pdf', b'lease')]}))
+
+    [descriptor] = result['documents']
+    assert memory_store.exists(descriptor['blob_id'])
+
+
+def test_ingested_blobs_are_left_to_the_sweep(upload_server, memory_store):
+    lease = store_document(inline_document('lease.pdf', b'lease'))
+
+    async def pre_process():
+        async with upload_server():
+            return await pre_process_documents(State(documents=[lease]))
+
+    update = asyncio.run(pre_process())
+
+    assert update['document_sources'] == ['kb/lease.pdf']
+    assert memory_store.exists(lease['blob_id'])
+
+
+def test_overlapping_requests_share_a_blob(upload_server, memory_store, monkeypatch):
+    monkeypatch.setenv('KB_UPLOAD_CONCURRENCY', '1')
+    first = store_document(inline_document('lease.pdf', CONTENT))
+    # Stored again by a second request; same content, same blob
+    second = [store_document(inline_document('deed.pdf', b'deed')), store_document(inline_document('plan.pdf', b'plan')),
+              store_document(inline_document('lease (1).pdf', CONTENT))]
+    assert second[2]['blob_id'] == first['blob_id']
+
+    async def pre_process():
+        async with upload_server() as server:
+            server.delay = 0.1
+            # The second request reads the shared blob only after the first one has finished with it
+            updates = await asyncio.gather(pre_process_documents(State(documents=[first])),
+                                           pre_process_documents(State(documents=second)))
+            return server, updates
+
+    server, updates = asyncio.run(pre_process())
+
+    assert sorted(server.filenames) == ['deed.pdf', 'lease (1).pdf', 'lease.pdf', 'plan.pdf']
+    assert all(upload['data'] == CONTENT for upload in server.uploads if upload['filename'].startswith('lease'))
+    assert [update['document_sources'] for update in updates] == [
+        ['kb/lease.pdf'], ['kb/deed.pdf', 'kb/plan.pdf', 'kb/lease (1).pdf']]
+    assert memory_store.exists(first['blob_id'])
@@ -0,0 +1,47 @@
+import asyncio
+import json
+
+import pytest
+
+from tests.unit_tests.conftest import PROCESS_NAME
+from uipath.release_cache import ReleaseNotFoundError
+
+START_JOBS = 'POST /{org}/{tenant}/odata/Jobs/UiPath.Server.Configuration.OData.StartJobs'
+
+
+def test_identical_arguments_share_one_start_jobs_call(orchestrator):
+    inputs = [{'shop': 'A'}, {'shop': 'B'}, {'shop': 'A'}, {'shop': 'A'}, {'shop': 'B'}]
+
+    async def run():
+        async with orchestrator() as (fake, client):
+            submissions = await client.submit_jobs(PROCESS_NAME, inputs)
+            return fake, submissions
+
+    fake, submissions = asyncio.run(run())
+    assert fake.request_counts[START_JOBS] == 2
+    assert [s.index for s in submissions] == list(range(5))
+    assert len({s.handle.job_id for s in submissions}) == 5
+    # Every item got a job started with its own arguments
+    assert all(json.loads(fake.jobs[s.handle.job_id]['InputArguments']) == s.input_args for s in submissions)
+
+
+def test_unknown_process_fails_the_whole_batch(orchestrator):
+    async def run():
+        async with orchestrator() as (fake, client):
+            with pytest.raises(ReleaseNotFoundError):
+                await client.submit_jobs('Missing.Process', [{'n': 1}, {'n': 2}])
+            return fake
+
+    assert START_JOBS not in asyncio.run(run()).request_counts
+
+
+def test_stale_release_key_is_refreshed_once_for_the_batch(orchestrator):
+    async def run():
+        async with orchestrator() as (fake, client):
+            client.release_cache.set(client.folder_id, PROCESS_NAME, 'retired-release-key')
+            submissions = await client.submit_jobs(PROCESS_NAME, [{'n': i} for i in range(4)])
+            return fake, submissions
+
+    fake, submissions = asyncio.run(run())
+    assert all(s.handle is not None for s in submissions)
+    assert fake.request_counts['GET /{org}/{tenant}/odata/Releases'] == 1
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+import uipath.call_uipath_process as facade
+import uipath.call_uipath_process_sync as sync_facade
+
+
+@pytest.fixture
+def recorded_loops(monkeypatch):
+    loops = []
+
+    async def get_access_token():
+        loops.append(asyncio.get_running_loop())
+        return 'token'
+
+    monkeypatch.setattr(facade.client, 'get_access_token', get_access_token)
+    yield loops
+    facade.loop_bridge.stop()
+
+
+def test_exports_resolve():
+    assert all(hasattr(facade, name) for name in facade.__all__)
+
+
+def test_sync_facade_shares_the_async_client():
+    assert sync_facade.client is facade.client
+    assert sync_facade.loop_bridge is facade.loop_bridge
+
+
+def test_sync_calls_run_on_the_shared_bridge_loop(recorded_loops):
+    assert sync_facade.get_access_token() == 'token'
+    assert sync_facade.get_access_token() == 'token'
+    assert recorded_loops[0] is recorded_loops[1]
+    assert facade.loop_bridge.is_running
+
+
+def test_async_calls_run_on_the_callers_loop(recorded_loops):
+    async def run():
+        return await facade.get_access_token(), asyncio.get_running_loop()
+
+    token, loop = asyncio.run(run())
+    assert token == 'token'
+    assert recorded_loops == [loop]
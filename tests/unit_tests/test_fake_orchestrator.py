@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+
+from tests.unit_tests.conftest import PROCESS_NAME
+from uipath.benchmark import percentile
+from uipath.fake_orchestrator import FakeOrchestrator, parse_distribution
+
+
+def test_parse_distribution():
+    assert parse_distribution('2')() == 2
+    assert parse_distribution(1.5)() == 1.5
+    assert parse_distribution(None)() == 0
+    assert all(1 <= parse_distribution('uniform:1,3')() <= 3 for _ in range(100))
+    assert all(parse_distribution('exponential:2')() >= 0 for _ in range(100))
+    with pytest.raises(ValueError):
+        parse_distribution('bimodal:1,2')
+
+
+def test_percentile_uses_nearest_rank():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 95) == 0
+
+
+def test_jobs_fault_at_the_failure_rate(orchestrator):
+    async def run():
+        async with orchestrator(failure_rate=1) as (fake, client):
+            response = await client.call_process(PROCESS_NAME, {'n': 1})
+            return response, [job['State'] for job in fake.jobs.values()]
+
+    response, states = asyncio.run(run())
+    assert states == ['Faulted']
+    assert response['status'] == 'Running'
+
+
+def test_robots_limit_how_many_jobs_run_at_once(orchestrator):
+    async def run():
+        async with orchestrator(robots=2, job_duration=0.3) as (fake, client):
+            handles = [await client.submit_job(PROCESS_NAME, {'n': i}) for i in range(4)]
+            await asyncio.sleep(0.1)
+            running = sum(job['State'] == 'Running' for job in fake.jobs.values())
+            sessions = await client.fetch_robot_capacity(client.folder_id)
+            await asyncio.gather(*(handle.result(timeout=5) for handle in handles))
+            return running, sessions
+
+    assert asyncio.run(run()) == (2, 2)
+
+
+def test_error_rate_answers_with_503_and_counts_requests():
+    async def run():
+        fake = FakeOrchestrator(error_rate=1)
+        server = TestServer(fake.create_app())
+        await server.start_server()
+        try:
+            async with ClientSession() as session:
+                async with session.get(server.make_url('/org/tenant/odata/Releases')) as response:
+                    status = response.status
+                async with session.get(server.make_url('/_stats')) as response:
+                    stats = await response.json()
+            return status, stats
+        finally:
+            await server.close()
+
+    status, stats = asyncio.run(run())
+    assert status == 503
+    assert stats['requests'] == {'GET /{org}/{tenant}/odata/Releases': 1}
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uipath.http_client import OrchestratorHttpClient
+
+
+def test_requests_on_one_loop_share_a_session():
+    http = OrchestratorHttpClient()
+
+    async def run():
+        first = await http.get_session()
+        second = await http.get_session()
+        await http.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert first.closed
+    assert http.sessions_created == 1
+
+
+def test_each_loop_gets_its_own_session():
+    http = OrchestratorHttpClient()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def session():
+        return await http.get_session()
+
+    async def run():
+        own = await http.get_session()
+        # The other loop's session is closed on that loop
+        other = await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session(), other_loop))
+        await http.close()
+        return own, other
+
+    try:
+        own, other = asyncio.run(run())
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+    assert own is not other
+    assert own.closed and other.closed
+    assert http.sessions_created == 2
+
+
+def test_session_is_recreated_after_close():
+    http = OrchestratorHttpClient()
+
+    async def run():
+        first = await http.get_session()
+        await http.close_current_loop()
+        second = await http.get_session()
+        await http.close()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first is not second
+
+
+def test_connections_are_reused_across_requests():
+    peers = set()
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info('peername'))
+        return web.json_response({'ok': True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/odata/Folders', handler)
+        server = TestServer(app)
+        await server.start_server()
+        http = OrchestratorHttpClient(limit_per_host=1)
+        try:
+            for _ in range(5):
+                async with http.request('GET', str(server.make_url('/odata/Folders'))) as response:
+                    await response.json()
+            return http.stats()
+        finally:
+            await http.close()
+            await server.close()
+
+    stats = asyncio.run(run())
+    assert len(peers) == 1
+    assert stats['sessions_created'] == 1
+    assert stats['pools'][0]['limit_per_host'] == 1
@@ -0,0 +1,87 @@
+import asyncio
+
+from tests.unit_tests.conftest import PROCESS_NAME
+from uipath.idempotency import IdempotencyStore, make_idempotency_key
+from utils.uipath_config import get_uipath_config
+
+ARGS = {'in_PropertyName': 'Mall', 'in_ShopNumber': '12'}
+
+
+def test_key_depends_on_process_arguments_and_scope():
+    key = make_idempotency_key(PROCESS_NAME, ARGS, 'thread-1')
+    assert key == make_idempotency_key(PROCESS_NAME, dict(reversed(list(ARGS.items()))), 'thread-1')
+    assert key != make_idempotency_key(PROCESS_NAME, ARGS, 'thread-2')
+    assert key != make_idempotency_key(PROCESS_NAME, {**ARGS, 'in_ShopNumber': '13'}, 'thread-1')
+    assert key != make_idempotency_key('Other.Process', ARGS, 'thread-1')
+
+
+def test_store_tracks_running_then_finished_calls(monkeypatch, tmp_path):
+    now = [1000.0]
+    monkeypatch.setattr('uipath.idempotency.time.time', lambda: now[0])
+    store = IdempotencyStore(str(tmp_path / 'keys.sqlite3'), ttl=60)
+
+    assert store.get('k') is None
+    store.record_start('k', PROCESS_NAME, 7)
+    assert store.get('k') == {'job_id': 7, 'response': None}
+    store.record_response('k', {'status': 'Running'})
+    assert store.get('k') == {'job_id': 7, 'response': {'status': 'Running'}}
+
+    # Kept across restarts
+    assert IdempotencyStore(str(tmp_path / 'keys.sqlite3'), ttl=60).get('k')['job_id'] == 7
+
+    now[0] += 61
+    assert store.get('k') is None
+    assert store.stats() == {'entries': 1, 'hits': 1, 'reattached': 1, 'misses': 2}
+
+
+def test_store_file_is_created_on_first_use(tmp_path):
+    path = tmp_path / 'state' / 'keys.sqlite3'
+    store = IdempotencyStore(str(path))
+
+    assert not path.exists()
+    assert store.get('k') is None
+    assert path.exists()
+
+
+def test_default_store_lives_in_the_state_dir(monkeypatch, tmp_path):
+    monkeypatch.delenv('UIPATH_IDEMPOTENCY_PATH')
+    monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path))
+
+    assert get_uipath_config()['idempotency_path'] == str(tmp_path / 'react_agent' / 'uipath_idempotency.sqlite3')
+
+
+def test_discarded_key_starts_over():
+    store = IdempotencyStore(ttl=60)
+    store.record_start('k', PROCESS_NAME, 7)
+    store.discard('k')
+    assert store.get('k') is None
+
+
+def jobs_started(orchestrator, keys):
+    async def run():
+        async with orchestrator() as (fake, client):
+            responses = await asyncio.gather(*(client.call_process(PROCESS_NAME, ARGS, idempotency_key=key)
+                                               for key in keys))
+            # A repeat after the first call finished reuses its response
+            responses.append(await client.call_process(PROCESS_NAME, ARGS, idempotency_key=keys[0]))
+            return len(fake.jobs), responses
+
+    return asyncio.run(run())
+
+
+def test_repeated_calls_with_one_key_share_a_job(orchestrator):
+    key = make_idempotency_key(PROCESS_NAME, ARGS, 'thread-1')
+    started, responses = jobs_started(orchestrator, [key] * 3)
+    assert started == 1
+    assert all(response['status'] == 'Running' for response in responses)
+
+
+def test_calls_from_different_scopes_get_their_own_jobs(orchestrator):
+    keys = [make_idempotency_key(PROCESS_NAME, ARGS, scope) for scope in ('thread-1', 'thread-2')]
+    started, _ = jobs_started(orchestrator, keys)
+    assert started == 2
+
+
+def test_calls_without_a_key_are_not_deduplicated(orchestrator):
+    started, _ = jobs_started(orchestrator, [None, None])
+    assert started == 3
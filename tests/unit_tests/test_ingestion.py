@@ -0,0 +1,68 @@
+import asyncio
+
+from react_agent import knowledge_base
+from react_agent.ingestion import document_sources, ingest_documents, ingestion_summary
+from tests.unit_tests.conftest import inline_document
+
+
+def test_documents_upload_concurrently_up_to_the_limit(upload_server, monkeypatch):
+    monkeypatch.setenv('KB_INGESTION_LEDGER', 'false')
+    documents = [inline_document(f'doc{i}.pdf', f'content {i}'.encode()) for i in range(6)]
+
+    async def ingest():
+        async with upload_server() as server:
+            server.delay = 0.1
+            return server, await ingest_documents(documents, concurrency=3)
+
+    server, results = asyncio.run(ingest())
+
+    assert server.max_in_flight == 3
+    assert sorted(server.filenames) == [f'doc{i}.pdf' for i in range(6)]
+    assert [result.filename for result in results] == [f'doc{i}.pdf' for i in range(6)]
+    assert all(result.status == 'processed' for result in results)
+
+
+def test_each_upload_reports_its_own_outcome(upload_server, monkeypatch):
+    monkeypatch.setenv('KB_INGESTION_LEDGER', 'false')
+    reported = []
+    documents = [inline_document('lease.pdf', b'lease'), inline_document('broken.pdf', b'broken')]
+
+    async def ingest():
+        async with upload_server() as server:
+            server.fail.add('broken.pdf')
+            return await ingest_documents(documents, on_result=reported.append)
+
+    lease, broken = asyncio.run(ingest())
+
+    assert (lease.status, lease.status_code, lease.source) == ('processed', 200, 'kb/lease.pdf')
+    assert lease.ingestion_id in ('1', '2')
+    assert (broken.status, broken.status_code, broken.source) == ('failed', 500, None)
+    assert sorted(result.filename for result in reported) == ['broken.pdf', 'lease.pdf']
+    assert document_sources([lease, broken]) == ['kb/lease.pdf']
+    assert ingestion_summary([lease, broken], 1.0).endswith(
+        '1 of 2 documents processed, 0 already in the knowledge base, in 1.00s.')
+
+
+def test_unreachable_api_is_reported_as_error(upload_server, monkeypatch):
+    monkeypatch.setenv('KB_INGESTION_LEDGER', 'false')
+    monkeypatch.setenv('DOC_API_ENDPOINT_UPLOAD', 'http://127.0.0.1:9/upload')
+
+    [result] = asyncio.run(ingest_documents([inline_document('lease.pdf', b'lease')]))
+
+    assert result.status == 'error'
+    assert 'lease.pdf' in result.message
+
+
+def test_processed_documents_invalidate_cached_searches(upload_server, monkeypatch):
+    monkeypatch.setenv('KB_INGESTION_LEDGER', 'false')
+
+    async def ingest(name):
+        async with upload_server() as server:
+            server.fail.add('broken.pdf')
+            await ingest_documents([inline_document(name, name.encode())])
+
+    asyncio.run(ingest('broken.pdf'))
+    assert knowledge_base.get_knowledge_base_client().stats()['cache']['invalidations'] == 0
+
+    asyncio.run(ingest('lease.pdf'))
+    assert knowledge_base.get_knowledge_base_client().stats()['cache']['invalidations'] == 1
@@ -0,0 +1,100 @@
+import asyncio
+
+from react_agent import ingestion_ledger
+from react_agent.ingestion import ingest_documents
+from react_agent.ingestion_ledger import (
+    IngestionLedger,
+    document_hash,
+    get_ingestion_ledger,
+)
+from tests.unit_tests.conftest import inline_document
+
+LEASE_SHA256 = document_hash([b'lease'])
+
+
+def test_recorded_documents_are_found_by_content_hash():
+    ledger = IngestionLedger()
+
+    assert ledger.get(LEASE_SHA256) is None
+    ledger.record(LEASE_SHA256, 'lease.pdf', 'application/pdf', 'kb/lease.pdf', '42')
+
+    entry = ledger.get(LEASE_SHA256)
+    assert (entry['filename'], entry['source'], entry['ingestion_id']) == ('lease.pdf', 'kb/lease.pdf', '42')
+    assert ledger.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ingestion_ledger.time, 'time', lambda: now[0])
+    ledger = IngestionLedger(ttl=60)
+    ledger.record(LEASE_SHA256, 'lease.pdf', 'application/pdf', 'kb/lease.pdf')
+
+    now[0] += 60
+    assert ledger.get(LEASE_SHA256) is not None
+    now[0] += 1
+    assert ledger.get(LEASE_SHA256) is None
+
+
+def test_discarded_documents_are_forgotten():
+    ledger = IngestionLedger()
+    ledger.record(LEASE_SHA256, 'lease.pdf', 'application/pdf', 'kb/lease.pdf')
+
+    ledger.discard(LEASE_SHA256)
+
+    assert ledger.get(LEASE_SHA256) is None
+
+
+def test_ledger_file_survives_restarts(tmp_path):
+    path = str(tmp_path / 'ledger.sqlite3')
+    IngestionLedger(path).record(LEASE_SHA256, 'lease.pdf', 'application/pdf', 'kb/lease.pdf')
+
+    assert IngestionLedger(path).get(LEASE_SHA256)['source'] == 'kb/lease.pdf'
+
+
+def test_ledger_can_be_disabled(monkeypatch):
+    monkeypatch.setenv('KB_INGESTION_LEDGER', 'false')
+
+    assert get_ingestion_ledger() is None
+
+
+def test_already_ingested_content_is_skipped(upload_server):
+    async def ingest_twice():
+        async with upload_server() as server:
+            first = await ingest_documents([inline_document('lease.pdf', b'lease')])
+            # Same bytes under another name
+            second = await ingest_documents([inline_document('lease (1).pdf', b'lease')])
+            return server, first + second
+
+    server, (first, second) = asyncio.run(ingest_twice())
+
+    assert server.filenames == ['lease.pdf']
+    assert (first.status, first.sha256) == ('processed', LEASE_SHA256)
+    assert (second.status, second.source, second.filename) == ('skipped', 'kb/lease.pdf', 'lease (1).pdf')
+
+
+def test_same_content_attached_twice_is_uploaded_once(upload_server):
+    async def ingest():
+        async with upload_server() as server:
+            server.delay = 0.1
+            return server, await ingest_documents([inline_document('lease.pdf', b'lease'),
+                                                   inline_document('copy.pdf', b'lease')])
+
+    server, (lease, copy) = asyncio.run(ingest())
+
+    assert server.filenames == ['lease.pdf']
+    assert (lease.status, copy.status) == ('processed', 'skipped')
+    assert copy.source == lease.source == 'kb/lease.pdf'
+
+
+def test_failed_uploads_are_not_recorded(upload_server):
+    async def ingest_twice():
+        async with upload_server() as server:
+            server.fail.add('lease.pdf')
+            await ingest_documents([inline_document('lease.pdf', b'lease')])
+            server.fail.clear()
+            return server, await ingest_documents([inline_document('lease.pdf', b'lease')])
+
+    server, [retried] = asyncio.run(ingest_twice())
+
+    assert server.filenames == ['lease.pdf', 'lease.pdf']
+    assert retried.status == 'processed'
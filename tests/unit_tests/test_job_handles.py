@@ -0,0 +1,74 @@
+import asyncio
+
+from tests.unit_tests.conftest import PROCESS_NAME
+
+
+def test_submit_returns_before_the_job_finishes(orchestrator):
+    async def run():
+        async with orchestrator(job_duration=0.3) as (fake, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            running = fake.jobs[handle.job_id]['State']
+            result = await handle.result(timeout=5)
+            return handle, running, result
+
+    handle, running, result = asyncio.run(run())
+    assert running in ('Pending', 'Running')
+    assert result['IsSuccess']
+    assert handle.to_dict()['process_name'] == PROCESS_NAME
+
+
+def test_results_are_collected_by_job_id(orchestrator):
+    async def run():
+        async with orchestrator(job_duration=0.2) as (_, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            status = await client.get_job_result(handle.job_id)
+            result = await client.get_job_result(str(handle.job_id), timeout=5)
+            return handle, status, result, client.get_job_handle(handle.job_id)
+
+    handle, status, result, known = asyncio.run(run())
+    assert status['IsRunning']
+    assert result['IsSuccess']
+    assert known is handle
+
+
+def test_terminal_result_is_cached_on_the_handle(orchestrator):
+    async def run():
+        async with orchestrator() as (fake, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            await handle.result(timeout=5)
+            before = sum(fake.request_counts.values())
+            await handle.result(timeout=5)
+            await handle.status()
+            return sum(fake.request_counts.values()) - before
+
+    assert asyncio.run(run()) == 0
+
+
+def test_timed_out_result_is_flagged_and_not_cached(orchestrator):
+    async def run():
+        async with orchestrator(job_duration=5) as (_, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            return await handle.result(timeout=0.2), handle._result
+
+    result, cached = asyncio.run(run())
+    assert result['IsTimeout']
+    assert cached is None
+
+
+def test_cancel_stops_the_job(orchestrator):
+    async def run():
+        async with orchestrator(job_duration=5) as (fake, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            stopped = await handle.cancel()
+            return stopped, fake.jobs[handle.job_id]['State']
+
+    assert asyncio.run(run()) == (True, 'Stopped')
+
+
+def test_unknown_job_ids_get_a_bare_handle(orchestrator):
+    async def run():
+        async with orchestrator() as (_, client):
+            return client.get_job_handle(424242, PROCESS_NAME)
+
+    handle = asyncio.run(run())
+    assert (handle.job_id, handle.release_key, handle.process_name) == (424242, '', PROCESS_NAME)
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from uipath.job_poller import JobPollTimeout, JobStatusPoller
+from uipath.polling import FixedInterval
+from uipath.resilience import CircuitOpenError
+
+
+class FakeJobs:
+    """Job states by id, finishing after ``polls_to_finish`` status requests."""
+
+    def __init__(self, polls_to_finish=2, error=None):
+        self.polls_to_finish = polls_to_finish
+        self.error = error
+        self.requests = []
+
+    async def fetch(self, job_ids):
+        self.requests.append(list(job_ids))
+        if self.error is not None:
+            raise self.error
+        state = 'Successful' if len(self.requests) >= self.polls_to_finish else 'Running'
+        return [{'Id': job_id, 'State': state} for job_id in job_ids]
+
+
+def make_poller(jobs, **kwargs):
+    return JobStatusPoller(jobs.fetch, strategy=FixedInterval(0.01), coalesce_window=0.05, **kwargs)
+
+
+def test_many_jobs_share_each_status_request():
+    jobs = FakeJobs()
+    poller = make_poller(jobs, batch_size=100)
+
+    async def run():
+        return await asyncio.gather(*(poller.wait(job_id, timeout=5) for job_id in range(100)))
+
+    results = asyncio.run(run())
+    assert [result['Id'] for result in results] == list(range(100))
+    assert all(result['State'] == 'Successful' for result in results)
+    assert len(jobs.requests) == 2
+    assert poller.stats()['ticks'] == 2
+    assert poller.stats()['tracked_jobs'] == 0
+
+
+def test_large_batches_are_split_by_batch_size():
+    jobs = FakeJobs(polls_to_finish=1)
+    poller = make_poller(jobs, batch_size=40)
+
+    async def run():
+        await asyncio.gather(*(poller.wait(job_id, timeout=5) for job_id in range(100)))
+
+    asyncio.run(run())
+    assert sorted(len(ids) for ids in jobs.requests) == [20, 40, 40]
+
+
+def test_waiters_of_the_same_job_each_get_a_copy():
+    jobs = FakeJobs(polls_to_finish=1)
+    poller = make_poller(jobs)
+
+    async def run():
+        return await asyncio.gather(poller.wait(7, timeout=5), poller.wait(7, timeout=5))
+
+    first, second = asyncio.run(run())
+    assert first == second and first is not second
+    assert jobs.requests == [[7]]
+
+
+def test_a_waiter_with_a_shorter_interval_speeds_up_polling():
+    jobs = FakeJobs()
+    poller = JobStatusPoller(jobs.fetch, strategy=FixedInterval(30), coalesce_window=0)
+
+    async def run():
+        slow = asyncio.ensure_future(poller.wait(1))
+        await asyncio.sleep(0)
+        fast = await asyncio.wait_for(poller.wait(1, strategy=FixedInterval(0.01)), 1)
+        return fast, await slow
+
+    fast, slow = asyncio.run(run())
+    assert fast['State'] == slow['State'] == 'Successful'
+    assert len(jobs.requests) == 2
+
+
+def test_wait_times_out_with_the_last_seen_state():
+    jobs = FakeJobs(polls_to_finish=1000)
+    poller = make_poller(jobs)
+
+    async def run():
+        with pytest.raises(JobPollTimeout) as raised:
+            await poller.wait(1, timeout=0.1)
+        return raised.value
+
+    timeout = asyncio.run(run())
+    assert timeout.job_id == 1
+    assert timeout.last_seen['State'] == 'Running'
+
+
+def test_errors_are_retried_on_the_next_tick():
+    jobs = FakeJobs(polls_to_finish=2, error=ConnectionError('reset'))
+    poller = make_poller(jobs)
+
+    async def run():
+        waiter = asyncio.ensure_future(poller.wait(1, timeout=5))
+        while not jobs.requests:
+            await asyncio.sleep(0.01)
+        jobs.error = None
+        return await waiter
+
+    assert asyncio.run(run())['State'] == 'Successful'
+    assert poller.stats()['errors'] == 1
+
+
+def test_fail_fast_errors_reach_the_waiters():
+    jobs = FakeJobs(error=CircuitOpenError(30))
+    poller = make_poller(jobs, fail_fast_errors=(CircuitOpenError,))
+
+    async def run():
+        with pytest.raises(CircuitOpenError):
+            await poller.wait(1, timeout=5)
+
+    asyncio.run(run())
+    assert len(jobs.requests) == 1
+
+
+def test_watch_yields_each_state_change():
+    jobs = FakeJobs(polls_to_finish=3)
+    poller = make_poller(jobs)
+
+    async def run():
+        return [update['State'] async for update in poller.watch(1, timeout=5)]
+
+    assert asyncio.run(run()) == ['Running', 'Successful']
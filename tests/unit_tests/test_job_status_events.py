@@ -0,0 +1,64 @@
+import asyncio
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from react_agent.multi_agent_overhaul import tools
+from tests.unit_tests.conftest import PROCESS_NAME
+from uipath.orchestrator_client import JobStatusEvent
+
+
+def test_watch_job_yields_each_transition_until_terminal(orchestrator):
+    async def run():
+        async with orchestrator(job_duration=0.2, pending_delay=0.1) as (_, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            return [event async for event in client.watch_job(handle.job_id, timeout=5)]
+
+    events = asyncio.run(run())
+    assert events[-1].state == 'Successful' and events[-1].is_terminal
+    assert all(not event.is_terminal for event in events[:-1])
+    assert [event.previous_state for event in events[1:]] == [event.state for event in events[:-1]]
+
+
+def test_watch_job_ends_with_a_timeout_event(orchestrator):
+    async def run():
+        async with orchestrator(job_duration=5) as (_, client):
+            handle = await client.submit_job(PROCESS_NAME, {'n': 1})
+            return [event async for event in client.watch_job(handle.job_id, timeout=0.2)]
+
+    last = asyncio.run(run())[-1]
+    assert last.is_timeout and not last.is_terminal
+
+
+def test_call_process_reports_status_changes(orchestrator):
+    events = []
+
+    async def run():
+        async with orchestrator(job_duration=0.2) as (_, client):
+            return await client.call_process(PROCESS_NAME, {'n': 1}, on_status=events.append)
+
+    assert asyncio.run(run())['status'] == 'Running'
+    assert events[-1].state == 'Successful'
+
+
+def test_status_events_are_written_to_the_custom_stream():
+    assert tools._job_status_forwarder() is None
+
+    class GraphState(TypedDict):
+        done: bool
+
+    def node(state: GraphState) -> GraphState:
+        forward = tools._job_status_forwarder()
+        forward(JobStatusEvent(job_id=1, state='Running', previous_state='Pending', elapsed=1.0,
+                               is_terminal=False))
+        return {'done': True}
+
+    builder = StateGraph(GraphState)
+    builder.add_node('node', node)
+    builder.add_edge(START, 'node')
+    builder.add_edge('node', END)
+    chunks = list(builder.compile().stream({'done': False}, stream_mode='custom'))
+
+    assert chunks == [{'uipath_job': {'process_name': tools.ATT_PROCESS_NAME, 'job_id': 1, 'state': 'Running',
+                                      'previous_state': 'Pending', 'elapsed': 1.0, 'is_terminal': False,
+                                      'is_timeout': False}}]
@@ -0,0 +1,286 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from react_agent import knowledge_base
+from react_agent.knowledge_base import (
+    KnowledgeBaseClient,
+    KnowledgeBaseError,
+    SearchCache,
+    merge_search_answers,
+)
+
+
+def test_sync_searches_reuse_one_pooled_client(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    for query in ('tenant name', 'landlord name', 'lease term'):
+        answer = client.search(query)
+        assert answer['results'][0]['content'] == f'{query} hit 0'
+
+    assert client.stats()['clients_created'] == 1
+    assert client.stats()['searches'] == 3
+    assert search_server.payloads[0]['max_results'] == 3
+
+
+def test_async_client_is_kept_per_event_loop(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    async def searches(*queries):
+        for query in queries:
+            await client.asearch(query)
+        await client.aclose()
+
+    asyncio.run(searches('tenant name', 'landlord name'))
+    asyncio.run(searches('lease term'))
+
+    # One client per loop, shared by the searches made on it
+    assert client.stats()['clients_created'] == 2
+    assert search_server.queries == ['tenant name', 'landlord name', 'lease term']
+
+
+def test_search_url_is_read_from_the_environment(search_server):
+    assert KnowledgeBaseClient().search('tenant name')['results']
+
+
+def test_error_status_raises_knowledge_base_error(search_server):
+    search_server.status = 503
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    with pytest.raises(KnowledgeBaseError) as error:
+        client.search('tenant name')
+
+    assert error.value.status_code == 503
+    assert error.value.detail == 'Search failed'
+    assert client.stats()['errors'] == 1
+
+
+def test_tool_returns_error_message_instead_of_raising(search_server):
+    search_server.status = 500
+
+    message = knowledge_base.search_knowledge_base('tenant name')
+
+    assert message.startswith('Failed to retrieve document. API returned status code: 500.')
+
+
+def test_aclose_opens_new_connections_on_next_search(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    async def search_close_search():
+        await client.asearch('tenant name')
+        await client.aclose()
+        await client.asearch('landlord name')
+        await client.aclose()
+
+    asyncio.run(search_close_search())
+
+    assert client.stats()['clients_created'] == 2
+
+
+def test_cache_serves_repeated_normalized_queries(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    first = client.search('Tenant  Name')
+    again = client.search('tenant name')
+
+    assert again == first
+    assert search_server.queries == ['Tenant  Name']
+    assert client.stats()['cache']['hits'] == 1
+
+
+def test_cache_keys_include_search_options(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    client.search('tenant name', source_filter='lease.pdf')
+    client.search('tenant name', source_filter='addendum.pdf')
+
+    assert len(search_server.payloads) == 2
+
+
+def test_cache_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(knowledge_base.time, 'monotonic', lambda: now[0])
+    cache = SearchCache(ttl=10)
+    key = SearchCache.make_key({'query': 'tenant name'})
+
+    cache.put(key, {'results': []}, cache.get(key)[1])
+    now[0] += 10
+    assert cache.get(key)[0] == {'results': []}
+    now[0] += 1
+    assert cache.get(key)[0] is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = SearchCache(max_entries=2)
+    keys = [SearchCache.make_key({'query': query}) for query in ('a', 'b', 'c')]
+
+    cache.put(keys[0], 'a', 0)
+    cache.put(keys[1], 'b', 0)
+    cache.get(keys[0])
+    cache.put(keys[2], 'c', 0)
+
+    assert cache.get(keys[1])[0] is None
+    assert cache.get(keys[0])[0] == 'a'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_invalidate_drops_entries_and_late_answers():
+    cache = SearchCache()
+    key = SearchCache.make_key({'query': 'tenant name'})
+    _, generation = cache.get(key)
+    cache.put(key, 'before', generation)
+
+    cache.invalidate()
+    # An answer to a search that started before the invalidation is not kept
+    cache.put(key, 'stale', generation)
+
+    assert cache.get(key)[0] is None
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_zero_ttl_disables_the_cache(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url, cache=SearchCache(ttl=0))
+
+    client.search('tenant name')
+    client.search('tenant name')
+
+    assert len(search_server.payloads) == 2
+
+
+def test_invalidate_cache_makes_next_search_hit_the_api(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    client.search('tenant name')
+    client.invalidate_cache()
+    client.search('tenant name')
+
+    assert len(search_server.payloads) == 2
+
+
+def test_errors_are_not_cached(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+    search_server.status = 503
+    with pytest.raises(KnowledgeBaseError):
+        client.search('tenant name')
+
+    search_server.status = 200
+    assert client.search('tenant name')['results']
+    assert len(search_server.payloads) == 2
+
+
+def test_concurrent_threads_share_one_request(search_server):
+    search_server.delay = 0.2
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        answers = list(executor.map(lambda _: client.search('tenant name'), range(5)))
+
+    assert len(search_server.payloads) == 1
+    assert all(answer == answers[0] for answer in answers)
+    assert client.stats()['coalesced'] == 4
+
+
+def test_concurrent_async_searches_share_one_request(search_server):
+    search_server.delay = 0.2
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    async def searches():
+        try:
+            return await asyncio.gather(*(client.asearch('Tenant name') for _ in range(5)))
+        finally:
+            await client.aclose()
+
+    answers = asyncio.run(searches())
+
+    assert len(search_server.payloads) == 1
+    assert all(answer == answers[0] for answer in answers)
+    assert client.stats()['coalesced'] == 4
+
+
+def test_shared_search_error_reaches_every_waiter(search_server):
+    search_server.delay = 0.2
+    search_server.status = 502
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    def search(_):
+        try:
+            return client.search('tenant name')
+        except KnowledgeBaseError as e:
+            return e.status_code
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert list(executor.map(search, range(3))) == [502, 502, 502]
+    assert len(search_server.payloads) == 1
+
+
+def test_cancelled_waiter_does_not_cancel_shared_search(search_server):
+    search_server.delay = 0.2
+    client = KnowledgeBaseClient(search_url=search_server.url)
+
+    async def searches():
+        impatient = asyncio.ensure_future(client.asearch('tenant name'))
+        patient = asyncio.ensure_future(client.asearch('tenant name'))
+        await asyncio.sleep(0.05)
+        impatient.cancel()
+        try:
+            return await patient
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(searches())['results']
+    assert len(search_server.payloads) == 1
+
+
+def test_merge_keeps_each_hit_once_with_the_queries_that_found_it():
+    shared = {'id': 7, 'content': 'Tenant: Acme Ltd'}
+    answers = [{'results': [shared, {'id': 1, 'content': 'a'}]}, {'results': [shared]},
+               KnowledgeBaseError(500, 'down')]
+
+    merged = merge_search_answers(['tenant', 'lessee', 'occupant'], answers)
+
+    assert merged['queries'] == ['tenant', 'lessee', 'occupant']
+    assert [entry['result']['id'] for entry in merged['results']] == [7, 1]
+    assert merged['results'][0]['queries'] == ['tenant', 'lessee']
+    assert merged['errors']['occupant'].startswith('Failed to retrieve document. API returned status code: 500.')
+
+
+def test_search_batch_returns_errors_in_their_slots(search_server):
+    client = KnowledgeBaseClient(search_url=search_server.url)
+    client.search('tenant name')
+    search_server.status = 500
+
+    answers = client.search_batch(['tenant name', 'lease term'])
+
+    assert answers[0]['results']
+    assert isinstance(answers[1], KnowledgeBaseError)
+
+
+def test_batch_tool_searches_each_distinct_query_once(search_server, monkeypatch):
+    monkeypatch.setenv('KB_RESULT_TOKEN_BUDGET', '0')
+
+    merged = knowledge_base.search_knowledge_base_batch(['Tenant name', 'tenant  name', 'lease term', ''])
+
+    assert sorted(search_server.queries) == ['Tenant name', 'lease term']
+    assert merged['queries'] == ['Tenant name', 'lease term']
+    assert len(merged['results']) == 4
+
+
+def test_async_batch_tool_searches_every_query_in_every_source(search_server, monkeypatch):
+    monkeypatch.setenv('KB_RESULT_TOKEN_BUDGET', '0')
+
+    async def batch():
+        try:
+            return await knowledge_base.asearch_knowledge_base_batch(['tenant name', 'lease term'],
+                                                                     sources=['lease.pdf', 'addendum.pdf'])
+        finally:
+            await knowledge_base.get_knowledge_base_client().aclose()
+
+    merged = asyncio.run(batch())
+
+    assert sorted((p['query'], p['source_filter']) for p in search_server.payloads) == [
+        ('lease term', 'addendum.pdf'), ('lease term', 'lease.pdf'),
+        ('tenant name', 'addendum.pdf'), ('tenant name', 'lease.pdf')]
+    assert len(merged['results']) == 8
+    assert 'errors' not in merged
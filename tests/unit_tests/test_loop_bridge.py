@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from uipath.loop_bridge import LoopBridge
+
+
+@pytest.fixture
+def bridge():
+    bridge = LoopBridge(name='test-bridge')
+    yield bridge
+    bridge.stop()
+
+
+async def running_loop():
+    return asyncio.get_running_loop()
+
+
+def test_sync_calls_share_one_loop(bridge):
+    first = bridge.run(running_loop())
+    second = bridge.run(running_loop())
+    assert first is second
+    assert bridge.stats() == {'running': True, 'calls': 2}
+
+
+def test_can_be_called_from_a_thread_running_its_own_loop(bridge):
+    async def caller():
+        # A sync tool called from inside an async graph run
+        return bridge.run(running_loop()), asyncio.get_running_loop()
+
+    bridge_loop, caller_loop = asyncio.run(caller())
+    assert bridge_loop is not caller_loop
+
+
+def test_calling_from_the_bridge_loop_raises_instead_of_deadlocking(bridge):
+    async def nested():
+        return bridge.run(running_loop())
+
+    with pytest.raises(RuntimeError):
+        bridge.run(nested())
+
+
+def test_errors_reach_the_caller(bridge):
+    async def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError, match='boom'):
+        bridge.run(fail())
+
+
+def test_timeout_cancels_the_coroutine(bridge):
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError):
+        bridge.run(slow(), timeout=0.05)
+    bridge.run(asyncio.sleep(0.05))
+    assert cancelled == [True]
+
+
+def test_runs_again_after_stop(bridge):
+    first = bridge.run(running_loop())
+    bridge.stop()
+    assert not bridge.is_running
+    assert bridge.run(running_loop()) is not first
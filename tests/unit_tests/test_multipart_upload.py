@@ -0,0 +1,79 @@
+import asyncio
+import base64
+import binascii
+import os
+
+import pytest
+
+from react_agent.blob_store import iter_base64_decoded, store_document
+from react_agent.ingestion import ingest_documents
+from tests.unit_tests.conftest import inline_document
+
+CONTENT = os.urandom(1024 * 1024 + 7)
+
+
+def test_base64_is_decoded_in_bounded_chunks():
+    text = base64.encodebytes(CONTENT).decode()  # with line breaks
+
+    chunks = list(iter_base64_decoded(text, chunk_size=3 * 1024))
+
+    assert b''.join(chunks) == CONTENT
+    assert max(len(chunk) for chunk in chunks) <= 3 * 1024
+
+
+def test_truncated_base64_raises():
+    with pytest.raises(binascii.Error):
+        list(iter_base64_decoded(base64.b64encode(b'lease').decode()[:-1]))
+
+
+def ingest_in_mode(upload_server, monkeypatch, mode, document):
+    monkeypatch.setenv('KB_INGESTION_LEDGER', 'false')
+    monkeypatch.setenv('KB_UPLOAD_MODE', mode)
+
+    async def ingest():
+        async with upload_server() as server:
+            return server, await ingest_documents([document])
+
+    server, [result] = asyncio.run(ingest())
+    return server.uploads[0], result
+
+
+def test_multipart_mode_streams_raw_bytes(upload_server, monkeypatch):
+    upload, result = ingest_in_mode(upload_server, monkeypatch, 'multipart', inline_document('lease.pdf', CONTENT))
+
+    assert result.status == 'processed'
+    assert upload['data'] == CONTENT
+    assert (upload['filename'], upload['content_type']) == ('lease.pdf', 'application/pdf')
+    # Streamed: the body length is not known up front
+    assert upload['headers'].get('Transfer-Encoding') == 'chunked'
+    assert len(CONTENT) < result.bytes_sent < len(CONTENT) + 1024
+
+
+def test_multipart_upload_is_smaller_than_json(upload_server, monkeypatch):
+    _, multipart = ingest_in_mode(upload_server, monkeypatch, 'multipart', inline_document('lease.pdf', CONTENT))
+    _, as_json = ingest_in_mode(upload_server, monkeypatch, 'json', inline_document('lease.pdf', CONTENT))
+
+    assert multipart.bytes_sent < as_json.bytes_sent * 0.76
+
+
+def test_filename_quotes_are_escaped(upload_server, monkeypatch):
+    upload, result = ingest_in_mode(upload_server, monkeypatch, 'multipart',
+                                    inline_document('the "final" lease.pdf', b'lease'))
+
+    assert result.status == 'processed'
+    assert upload['filename'] == 'the "final" lease.pdf'
+    assert upload['data'] == b'lease'
+
+
+@pytest.mark.parametrize('mode', ['json', 'multipart'])
+def test_blob_documents_are_streamed_from_the_store(upload_server, monkeypatch, mode):
+    monkeypatch.setenv('KB_BLOB_STORE', 'memory')
+    descriptor = store_document(inline_document('lease.pdf', CONTENT))
+
+    upload, result = ingest_in_mode(upload_server, monkeypatch, mode, descriptor)
+
+    assert result.status == 'processed'
+    assert upload['data'] == CONTENT
+    if mode == 'json':
+        # Encoded while sent, yet with the exact length announced up front
+        assert int(upload['headers']['Content-Length']) == result.bytes_sent
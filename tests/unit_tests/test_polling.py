@@ -0,0 +1,59 @@
+import pytest
+
+from uipath.polling import (
+    DurationModel,
+    ExponentialBackoff,
+    FixedInterval,
+    LearnedBackoff,
+    PollingStrategy,
+    create_polling_strategy,
+)
+
+
+def test_strategy_without_next_delay_cannot_be_created():
+    class Incomplete(PollingStrategy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_backoff_grows_to_the_cap():
+    strategy = ExponentialBackoff(initial=1, factor=2, cap=10, jitter=0)
+    assert [strategy.next_delay(attempt, 0) for attempt in range(6)] == [1, 2, 4, 8, 10, 10]
+
+
+def test_backoff_jitter_stays_within_bounds():
+    strategy = ExponentialBackoff(initial=4, factor=1, cap=4, jitter=0.25)
+    delays = [strategy.next_delay(0, 0) for _ in range(200)]
+    assert all(3 <= delay <= 5 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_duration_model_needs_min_samples():
+    model = DurationModel(min_samples=3)
+    model.record('P', 10)
+    model.record('P', 10)
+    assert model.expected('P') is None
+    model.record('P', 10)
+    assert model.expected('P') == (10, 0)
+
+
+def test_learned_backoff_sleeps_until_the_earliest_likely_finish():
+    strategy = LearnedBackoff(initial=1, factor=1.5, cap=60, jitter=0)
+    for _ in range(3):
+        strategy.record_duration('P', 30)
+
+    assert strategy.next_delay(0, 5, 'P') == 25
+    # Overdue jobs are polled quickly, backing off with how late they are
+    assert strategy.next_delay(1, 31, 'P') == 1
+    assert strategy.next_delay(2, 40, 'P') == 5
+    # Processes without history use plain backoff
+    assert strategy.next_delay(0, 5, 'Other') == 1
+
+
+def test_create_polling_strategy():
+    assert isinstance(create_polling_strategy('fixed', interval=3), FixedInterval)
+    assert isinstance(create_polling_strategy('learned'), LearnedBackoff)
+    with pytest.raises(ValueError):
+        create_polling_strategy('sometimes')
@@ -0,0 +1,41 @@
+import asyncio
+import json
+
+from tests.unit_tests.conftest import PROCESS_NAME
+
+QUEUES = {'UIPATH_DISPATCH_QUEUES': json.dumps({PROCESS_NAME: 'ATT_Forms'})}
+
+
+def test_call_process_waits_for_the_queue_item_like_a_job(orchestrator):
+    async def run():
+        async with orchestrator(env=QUEUES, job_duration=0.2) as (fake, client):
+            response = await client.call_process(PROCESS_NAME, {'PropertyName': 'Mall'})
+            return response, [item['Status'] for item in fake.queue_items.values()]
+
+    response, statuses = asyncio.run(run())
+    assert response['status'] == 'Running'
+    assert response['reference']
+    # The item was processed before the call returned
+    assert statuses == ['Successful']
+
+
+def test_call_process_returns_the_same_shape_in_job_and_queue_mode(orchestrator):
+    async def run(env):
+        async with orchestrator(env=env) as (_, client):
+            return await client.call_process(PROCESS_NAME, {'PropertyName': 'Mall'})
+
+    job_response = asyncio.run(run({}))
+    queue_response = asyncio.run(run(QUEUES))
+    assert job_response['status'] == queue_response['status'] == 'Running'
+
+
+def test_enqueued_items_can_be_collected_through_their_handles(orchestrator):
+    async def run():
+        async with orchestrator(env=QUEUES) as (fake, client):
+            submissions = await client.enqueue_items(PROCESS_NAME, [{'n': i} for i in range(5)], 'ATT_Forms')
+            results = await asyncio.gather(*(s.handle.result(timeout=5) for s in submissions))
+            return fake, results
+
+    fake, results = asyncio.run(run())
+    assert all(result['IsSuccess'] for result in results)
+    assert fake.request_counts['POST /{org}/{tenant}/odata/Queues/UiPathODataSvc.BulkAddQueueItems'] == 1
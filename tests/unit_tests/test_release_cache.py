@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from tests.unit_tests.conftest import PROCESS_NAME
+from uipath.release_cache import ReleaseKeyCache, ReleaseNotFoundError
+
+RELEASES = 'GET /{org}/{tenant}/odata/Releases'
+
+
+def test_cache_expires_entries_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('uipath.release_cache.time.time', lambda: now[0])
+    cache = ReleaseKeyCache(ttl=10)
+    cache.set('1', 'P', 'key')
+    assert cache.get('1', 'P') == 'key'
+    now[0] += 11
+    assert cache.get('1', 'P') is None
+
+
+def test_concurrent_cold_lookups_share_one_request(orchestrator):
+    async def run():
+        async with orchestrator() as (fake, client):
+            keys = await asyncio.gather(*(client.get_release_key(PROCESS_NAME) for _ in range(50)))
+            return fake, keys
+
+    fake, keys = asyncio.run(run())
+    assert len(set(keys)) == 1
+    assert fake.request_counts[RELEASES] == 1
+
+
+def test_failed_lookup_is_not_cached(orchestrator):
+    async def run():
+        async with orchestrator() as (fake, client):
+            for _ in range(2):
+                with pytest.raises(ReleaseNotFoundError):
+                    await asyncio.gather(*(client.get_release_key('Missing.Process') for _ in range(5)))
+            return fake
+
+    assert asyncio.run(run()).request_counts[RELEASES] == 2
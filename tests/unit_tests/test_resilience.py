@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uipath.http_client import OrchestratorHttpClient
+from uipath.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    backoff_delay,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('uipath.resilience.time.monotonic', lambda: now[0])
+    return now
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+    for _ in range(3):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_breaker_lets_one_trial_through_after_the_recovery_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    clock[0] += 31
+
+    breaker.before_call()
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    clock[0] += 31
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.stats()['opened'] == 2
+
+
+def test_retry_budget_caps_retries_to_a_share_of_requests(clock):
+    budget = RetryBudget(ratio=0.25, min_per_second=0, max_tokens=2)
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.stats()['exhausted'] == 2
+
+
+def test_retry_budget_refills_over_time(clock):
+    budget = RetryBudget(ratio=0, min_per_second=1, max_tokens=5)
+    while budget.try_spend():
+        pass
+    clock[0] += 2
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=0.5, cap=2) <= 2 for attempt in range(20))
+
+
+def serve(statuses, scenario):
+    """Answer requests with ``statuses`` in turn (the last one repeating) and run ``scenario(url)``."""
+
+    calls = []
+
+    async def handler(request):
+        calls.append(request.method)
+        status = statuses[min(len(calls), len(statuses)) - 1]
+        return web.json_response({'status': status}, status=status)
+
+    async def run():
+        app = web.Application()
+        app.router.add_route('*', '/odata/Jobs', handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await scenario(str(server.make_url('/odata/Jobs')))
+        finally:
+            await server.close()
+
+    return asyncio.run(run()), calls
+
+
+def make_client(**kwargs):
+    kwargs.setdefault('retry_base', 0.001)
+    kwargs.setdefault('retry_cap', 0.01)
+    return OrchestratorHttpClient(**kwargs)
+
+
+def status_of(http, method):
+    async def scenario(url):
+        try:
+            async with http.request(method, url) as response:
+                return response.status
+        finally:
+            await http.close()
+
+    return scenario
+
+
+def test_idempotent_requests_are_retried_until_they_succeed():
+    status, calls = serve([503, 503, 200], status_of(make_client(), 'GET'))
+    assert status == 200
+    assert len(calls) == 3
+
+
+def test_non_idempotent_requests_are_not_retried():
+    status, calls = serve([503, 200], status_of(make_client(), 'POST'))
+    assert status == 503
+    assert len(calls) == 1
+
+
+def test_retries_stop_when_the_budget_runs_out():
+    http = make_client(retry_budget=RetryBudget(ratio=0, min_per_second=0, max_tokens=1))
+    status, calls = serve([503], status_of(http, 'GET'))
+    assert status == 503
+    assert len(calls) == 2
+
+
+def test_open_breaker_fails_fast_without_sending():
+    http = make_client(breaker=CircuitBreaker(failure_threshold=2, recovery_timeout=60), max_retries=5)
+
+    async def scenario(url):
+        try:
+            with pytest.raises(CircuitOpenError):
+                async with http.request('GET', url):
+                    pass
+        finally:
+            await http.close()
+
+    _, calls = serve([503], scenario)
+    assert len(calls) == 2
@@ -0,0 +1,24 @@
+from react_agent.multi_agent_overhaul import tools
+from react_agent.multi_agent_overhaul.state import State
+from uipath.idempotency import make_idempotency_key
+
+ARGS = {'in_PropertyName': 'Mall'}
+
+
+def test_idempotency_key_is_scoped_to_the_request():
+    key = tools._idempotency_key(ARGS, State(requestid='request-1'))
+    assert key == make_idempotency_key(tools.ATT_PROCESS_NAME, ARGS, 'request-1')
+
+
+def test_idempotency_key_falls_back_to_the_thread(monkeypatch):
+    monkeypatch.setattr(tools, 'get_config', lambda: {'configurable': {'thread_id': 'thread-1'}})
+    key = tools._idempotency_key(ARGS, State())
+    assert key == make_idempotency_key(tools.ATT_PROCESS_NAME, ARGS, 'thread-1')
+
+
+def test_calls_without_request_or_thread_are_not_deduplicated(monkeypatch):
+    def outside_a_graph():
+        raise RuntimeError('Called get_config outside of a runnable context')
+
+    monkeypatch.setattr(tools, 'get_config', outside_a_graph)
+    assert tools._idempotency_key(ARGS, State()) is None
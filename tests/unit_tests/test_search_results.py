@@ -0,0 +1,135 @@
+import asyncio
+import base64
+import hashlib
+import threading
+
+import pytest
+
+from react_agent import search_results
+from react_agent.search_results import (
+    TokenCounter,
+    shape_results,
+    tokenizer_stats,
+    warm_tokenizer,
+)
+
+
+@pytest.fixture
+def encoders(monkeypatch):
+    """Empty tokenizer cache; 'estimate' is preloaded as the length-based fallback."""
+
+    loaded = {'estimate': None}
+    monkeypatch.setattr(search_results, '_encoders', loaded)
+    return loaded
+
+
+@pytest.fixture
+def vendored(monkeypatch, tmp_path):
+    """A 'tiny' encoding of single bytes plus a few merges, vendored under ``tmp_path``; records load threads."""
+
+    ranks = [bytes([i]) for i in range(256)] + [b'on', b'one', b'tw', b'two']
+    contents = ''.join(f'{base64.b64encode(token).decode()} {rank}\n' for rank, token in enumerate(ranks)).encode()
+    (tmp_path / 'tiny.tiktoken').write_bytes(contents)
+    monkeypatch.setattr(search_results, 'TOKENIZER_DIR', str(tmp_path))
+    monkeypatch.setitem(search_results.ENCODINGS, 'tiny', {
+        'pat_str': r"""\S+|\s+""", 'special_tokens': {}, 'sha256': hashlib.sha256(contents).hexdigest()})
+
+    loads = []
+    load_encoding = search_results._load_encoding
+
+    def record(encoding):
+        loads.append(threading.current_thread())
+        return load_encoding(encoding)
+
+    monkeypatch.setattr(search_results, '_load_encoding', record)
+    monkeypatch.setattr(search_results, '_load_errors', {})
+    return loads
+
+
+def test_hits_are_compacted_and_ranked_by_score(encoders):
+    hits = [{'id': 1, 'content': 'Lease term: 5 years', 'metadata': {'source': 'lease.pdf', 'page': 2},
+             'similarity': 0.61234},
+            {'id': 2, 'text': 'Tenant: Acme Ltd', 'score': 0.9}]
+
+    shaped = shape_results(hits, 100, TokenCounter('estimate'))
+
+    assert shaped == {'results': [{'score': 0.9, 'text': 'Tenant: Acme Ltd'},
+                                  {'source': 'lease.pdf', 'score': 0.612, 'text': 'Lease term: 5 years'}]}
+
+
+def test_repeated_chunks_are_dropped(encoders):
+    text = 'The tenant shall pay the rent monthly in advance on the first day'
+    hits = [{'content': text, 'score': 0.9}, {'content': text + '.', 'score': 0.8},
+            {'content': 'The landlord is Example Properties Ltd', 'score': 0.7}]
+
+    shaped = shape_results(hits, 1000, TokenCounter('estimate'))
+
+    assert [hit['score'] for hit in shaped['results']] == [0.9, 0.7]
+
+
+def test_hits_are_truncated_then_omitted_to_fit_the_budget(encoders):
+    hits = [{'content': 'a' * 200, 'score': 0.9}, {'content': 'b ' * 200, 'score': 0.8},
+            {'content': 'c ' * 200, 'score': 0.7}]
+
+    shaped = shape_results(hits, 90, TokenCounter('estimate'))
+
+    assert shaped['results'][0]['text'] == 'a' * 200
+    assert shaped['results'][1]['text'] == ('b ' * 200)[:40 * 4] + '...'
+    assert shaped['results'][1]['truncated'] is True
+    assert shaped['omitted'] == 1
+
+
+def test_extra_fields_are_added_per_hit(encoders):
+    shaped = shape_results([{'content': 'Tenant: Acme Ltd'}], 100, TokenCounter('estimate'),
+                           extra=lambda i: {'queries': ['tenant']})
+
+    assert shaped['results'] == [{'text': 'Tenant: Acme Ltd', 'queries': ['tenant']}]
+
+
+def test_tokenizer_is_built_from_the_vendored_file(encoders, vendored):
+    counter = TokenCounter('tiny')
+    TokenCounter('tiny')
+
+    assert counter.count('one two') == 3
+    assert counter.truncate('one two', 2) == 'one '
+    assert len(vendored) == 1
+    assert 'tiny' in tokenizer_stats()['encodings']
+
+
+def test_tampered_file_is_reported_and_retried(encoders, vendored, monkeypatch, tmp_path, caplog):
+    (tmp_path / 'tiny.tiktoken').write_bytes(b'b24= 0\n')
+    now = [1000.0]
+    monkeypatch.setattr(search_results.time, 'monotonic', lambda: now[0])
+
+    counter = TokenCounter('tiny')
+    TokenCounter('tiny')
+
+    assert counter.count('x' * 40) == 10
+    assert len(vendored) == 1
+    assert "Tokenizer 'tiny' could not be loaded" in caplog.text
+    assert 'does not match the SHA-256' in tokenizer_stats()['errors']['tiny']
+
+    now[0] += search_results.TOKENIZER_RETRY_INTERVAL
+    TokenCounter('tiny')
+    assert len(vendored) == 2
+
+
+def test_missing_file_falls_back_to_the_estimate(encoders, vendored):
+    counter = TokenCounter('cl100k_base')
+
+    assert counter.count('x' * 40) == 10
+    assert tokenizer_stats()['errors']['cl100k_base'].startswith('FileNotFoundError')
+
+
+def test_warm_tokenizer_loads_off_the_event_loop(encoders, vendored, monkeypatch):
+    monkeypatch.setenv('KB_TOKENIZER_ENCODING', 'tiny')
+
+    async def warm_twice():
+        await warm_tokenizer()
+        return await warm_tokenizer()
+
+    counter = asyncio.run(warm_twice())
+
+    assert counter.count('one two') == 3
+    assert len(vendored) == 1
+    assert vendored[0] is not threading.main_thread()
@@ -0,0 +1,141 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from uipath.http_client import OrchestratorHttpClient
+from uipath.token_manager import TokenManager
+
+
+def make_fetcher(tokens, expires_in=3600, delay=0.01):
+    calls = []
+
+    async def fetch():
+        calls.append(len(calls))
+        await asyncio.sleep(delay)
+        return {'access_token': tokens[min(len(calls), len(tokens)) - 1], 'expires_in': expires_in}
+
+    return fetch, calls
+
+
+def test_concurrent_callers_share_one_fetch():
+    fetch, calls = make_fetcher(['t1'])
+    manager = TokenManager(fetch)
+
+    async def run():
+        return await asyncio.gather(*(manager.get_token() for _ in range(20)))
+
+    assert asyncio.run(run()) == ['t1'] * 20
+    assert len(calls) == 1
+    assert manager.stats()['misses'] == 20
+
+
+def test_cached_token_is_served_without_fetching():
+    fetch, calls = make_fetcher(['t1'])
+    manager = TokenManager(fetch)
+
+    async def run():
+        await manager.get_token()
+        return [await manager.get_token() for _ in range(5)]
+
+    assert asyncio.run(run()) == ['t1'] * 5
+    assert len(calls) == 1
+    assert manager.stats()['hits'] == 5
+
+
+def test_token_inside_refresh_window_is_refreshed_in_background():
+    fetch, calls = make_fetcher(['t1', 't2'], expires_in=200)
+    manager = TokenManager(fetch, expiry_margin=60, refresh_ahead=300)
+
+    async def run():
+        first = await manager.get_token()
+        # Still valid, so served at once while the refresh runs
+        second = await manager.get_token()
+        await asyncio.sleep(0.05)
+        return first, second, await manager.get_token()
+
+    assert asyncio.run(run()) == ('t1', 't1', 't2')
+    assert manager.stats()['background_refreshes'] >= 1
+
+
+def test_renew_refreshes_once_for_concurrent_rejections():
+    fetch, calls = make_fetcher(['t1', 't2'])
+    manager = TokenManager(fetch)
+
+    async def run():
+        await manager.get_token()
+        return await asyncio.gather(*(manager.renew('t1') for _ in range(10)))
+
+    assert asyncio.run(run()) == ['t2'] * 10
+    assert len(calls) == 2
+
+
+def test_renew_keeps_a_token_that_was_already_replaced():
+    fetch, calls = make_fetcher(['t1', 't2'])
+    manager = TokenManager(fetch)
+
+    async def run():
+        await manager.get_token()
+        await manager.renew('t1')
+        # A late 401 for the old token must not throw away the new one
+        return await manager.renew('t1')
+
+    assert asyncio.run(run()) == 't2'
+    assert len(calls) == 2
+
+
+def run_with_server(valid_tokens, scenario):
+    seen = []
+
+    async def handler(request):
+        seen.append(request.headers.get('Authorization'))
+        if request.headers.get('Authorization') not in {f'Bearer {t}' for t in valid_tokens}:
+            return web.json_response({'message': 'unauthorized'}, status=401)
+        return web.json_response({'ok': True})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/odata/Jobs', handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await scenario(str(server.make_url('/odata/Jobs')))
+        finally:
+            await server.close()
+
+    return asyncio.run(run()), seen
+
+
+def test_request_retries_once_with_a_fresh_token_after_401():
+    fetch, calls = make_fetcher(['revoked', 'fresh'])
+    manager = TokenManager(fetch)
+    http = OrchestratorHttpClient(token_manager=manager)
+
+    async def scenario(url):
+        token = await manager.get_token()
+        async with http.request('GET', url, headers={'Authorization': f'Bearer {token}'}) as response:
+            status = response.status
+        await http.close()
+        return status
+
+    status, seen = run_with_server({'fresh'}, scenario)
+    assert status == 200
+    assert seen == ['Bearer revoked', 'Bearer fresh']
+    assert len(calls) == 2
+
+
+def test_request_gives_up_after_one_reauthentication():
+    fetch, calls = make_fetcher(['a', 'b', 'c'])
+    manager = TokenManager(fetch)
+    http = OrchestratorHttpClient(token_manager=manager)
+
+    async def scenario(url):
+        token = await manager.get_token()
+        async with http.request('GET', url, headers={'Authorization': f'Bearer {token}'}) as response:
+            status = response.status
+        await http.close()
+        return status
+
+    status, seen = run_with_server(set(), scenario)
+    assert status == 401
+    assert seen == ['Bearer a', 'Bearer b']
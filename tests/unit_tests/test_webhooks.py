@@ -0,0 +1,87 @@
+import asyncio
+import json
+
+import aiohttp
+from aiohttp.test_utils import unused_port
+
+from uipath.webhooks import WebhookReceiver, job_from_webhook, sign_webhook_body
+
+SECRET = 'webhook-secret'
+
+
+def completed_event(job_id, **job):
+    return {'Type': 'job.completed', 'Job': {'Id': job_id, **job}}
+
+
+async def post(receiver, body, signature=None):
+    headers = {'Content-Type': 'application/json'}
+    if signature is not None:
+        headers['X-UiPath-Signature'] = signature
+    url = f'http://127.0.0.1:{receiver.port}{receiver.path}'
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, data=body, headers=headers) as response:
+            return response.status
+
+
+def run_receiver(scenario, secret=SECRET):
+    async def run():
+        receiver = WebhookReceiver(host='127.0.0.1', port=unused_port(), secret=secret)
+        await receiver.start()
+        try:
+            return await scenario(receiver)
+        finally:
+            await receiver.stop()
+
+    return asyncio.run(run())
+
+
+def test_signed_event_resolves_the_waiter():
+    async def scenario(receiver):
+        waiter = receiver.register(42)
+        body = json.dumps(completed_event(42, OutputArguments={'ok': True})).encode()
+        status = await post(receiver, body, sign_webhook_body(SECRET, body))
+        return status, await asyncio.wait_for(waiter, 1)
+
+    status, job = run_receiver(scenario)
+    assert status == 202
+    assert job['State'] == 'Successful'
+    assert json.loads(job['OutputArguments']) == {'ok': True}
+
+
+def test_bad_or_missing_signature_is_rejected():
+    async def scenario(receiver):
+        waiter = receiver.register(42)
+        body = json.dumps(completed_event(42)).encode()
+        statuses = [await post(receiver, body, sign_webhook_body('other-secret', body)),
+                    await post(receiver, body),
+                    # Signed, but the body was altered afterwards
+                    await post(receiver, body.replace(b'42', b'43'), sign_webhook_body(SECRET, body))]
+        return statuses, waiter.done(), receiver.stats()
+
+    statuses, resolved, stats = run_receiver(scenario)
+    assert statuses == [401, 401, 401]
+    assert not resolved
+    assert stats['events_rejected'] == 3 and stats['events_received'] == 0
+
+
+def test_unsigned_events_are_accepted_without_a_secret():
+    async def scenario(receiver):
+        waiter = receiver.register(1)
+        status = await post(receiver, json.dumps(completed_event(1)).encode())
+        return status, await asyncio.wait_for(waiter, 1)
+
+    status, job = run_receiver(scenario, secret=None)
+    assert status == 202 and job['Id'] == 1
+
+
+def test_event_arriving_before_its_waiter_is_kept():
+    async def scenario(receiver):
+        receiver.dispatch(job_from_webhook(completed_event(5)))
+        return await asyncio.wait_for(receiver.register(5), 1)
+
+    assert run_receiver(scenario)['Id'] == 5
+
+
+def test_faulted_event_maps_to_faulted_state():
+    job = job_from_webhook({'Type': 'job.faulted', 'Job': {'Id': 3}})
+    assert job == {'Id': 3, 'State': 'Faulted'}
@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+@dataclass(order=True)
+class _Waiter:
+    sort_key: tuple
+    count: int = field(compare=False)
+    process_name: Optional[str] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    admitted: bool = field(default=False, compare=False)
+
+
+@dataclass
+class _FolderPool:
+    capacity: Optional[int] = None
+    capacity_checked_at: float = 0.0
+    refreshing: bool = False
+    in_flight: int = 0
+    process_in_flight: Dict[str, int] = field(default_factory=dict)
+    waiters: List[_Waiter] = field(default_factory=list)
+
+    admitted: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class AdmissionController:
+    """Holds job starts back until a robot is likely to be free to run them.
+
+    Every folder has a capacity: a fixed ``capacity`` or, when
+    ``fetch_capacity`` is given, the number of connected robots it reports,
+    refreshed every ``refresh_interval`` seconds. While the capacity is
+    unknown (none given, not fetched yet, or no robots reported) nothing is
+    held back. ``process_limits`` optionally
+    caps the jobs of individual processes. ``acquire`` returns once the
+    requested slots fit (a request larger than the capacity is admitted when
+    nothing else runs) and ``release`` gives them back when the job finishes.
+    Waiters are admitted by descending priority, then arrival; ones that do not
+    fit yet are skipped so smaller requests keep flowing. Slots and waiters are
+    shared by all event loops of the process.
+    """
+
+    def __init__(self, fetch_capacity: Optional[Callable[[str], Awaitable[Optional[int]]]] = None,
+                 capacity: Optional[int] = None, process_limits: Optional[Dict[str, int]] = None,
+                 refresh_interval: float = 60):
+        self._fetch_capacity = fetch_capacity
+        self.capacity = capacity
+        self.process_limits = process_limits or {}
+        self.refresh_interval = refresh_interval
+
+        self._pools: Dict[str, _FolderPool] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def _pool(self, folder_id: str) -> _FolderPool:
+        pool = self._pools.get(str(folder_id))
+        if pool is None:
+            pool = self._pools[str(folder_id)] = _FolderPool(capacity=self.capacity)
+        return pool
+
+    async def _refresh_capacity(self, folder_id: str) -> None:
+        if self._fetch_capacity is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            pool = self._pool(folder_id)
+            if pool.refreshing or now - pool.capacity_checked_at < self.refresh_interval:
+                return
+            pool.refreshing = True
+
+        capacity = pool.capacity
+        try:
+            capacity = await self._fetch_capacity(folder_id)
+        except Exception as e:
+            # Keep the last known capacity (None admits everything) until the next refresh
+            print(f"Could not read robot capacity: {e}")
+        finally:
+            with self._lock:
+                if capacity is not None:
+                    # No robot reported (e.g. none visible in Sessions) says nothing about
+                    # how many jobs can run, so the capacity stays unknown and admits everything
+                    pool.capacity = capacity or None
+                pool.capacity_checked_at = time.monotonic()
+                pool.refreshing = False
+                self._admit(pool)
+
+    async def acquire(self, folder_id: str, process_name: Optional[str] = None,
+                      count: int = 1, priority: int = 0) -> float:
+        """Wait until ``count`` job slots are free and take them; returns the seconds waited."""
+
+        await self._refresh_capacity(folder_id)
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(sort_key=(-priority, next(self._sequence)), count=count,
+                         process_name=process_name, future=future, enqueued_at=time.monotonic())
+        with self._lock:
+            pool = self._pool(folder_id)
+            heapq.heappush(pool.waiters, waiter)
+            self._admit(pool)
+            if not waiter.admitted:
+                pool.queued += 1
+                print(f"Job start queued locally: {pool.in_flight} running, "
+                      f"{len(pool.waiters)} waiting for robot capacity {pool.capacity}")
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in pool.waiters:
+                    pool.waiters.remove(waiter)
+                    heapq.heapify(pool.waiters)
+            if waiter.admitted:
+                self.release(folder_id, process_name, count)
+            raise
+        return time.monotonic() - waiter.enqueued_at
+
+    def release(self, folder_id: str, process_name: Optional[str] = None, count: int = 1) -> None:
+        """Give back slots taken by ``acquire`` once their jobs finished (or failed to start)."""
+
+        if count <= 0:
+            return
+        with self._lock:
+            pool = self._pool(folder_id)
+            pool.in_flight = max(0, pool.in_flight - count)
+            if process_name:
+                remaining = pool.process_in_flight.get(process_name, 0) - count
+                if remaining > 0:
+                    pool.process_in_flight[process_name] = remaining
+                else:
+                    pool.process_in_flight.pop(process_name, None)
+            self._admit(pool)
+
+    def _fits(self, pool: _FolderPool, waiter: _Waiter) -> bool:
+        if pool.capacity is not None and pool.in_flight and pool.in_flight + waiter.count > pool.capacity:
+            return False
+        limit = self.process_limits.get(waiter.process_name) if waiter.process_name else None
+        running = pool.process_in_flight.get(waiter.process_name, 0) if waiter.process_name else 0
+        return limit is None or not running or running + waiter.count <= limit
+
+    def _admit(self, pool: _FolderPool) -> None:
+        """Admit every waiter that fits, best priority first (lock held)."""
+
+        now = time.monotonic()
+        remaining = []
+        for waiter in sorted(pool.waiters):
+            if waiter.future.done():
+                continue
+            if not self._fits(pool, waiter):
+                remaining.append(waiter)
+                continue
+
+            waiter.admitted = True
+            pool.in_flight += waiter.count
+            if waiter.process_name:
+                pool.process_in_flight[waiter.process_name] = \
+                    pool.process_in_flight.get(waiter.process_name, 0) + waiter.count
+            wait = now - waiter.enqueued_at
+            pool.admitted += waiter.count
+            pool.total_wait += wait
+            pool.max_wait = max(pool.max_wait, wait)
+
+            # Waiters may live on another loop (e.g. the sync bridge loop)
+            loop = waiter.future.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._resolve, waiter.future)
+        heapq.heapify(remaining)
+        pool.waiters = remaining
+
+    @staticmethod
+    def _resolve(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return capacity, in-flight jobs, local queue depth and wait times per folder."""
+
+        with self._lock:
+            return {
+                folder_id: {
+                    'capacity': pool.capacity,
+                    'in_flight': pool.in_flight,
+                    'process_in_flight': dict(pool.process_in_flight),
+                    'queue_depth': sum(w.count for w in pool.waiters),
+                    'admitted': pool.admitted,
+                    'queued': pool.queued,
+                    'avg_wait': pool.total_wait / pool.admitted if pool.admitted else 0.0,
+                    'max_wait': pool.max_wait,
+                }
+                for folder_id, pool in self._pools.items()
+            }
@@ -0,0 +1,164 @@
+"""Benchmark the UiPath client against the local fake Orchestrator.
+
+Runs ``--calls`` ``call_uipath_process`` calls, at most ``--concurrency`` at
+a time, and reports throughput, p50/p95/p99 call latency, the requests the
+server saw per endpoint and the client's own counters. Without ``--url`` a
+FakeOrchestrator is started in-process with the given job duration, latency
+and failure settings:
+
+    python -m uipath.benchmark --calls 200 --concurrency 50 --job-duration exponential:2 --latency 0.05
+    python -m uipath.benchmark --url http://127.0.0.1:8090 --calls 100
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+from aiohttp import web
+
+from uipath.fake_orchestrator import FakeOrchestrator
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (0 when empty)."""
+
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+async def _run_calls(process_name: str, calls: int, concurrency: int, verbose: bool) -> Dict[str, Any]:
+    # Imported here: the client reads its configuration from the environment on import
+    uipath_api = importlib.import_module('uipath.call_uipath_process')
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+
+    async def one_call(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            result = await uipath_api.call_uipath_process(process_name, {"in_BenchmarkCall": i})
+            latencies.append(time.perf_counter() - started)
+            if result.get('status') == 'error':
+                errors[result.get('message', '')] = errors.get(result.get('message', ''), 0) + 1
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    with output:
+        await asyncio.gather(*(one_call(i) for i in range(calls)))
+    elapsed = time.perf_counter() - started
+
+    client_stats = uipath_api.client.stats()
+    await uipath_api.client.close()
+    return {
+        'calls': calls,
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'throughput': calls / elapsed if elapsed else 0.0,
+        'latency': {
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': max(latencies, default=0.0),
+        },
+        'errors': errors,
+        'client': client_stats,
+    }
+
+
+async def _server_stats(url: str) -> Dict[str, Any]:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{url}/_stats") as response:
+            response.raise_for_status()
+            return await response.json()
+
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    url = args.url
+    runner = None
+    if url is None:
+        orchestrator = FakeOrchestrator(processes=[args.process], job_duration=args.job_duration,
+                                        pending_delay=args.pending_delay, failure_rate=args.failure_rate,
+                                        robots=args.robots, latency=args.latency, error_rate=args.error_rate)
+        runner = web.AppRunner(orchestrator.create_app())
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', args.port).start()
+        url = f"http://127.0.0.1:{args.port}"
+
+    os.environ.update({
+        'UIPATH_CLOUD_URL': url,
+        'UIPATH_CLOUD_ORG_NAME': os.environ.get('UIPATH_CLOUD_ORG_NAME', 'org'),
+        'UIPATH_OAUTH_TENANT': os.environ.get('UIPATH_OAUTH_TENANT', 'tenant'),
+        'UIPATH_FOLDER_ID': os.environ.get('UIPATH_FOLDER_ID', '1'),
+    })
+    if args.robots:
+        # Learn the fake's robot capacity from its sessions
+        os.environ.setdefault('UIPATH_ADMISSION_CONTROL', 'true')
+
+    try:
+        report = await _run_calls(args.process, args.calls, args.concurrency or args.calls, args.verbose)
+        report['server'] = await _server_stats(url)
+    finally:
+        if runner is not None:
+            await runner.cleanup()
+    return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    latency = report['latency']
+    print(f"{report['calls']} calls, concurrency {report['concurrency']}: "
+          f"{report['elapsed']:.2f}s, {report['throughput']:.2f} calls/s")
+    print(f"latency p50 {latency['p50']:.3f}s  p95 {latency['p95']:.3f}s  "
+          f"p99 {latency['p99']:.3f}s  max {latency['max']:.3f}s")
+    for message, count in report['errors'].items():
+        print(f"errors: {count} x {message}")
+
+    print("requests per endpoint:")
+    requests = report['server']['requests']
+    for endpoint, count in sorted(requests.items(), key=lambda item: -item[1]):
+        print(f"  {count:6d}  {endpoint}")
+    print(f"  {sum(requests.values()):6d}  total ({sum(requests.values()) / report['calls']:.2f} per call)")
+    print(f"jobs: {report['server']['jobs']}")
+
+    client = report['client']
+    print(f"job poller: {client['job_poller']}")
+    print(f"http: circuit {client['http']['circuit']}, retry budget {client['http']['retry_budget']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark call_uipath_process against a fake Orchestrator.")
+    parser.add_argument('--calls', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=0, help="Calls in flight at once; 0 runs all at once")
+    parser.add_argument('--process', default='Create.Authority.to.Trade.Form')
+    parser.add_argument('--url', default=None, help="Use a running fake Orchestrator instead of starting one")
+    parser.add_argument('--port', type=int, default=8091)
+    parser.add_argument('--job-duration', default='2')
+    parser.add_argument('--pending-delay', default='0.5')
+    parser.add_argument('--latency', default=None)
+    parser.add_argument('--failure-rate', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--robots', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    parser.add_argument('--verbose', action='store_true', help="Keep the client's log output")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+"""Local stand-in for UiPath Orchestrator, for exercising the client offline.
+
+Implements just enough of the API for call_uipath_process: the token
+endpoint, Releases, StartJobs, StopJobs, Jobs, queue items, robot Sessions
+and Webhooks. Jobs go Pending -> Running -> Successful/Faulted on a timer
+(waiting for a free robot when ``robots`` is set) and fire
+job.completed / job.faulted webhooks to every subscribed URL; queue items go
+New -> InProgress -> Successful/Failed the same way.
+
+Job durations and response latency are drawn from distributions given as
+``fixed:2`` (or just ``2``), ``uniform:1,3``, ``exponential:2`` (mean) or
+``lognormal:2,0.5`` (median, sigma); ``error_rate`` answers that share of API
+requests with a 503. ``GET /_stats`` returns the request count per endpoint.
+
+Run it and point the client at it:
+
+    python -m uipath.fake_orchestrator --port 8090 --job-duration exponential:3 --latency uniform:0.02,0.1
+    UIPATH_CLOUD_URL=http://localhost:8090 UIPATH_CLOUD_ORG_NAME=org \\
+    UIPATH_OAUTH_TENANT=tenant UIPATH_FOLDER_ID=1 ...
+
+``python -m uipath.benchmark`` drives concurrent calls against it.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import aiohttp
+from aiohttp import web
+
+from uipath.webhooks import sign_webhook_body
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def parse_distribution(spec: Union[str, float, None]) -> Callable[[], float]:
+    """Turn a distribution spec such as ``"exponential:2"`` into a sampler of non-negative seconds."""
+
+    if spec is None:
+        return lambda: 0.0
+    if isinstance(spec, (int, float)):
+        return lambda: float(spec)
+
+    kind, _, params = str(spec).partition(':')
+    if not params:
+        kind, params = 'fixed', kind
+    values = [float(v) for v in params.split(',')]
+    if kind == 'fixed':
+        return lambda: values[0]
+    if kind == 'uniform':
+        return lambda: random.uniform(values[0], values[1])
+    if kind == 'exponential':
+        return lambda: random.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    if kind == 'lognormal':
+        return lambda: random.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unknown distribution: {spec}")
+
+
+class FakeOrchestrator:
+    """In-memory Orchestrator tenant serving the endpoints used by the UiPath client."""
+
+    def __init__(self, processes: Optional[List[str]] = None, job_duration: Union[str, float] = 2,
+                 pending_delay: Union[str, float] = 0.5, failure_rate: float = 0, robots: int = 0,
+                 latency: Union[str, float, None] = None, error_rate: float = 0):
+        self.job_duration = parse_distribution(job_duration)
+        self.pending_delay = parse_distribution(pending_delay)
+        self.latency = parse_distribution(latency)
+        self.failure_rate = failure_rate
+        self.error_rate = error_rate
+        self.robots = robots
+        self.busy_robots = 0
+        self._robot_slots: Optional[asyncio.Semaphore] = None
+
+        self.releases = [
+            {'Id': i + 1, 'Key': str(uuid.uuid4()), 'ProcessKey': name, 'Name': name}
+            for i, name in enumerate(processes or ['Create.Authority.to.Trade.Form'])
+        ]
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        self._job_tasks: Dict[int, asyncio.Task] = {}
+        self.queue_items: Dict[int, Dict[str, Any]] = {}
+        self._next_queue_item_id = 5000
+        self.webhooks: List[Dict[str, Any]] = []
+        self._next_job_id = 1000
+        self._tasks: set = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.request_counts: Dict[str, int] = {}
+
+    def create_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._count_requests])
+        base = '/{org}/{tenant}/odata'
+        app.router.add_get('/_stats', self.stats)
+        app.router.add_post('/identity_/connect/token', self.token)
+        app.router.add_get(base + '/Releases', self.list_releases)
+        app.router.add_post(base + '/Jobs/UiPath.Server.Configuration.OData.StartJobs', self.start_jobs)
+        app.router.add_post(base + '/Jobs/UiPath.Server.Configuration.OData.StopJobs', self.stop_jobs)
+        app.router.add_get(base + r'/Jobs({job_id:\d+})', self.get_job)
+        app.router.add_get(base + '/Jobs', self.list_jobs)
+        app.router.add_get(base + '/Sessions', self.list_sessions)
+        app.router.add_post(base + '/Queues/UiPathODataSvc.BulkAddQueueItems', self.bulk_add_queue_items)
+        app.router.add_get(base + '/QueueItems', self.list_queue_items)
+        app.router.add_delete(base + r'/QueueItems({item_id:\d+})', self.delete_queue_item)
+        app.router.add_get(base + '/Webhooks', self.list_webhooks)
+        app.router.add_post(base + '/Webhooks', self.create_webhook)
+        app.on_cleanup.append(self._cleanup)
+        return app
+
+    @web.middleware
+    async def _count_requests(self, request: web.Request, handler):
+        if request.path == '/_stats':
+            return await handler(request)
+        resource = request.match_info.route.resource
+        endpoint = f"{request.method} {resource.canonical if resource else request.path}"
+        self.request_counts[endpoint] = self.request_counts.get(endpoint, 0) + 1
+
+        latency = self.latency()
+        if latency > 0:
+            await asyncio.sleep(latency)
+        if random.random() < self.error_rate:
+            return web.json_response({'message': 'Simulated outage'}, status=503)
+        return await handler(request)
+
+    async def stats(self, request: web.Request) -> web.Response:
+        states: Dict[str, int] = {}
+        for job in self.jobs.values():
+            states[job['State']] = states.get(job['State'], 0) + 1
+        return web.json_response({'requests': self.request_counts, 'jobs': states})
+
+    async def _cleanup(self, app: web.Application) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._session is not None:
+            await self._session.close()
+
+    # === Identity ===
+    async def token(self, request: web.Request) -> web.Response:
+        return web.json_response({'access_token': uuid.uuid4().hex, 'expires_in': 3600,
+                                  'token_type': 'Bearer'})
+
+    # === Releases ===
+    async def list_releases(self, request: web.Request) -> web.Response:
+        releases = self.releases
+        match = re.search(r"ProcessKey eq '([^']*)'", request.query.get('$filter', ''))
+        if match:
+            releases = [r for r in releases if r['ProcessKey'] == match.group(1)]
+        skip = int(request.query.get('$skip', 0))
+        top = int(request.query.get('$top', len(releases) or 1))
+        return web.json_response({'value': releases[skip:skip + top]})
+
+    # === Jobs ===
+    async def start_jobs(self, request: web.Request) -> web.Response:
+        start_info = (await request.json())['startInfo']
+        release = next((r for r in self.releases if r['Key'] == start_info['ReleaseKey']), None)
+        if release is None:
+            return web.json_response({'message': 'Release not found'}, status=404)
+
+        created = []
+        for _ in range(int(start_info.get('JobsCount', 1))):
+            job = self._create_job(release, start_info.get('InputArguments'))
+            created.append(dict(job))
+        return web.json_response({'value': created})
+
+    def _create_job(self, release: Dict[str, Any], input_arguments: Optional[str]) -> Dict[str, Any]:
+        self._next_job_id += 1
+        job = {
+            'Id': self._next_job_id,
+            'Key': str(uuid.uuid4()),
+            'State': 'Pending',
+            'ReleaseName': release['Name'],
+            'InputArguments': input_arguments,
+            'OutputArguments': None,
+            'Info': None,
+            'CreationTime': _now(),
+            'StartTime': None,
+            'EndTime': None,
+        }
+        self.jobs[job['Id']] = job
+        task = asyncio.get_running_loop().create_task(self._run_job(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._job_tasks[job['Id']] = task
+        return job
+
+    async def stop_jobs(self, request: web.Request) -> web.Response:
+        for job_id in (await request.json()).get('jobIds', []):
+            job = self.jobs.get(int(job_id))
+            if job is None or job['State'] not in ('Pending', 'Running'):
+                continue
+            self._job_tasks.pop(job['Id']).cancel()
+            job['State'] = 'Stopped'
+            job['EndTime'] = _now()
+        return web.Response(status=200)
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        await asyncio.sleep(self.pending_delay())
+        if not self.robots:
+            await self._execute_job(job)
+            return
+
+        if self._robot_slots is None:
+            self._robot_slots = asyncio.Semaphore(self.robots)
+        async with self._robot_slots:
+            self.busy_robots += 1
+            try:
+                await self._execute_job(job)
+            finally:
+                self.busy_robots -= 1
+
+    async def _execute_job(self, job: Dict[str, Any]) -> None:
+        job['State'] = 'Running'
+        job['StartTime'] = _now()
+
+        await asyncio.sleep(self.job_duration())
+        job['EndTime'] = _now()
+        if random.random() < self.failure_rate:
+            job['State'] = 'Faulted'
+            job['Info'] = 'Simulated robot failure'
+            event_type = 'job.faulted'
+        else:
+            job['State'] = 'Successful'
+            input_args = json.loads(job['InputArguments'] or 'null')
+            job['OutputArguments'] = json.dumps({'out_Status': 'Completed', 'out_Input': input_args})
+            event_type = 'job.completed'
+        self._job_tasks.pop(job['Id'], None)
+        await self._fire_webhooks(event_type, job)
+
+    async def get_job(self, request: web.Request) -> web.Response:
+        job = self.jobs.get(int(request.match_info['job_id']))
+        if job is None:
+            return web.json_response({'message': 'Job not found'}, status=404)
+        return web.json_response(job)
+
+    async def list_jobs(self, request: web.Request) -> web.Response:
+        match = re.search(r'Id in \(([\d,\s]*)\)', request.query.get('$filter', ''))
+        if match:
+            ids = [int(i) for i in match.group(1).split(',') if i.strip()]
+            jobs = [self.jobs[i] for i in ids if i in self.jobs]
+        else:
+            jobs = list(self.jobs.values())
+        return web.json_response({'value': jobs})
+
+    # === Robots ===
+    async def list_sessions(self, request: web.Request) -> web.Response:
+        sessions = [
+            {'Id': i + 1, 'Robot': {'Name': f'robot-{i + 1}'}, 'Runtimes': 1, 'IsUnresponsive': False,
+             'State': 'Busy' if i < self.busy_robots else 'Available'}
+            for i in range(self.robots)
+        ]
+        return web.json_response({'value': sessions})
+
+    # === Queues ===
+    async def bulk_add_queue_items(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        for queue_item in body.get('queueItems', []):
+            self._next_queue_item_id += 1
+            item = {
+                'Id': self._next_queue_item_id,
+                'QueueDefinitionName': body.get('queueName'),
+                'Reference': queue_item.get('Reference'),
+                'Priority': queue_item.get('Priority', 'Normal'),
+                'Status': 'New',
+                'SpecificContent': queue_item.get('SpecificContent'),
+                'Output': None,
+                'ProcessingException': None,
+                'CreationTime': _now(),
+                'StartProcessing': None,
+                'EndProcessing': None,
+            }
+            self.queue_items[item['Id']] = item
+            task = asyncio.get_running_loop().create_task(self._process_queue_item(item))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        # BulkAddQueueItems lists only the items it could not add
+        return web.json_response({'value': []})
+
+    async def _process_queue_item(self, item: Dict[str, Any]) -> None:
+        await asyncio.sleep(self.pending_delay())
+        if item['Status'] != 'New':
+            return
+        item['Status'] = 'InProgress'
+        item['StartProcessing'] = _now()
+
+        await asyncio.sleep(self.job_duration())
+        item['EndProcessing'] = _now()
+        if random.random() < self.failure_rate:
+            item['Status'] = 'Failed'
+            item['ProcessingException'] = {'Reason': 'Simulated robot failure', 'Type': 'ApplicationException'}
+        else:
+            item['Status'] = 'Successful'
+            item['Output'] = {'out_Status': 'Completed', 'out_Input': item['SpecificContent']}
+
+    async def list_queue_items(self, request: web.Request) -> web.Response:
+        match = re.search(r"Reference in \(([^)]*)\)", request.query.get('$filter', ''))
+        if match:
+            references = set(re.findall(r"'([^']*)'", match.group(1)))
+            items = [i for i in self.queue_items.values() if i['Reference'] in references]
+        else:
+            items = list(self.queue_items.values())
+        return web.json_response({'value': items})
+
+    async def delete_queue_item(self, request: web.Request) -> web.Response:
+        item = self.queue_items.get(int(request.match_info['item_id']))
+        if item is None:
+            return web.json_response({'message': 'Queue item not found'}, status=404)
+        if item['Status'] != 'New':
+            return web.json_response({'message': 'Only new items can be deleted'}, status=400)
+        item['Status'] = 'Deleted'
+        return web.Response(status=204)
+
+    # === Webhooks ===
+    async def list_webhooks(self, request: web.Request) -> web.Response:
+        match = re.search(r"Url eq '([^']*)'", request.query.get('$filter', ''))
+        webhooks = [w for w in self.webhooks if not match or w['Url'] == match.group(1)]
+        return web.json_response({'value': webhooks})
+
+    async def create_webhook(self, request: web.Request) -> web.Response:
+        webhook = await request.json()
+        webhook['Id'] = len(self.webhooks) + 1
+        self.webhooks.append(webhook)
+        return web.json_response(webhook, status=201)
+
+    async def _fire_webhooks(self, event_type: str, job: Dict[str, Any]) -> None:
+        subscribers = [w for w in self.webhooks if w.get('Enabled')
+                       and (w.get('SubscribeToAllEvents')
+                            or event_type in [e.get('EventType') for e in w.get('Events', [])])]
+        if not subscribers:
+            return
+
+        job_payload = dict(job)
+        job_payload['OutputArguments'] = json.loads(job['OutputArguments']) if job['OutputArguments'] else None
+        body = json.dumps({'Type': event_type, 'EventId': uuid.uuid4().hex, 'Timestamp': _now(),
+                           'Job': job_payload}).encode('utf-8')
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        for webhook in subscribers:
+            headers = {'Content-Type': 'application/json'}
+            if webhook.get('Secret'):
+                headers['X-UiPath-Signature'] = sign_webhook_body(webhook['Secret'], body)
+            try:
+                async with self._session.post(webhook['Url'], data=body, headers=headers) as response:
+                    print(f"Webhook {event_type} for job {job['Id']} -> {webhook['Url']}: {response.status}")
+            except aiohttp.ClientError as e:
+                print(f"Webhook delivery to {webhook['Url']} failed: {e}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in UiPath Orchestrator.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    parser.add_argument('--process', action='append', dest='processes',
+                        help="Process name to publish a release for (repeatable)")
+    parser.add_argument('--job-duration', default='2',
+                        help="Seconds a job runs, e.g. 2, uniform:1,3, exponential:2 or lognormal:2,0.5")
+    parser.add_argument('--pending-delay', default='0.5', help="Seconds a job stays Pending (distribution)")
+    parser.add_argument('--latency', default=None, help="Added response latency per request (distribution)")
+    parser.add_argument('--failure-rate', type=float, default=0, help="Share of jobs that fault")
+    parser.add_argument('--error-rate', type=float, default=0, help="Share of requests answered with a 503")
+    parser.add_argument('--robots', type=int, default=0,
+                        help="Robots running jobs; 0 runs every job at once")
+    args = parser.parse_args()
+
+    orchestrator = FakeOrchestrator(processes=args.processes, job_duration=args.job_duration,
+                                    pending_delay=args.pending_delay, failure_rate=args.failure_rate,
+                                    robots=args.robots, latency=args.latency, error_rate=args.error_rate)
+    web.run_app(orchestrator.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Optional
+
+import aiohttp
+
+from uipath.resilience import CircuitBreaker, RetryBudget, backoff_delay
+
+if TYPE_CHECKING:
+    from uipath.token_manager import TokenManager
+
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class OrchestratorHttpClient:
+    """Long-lived owner of the pooled ``aiohttp`` session used for all Orchestrator calls.
+
+    The session is created lazily on first use. ``aiohttp`` sessions are bound to
+    the event loop that created them, so one session is kept per running loop;
+    in a LangGraph server that is a single session for the whole process.
+
+    Requests made through ``request`` share a circuit breaker, so callers fail
+    fast while Orchestrator is down, and idempotent ones are retried with
+    jittered backoff as long as the shared retry budget allows. With a
+    ``token_manager``, a request whose bearer token is refused with a 401 is
+    sent once more with a freshly fetched token.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 20,
+                 keepalive_timeout: float = 30, dns_cache_ttl: int = 300,
+                 timeout: float = 60, breaker: Optional[CircuitBreaker] = None,
+                 retry_budget: Optional[RetryBudget] = None, max_retries: int = 3,
+                 retry_base: float = 0.5, retry_cap: float = 8,
+                 token_manager: Optional['TokenManager'] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_cap = retry_cap
+        self.token_manager = token_manager
+
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+        self._lock = threading.Lock()
+        self.sessions_created = 0
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        self.sessions_created += 1
+        return aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=self.timeout))
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session for the running loop, creating it on first use."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Forget sessions whose loop is gone; their sockets went with it
+            for stale_loop in [other for other in self._sessions if other.is_closed()]:
+                del self._sessions[stale_loop]
+
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                session = self._create_session()
+                self._sessions[loop] = session
+            return session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, retry: Optional[bool] = None,
+                      **kwargs: Any) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request on the pooled session and yield the response.
+
+        Raises ``CircuitOpenError`` without sending anything while the breaker
+        is open. Connection errors, timeouts, 429 and 5xx answers are retried
+        for idempotent methods (or when ``retry`` is True); the last response
+        or error is handed to the caller once retries or budget run out.
+        """
+
+        retry = method.upper() in IDEMPOTENT_METHODS if retry is None else retry
+        session = await self.get_session()
+        self.retry_budget.record_request()
+
+        attempt = 0
+        reauthenticated = False
+        while True:
+            self.breaker.before_call()
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.breaker.record_failure()
+                if not self._may_retry(retry, attempt):
+                    raise
+                await asyncio.sleep(backoff_delay(attempt, self.retry_base, self.retry_cap))
+                attempt += 1
+                continue
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+
+            if response.status >= 500:
+                self.breaker.record_failure()
+            else:
+                # Throttling (429) and client errors still show Orchestrator is up
+                self.breaker.record_success()
+
+            rejected_token = self._bearer_token(kwargs)
+            if response.status == 401 and rejected_token and self.token_manager is not None \
+                    and not reauthenticated:
+                # Revoked or rotated token: fetch a new one and send the request again, once
+                response.release()
+                fresh_token = await self.token_manager.renew(rejected_token)
+                kwargs['headers'] = {**kwargs['headers'], 'Authorization': f'Bearer {fresh_token}'}
+                reauthenticated = True
+                continue
+
+            if response.status in RETRYABLE_STATUSES and self._may_retry(retry, attempt):
+                delay = self._retry_after(response) or backoff_delay(attempt, self.retry_base, self.retry_cap)
+                response.release()
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+
+    @staticmethod
+    def _bearer_token(kwargs: Dict[str, Any]) -> Optional[str]:
+        authorization = (kwargs.get('headers') or {}).get('Authorization', '')
+        return authorization[len('Bearer '):] if authorization.startswith('Bearer ') else None
+
+    def _may_retry(self, retry: bool, attempt: int) -> bool:
+        return retry and attempt < self.max_retries and self.retry_budget.try_spend()
+
+    def _retry_after(self, response: aiohttp.ClientResponse) -> Optional[float]:
+        try:
+            return min(self.retry_cap, float(response.headers.get('Retry-After', '')))
+        except ValueError:
+            return None
+
+    async def close(self) -> None:
+        """Close every pooled session; safe to call more than once."""
+
+        current_loop = asyncio.get_running_loop()
+        with self._lock:
+            sessions = list(self._sessions.items())
+            self._sessions.clear()
+
+        for loop, session in sessions:
+            if session.closed:
+                continue
+            if loop is current_loop:
+                await session.close()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(session.close(), loop))
+
+    async def close_current_loop(self) -> None:
+        """Close only the session bound to the running loop, before that loop shuts down."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return connection pool usage for each live session."""
+
+        with self._lock:
+            pools = []
+            for session in self._sessions.values():
+                connector: Optional[aiohttp.BaseConnector] = session.connector
+                if connector is None or session.closed:
+                    continue
+                pools.append({
+                    'limit': connector.limit,
+                    'limit_per_host': connector.limit_per_host,
+                    'acquired': len(getattr(connector, '_acquired', ())),
+                })
+            return {
+                'sessions_created': self.sessions_created,
+                'pools': pools,
+                'circuit': self.breaker.stats(),
+                'retry_budget': self.retry_budget.stats(),
+            }
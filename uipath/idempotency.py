@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+def make_idempotency_key(process_name: str, input_args: Optional[Dict[str, Any]], scope: str = "") -> str:
+    """Hash a process call (name, input arguments and a caller scope such as a request id) into a key."""
+
+    payload = json.dumps({'process': process_name, 'args': input_args, 'scope': scope},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class IdempotencyStore:
+    """SQLite record of process calls, so repeated calls reuse the first job instead of starting another.
+
+    A key maps to the job started for it and, once that job succeeded, the
+    response returned to the caller. Entries expire ``ttl`` seconds after the
+    job was started. ``path`` defaults to an in-memory database; give a file
+    to keep the keys across restarts. The database is opened on first use,
+    so building a client does not create the file.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 3600):
+        self.path = path or ':memory:'
+        self.ttl = ttl
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.reattached = 0
+        self.misses = 0
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """The open database, created with expired keys dropped on first use; call with ``_lock`` held."""
+
+        if self._conn is None:
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS job_keys ("
+                    " key TEXT PRIMARY KEY, process_name TEXT, job_id INTEGER,"
+                    " response TEXT, started_at REAL)")
+                conn.execute("DELETE FROM job_keys WHERE started_at < ?", (time.time() - self.ttl,))
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return ``{'job_id', 'response'}`` for a live key (``response`` is None while the job runs)."""
+
+        with self._lock:
+            row = self._db.execute("SELECT job_id, response, started_at FROM job_keys WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is None or time.time() - row[2] > self.ttl:
+                self.misses += 1
+                return None
+            if row[1] is None:
+                self.reattached += 1
+            else:
+                self.hits += 1
+            return {'job_id': row[0], 'response': json.loads(row[1]) if row[1] is not None else None}
+
+    def record_start(self, key: str, process_name: str, job_id: int) -> None:
+        with self._lock, self._db as db:
+            db.execute("INSERT OR REPLACE INTO job_keys (key, process_name, job_id, response, started_at)"
+                               " VALUES (?, ?, ?, NULL, ?)", (key, process_name, job_id, time.time()))
+
+    def record_response(self, key: str, response: Dict[str, Any]) -> None:
+        """Remember the response of a successful call for the rest of the key's window."""
+
+        with self._lock, self._db as db:
+            db.execute("UPDATE job_keys SET response = ? WHERE key = ?",
+                               (json.dumps(response, default=str), key))
+
+    def discard(self, key: str) -> None:
+        """Forget a key, e.g. after its job failed, so the next call starts a new job."""
+
+        with self._lock, self._db as db:
+            db.execute("DELETE FROM job_keys WHERE key = ?", (key,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM job_keys").fetchone()[0]
+        return {'entries': entries, 'hits': self.hits, 'reattached': self.reattached, 'misses': self.misses}
@@ -0,0 +1,293 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from uipath.polling import FixedInterval, PollingStrategy
+
+TERMINAL_STATES = ['Successful', 'Faulted', 'Failed', 'Stopped', 'Suspended', 'Canceled']
+SUCCESS_STATES = ['Successful']
+FAILURE_STATES = ['Faulted', 'Failed', 'Stopped', 'Suspended', 'Canceled']
+RUNNING_STATES = ['Pending', 'Running', 'Resuming']
+
+# Queue items are tracked by the same poller; a Retried item is superseded by its retry
+QUEUE_ITEM_TERMINAL_STATES = ['Successful', 'Failed', 'Abandoned', 'Deleted']
+QUEUE_ITEM_SUCCESS_STATES = ['Successful']
+QUEUE_ITEM_RUNNING_STATES = ['New', 'InProgress', 'Retried']
+
+
+class JobPollTimeout(asyncio.TimeoutError):
+    """Raised by ``JobStatusPoller.wait`` when a job is still not terminal after the timeout."""
+
+    def __init__(self, job_id: int, last_seen: Optional[Dict[str, Any]]):
+        super().__init__(f"Timed out waiting for job {job_id}")
+        self.job_id = job_id
+        self.last_seen = last_seen
+
+
+@dataclass
+class _TrackedJob:
+    process_name: Optional[str]
+    started_at: float
+    next_due: float
+    attempt: int = 0
+    # Each waiter's future with the polling strategy it asked for
+    waiters: Dict[asyncio.Future, PollingStrategy] = field(default_factory=dict)
+    listeners: List[asyncio.Queue] = field(default_factory=list)
+    last_seen: Optional[Dict[str, Any]] = None
+
+    @property
+    def strategies(self) -> List[PollingStrategy]:
+        return list({id(strategy): strategy for strategy in self.waiters.values()}.values())
+
+    def delay(self, strategy: PollingStrategy, now: float) -> float:
+        return strategy.next_delay(self.attempt, now - self.started_at, self.process_name)
+
+    def schedule(self, now: float) -> None:
+        # The waiter asking for the shortest delay sets the pace for all of them
+        self.next_due = now + min(self.delay(strategy, now) for strategy in self.strategies)
+
+
+@dataclass
+class _LoopState:
+    jobs: Dict[int, _TrackedJob] = field(default_factory=dict)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    task: Optional[asyncio.Task] = None
+
+
+class JobStatusPoller:
+    """Shared poller that tracks every in-flight job with one batched OData query per tick.
+
+    Callers ``wait`` on a job id and get the job payload once it reaches a
+    terminal state. Jobs that become due close together are coalesced into a
+    single ``odata/Jobs?$filter=Id in (...)`` request (split into chunks of
+    ``batch_size`` ids to bound the URL length), so the request rate stays
+    constant no matter how many jobs are outstanding. When each job is checked
+    is decided by a ``PollingStrategy``, which also learns from finished jobs.
+
+    ``id_field``, ``state_field`` and ``terminal_states`` describe the
+    payloads, so the same poller can track queue items by their Reference.
+    Fetch errors are retried on the next tick, except ``fail_fast_errors``
+    (e.g. an open circuit breaker), which are raised to the jobs' waiters.
+    ``watch`` follows the same polls and yields every state change.
+    """
+
+    def __init__(self, fetch_jobs: Callable[[List[Any]], Awaitable[List[Dict[str, Any]]]],
+                 strategy: Optional[PollingStrategy] = None, batch_size: int = 50,
+                 coalesce_window: float = 1, id_field: str = 'Id', state_field: str = 'State',
+                 terminal_states: Optional[List[str]] = None, item_name: str = 'Job',
+                 fail_fast_errors: Tuple[Type[BaseException], ...] = ()):
+        self._fetch_jobs = fetch_jobs
+        self.strategy = strategy or FixedInterval()
+        self.batch_size = batch_size
+        self.coalesce_window = coalesce_window
+        self.id_field = id_field
+        self.state_field = state_field
+        self.terminal_states = terminal_states or TERMINAL_STATES
+        self.item_name = item_name
+        self.fail_fast_errors = fail_fast_errors
+
+        # Futures and tasks are bound to a loop, so tracking state is kept per running loop
+        self._loops: Dict[asyncio.AbstractEventLoop, _LoopState] = {}
+        self._lock = threading.Lock()
+
+        self.ticks = 0
+        self.requests = 0
+        self.errors = 0
+        self.jobs_resolved = 0
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale_loop in [other for other in self._loops if other.is_closed()]:
+                del self._loops[stale_loop]
+            state = self._loops.get(loop)
+            if state is None:
+                state = self._loops[loop] = _LoopState()
+            return state
+
+    def track(self, job_id: int, strategy: Optional[PollingStrategy] = None,
+              process_name: Optional[str] = None) -> asyncio.Future:
+        """Start tracking a job and return a future resolved with its terminal payload.
+
+        A job already tracked for other waiters is checked at the shortest
+        delay any of their strategies asks for.
+        """
+
+        state = self._state()
+        future = asyncio.get_running_loop().create_future()
+        strategy = strategy or self.strategy
+        now = time.monotonic()
+
+        job = state.jobs.get(job_id)
+        if job is None:
+            job = state.jobs[job_id] = _TrackedJob(process_name=process_name, started_at=now, next_due=now)
+            job.waiters[future] = strategy
+            job.schedule(now)
+        else:
+            job.waiters[future] = strategy
+            job.next_due = min(job.next_due, now + job.delay(strategy, now))
+
+        if state.task is None or state.task.done():
+            state.task = asyncio.get_running_loop().create_task(self._run(state))
+        state.wakeup.set()
+        return future
+
+    async def wait(self, job_id: int, timeout: Optional[float] = None,
+                   strategy: Optional[PollingStrategy] = None,
+                   process_name: Optional[str] = None) -> Dict[str, Any]:
+        """Wait for a job to reach a terminal state; raises ``JobPollTimeout`` after ``timeout``."""
+
+        state = self._state()
+        future = self.track(job_id, strategy, process_name)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            job = state.jobs.get(job_id)
+            raise JobPollTimeout(job_id, job.last_seen if job else None) from None
+        finally:
+            self._discard(state, job_id, future)
+
+    async def watch(self, job_id: int, timeout: Optional[float] = None,
+                    strategy: Optional[PollingStrategy] = None,
+                    process_name: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the job payload each time its state changes, ending with the terminal payload.
+
+        Raises ``JobPollTimeout`` after ``timeout`` like ``wait``.
+        """
+
+        state = self._state()
+        updates: asyncio.Queue = asyncio.Queue()
+        future = self.track(job_id, strategy, process_name)
+        job = state.jobs[job_id]
+        job.listeners.append(updates)
+        if job.last_seen is not None:
+            updates.put_nowait(dict(job.last_seen))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    update = await asyncio.wait_for(updates.get(), remaining)
+                except asyncio.TimeoutError:
+                    raise JobPollTimeout(job_id, job.last_seen) from None
+                if isinstance(update, BaseException):
+                    raise update
+                yield update
+                if update.get(self.state_field) in self.terminal_states:
+                    return
+        finally:
+            if updates in job.listeners:
+                job.listeners.remove(updates)
+            self._discard(state, job_id, future)
+
+    def _discard(self, state: _LoopState, job_id: int, future: asyncio.Future) -> None:
+        job = state.jobs.get(job_id)
+        if job is None:
+            return
+        job.waiters.pop(future, None)
+        if not future.done():
+            future.cancel()
+        if not job.waiters:
+            del state.jobs[job_id]
+
+    async def _run(self, state: _LoopState) -> None:
+        while state.jobs:
+            now = time.monotonic()
+            next_due = min(job.next_due for job in state.jobs.values())
+            if next_due > now:
+                state.wakeup.clear()
+                try:
+                    await asyncio.wait_for(state.wakeup.wait(), next_due - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Pull jobs that are almost due into this tick so they share the request
+            now = time.monotonic()
+            due_ids = [job_id for job_id, job in state.jobs.items()
+                       if job.next_due <= now + self.coalesce_window]
+            for job_id in due_ids:
+                job = state.jobs[job_id]
+                job.attempt += 1
+                job.schedule(now)
+
+            await self._tick(state, due_ids)
+
+    async def _tick(self, state: _LoopState, job_ids: List[int]) -> None:
+        self.ticks += 1
+        chunks = [job_ids[i:i + self.batch_size] for i in range(0, len(job_ids), self.batch_size)]
+        self.requests += len(chunks)
+        results = await asyncio.gather(*(self._fetch_jobs(chunk) for chunk in chunks),
+                                       return_exceptions=True)
+
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, self.fail_fast_errors):
+                self.errors += 1
+                for job_id in chunk:
+                    self._fail(state, job_id, result)
+                continue
+            if isinstance(result, BaseException):
+                # Keep polling on errors; waiters give up through their own timeout
+                self.errors += 1
+                print(f"Error checking job status: {result}")
+                continue
+
+            for job_data in result:
+                job_id = job_data.get(self.id_field)
+                job = state.jobs.get(job_id)
+                if job is None:
+                    continue
+                job_status = job_data.get(self.state_field, 'Unknown')
+                if job.last_seen is None or job.last_seen.get(self.state_field) != job_status:
+                    print(f"{self.item_name} {job_id} status: {job_status}")
+                    for listener in job.listeners:
+                        listener.put_nowait(dict(job_data))
+                job.last_seen = job_data
+                if job_status in self.terminal_states:
+                    self._resolve(state, job_id, job_data)
+
+    def _resolve(self, state: _LoopState, job_id: int, job_data: Dict[str, Any]) -> None:
+        job = state.jobs.pop(job_id)
+        self.jobs_resolved += 1
+        for strategy in job.strategies:
+            strategy.record_duration(job.process_name, time.monotonic() - job.started_at)
+        for future in job.waiters:
+            if not future.done():
+                # Each waiter gets its own copy since callers annotate the payload
+                future.set_result(dict(job_data))
+
+    def _fail(self, state: _LoopState, job_id: Any, error: BaseException) -> None:
+        job = state.jobs.pop(job_id, None)
+        if job is None:
+            return
+        for listener in job.listeners:
+            listener.put_nowait(error)
+        for future in job.waiters:
+            if not future.done():
+                future.set_exception(error)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of tracked jobs and request/tick counters."""
+
+        with self._lock:
+            tracked = sum(len(state.jobs) for state in self._loops.values())
+        return {
+            'tracked_jobs': tracked,
+            'ticks': self.ticks,
+            'requests': self.requests,
+            'errors': self.errors,
+            'jobs_resolved': self.jobs_resolved,
+        }
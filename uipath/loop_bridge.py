@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Dict, Optional
+
+
+class LoopBridge:
+    """Runs coroutines for synchronous callers on one long-lived background event loop.
+
+    ``asyncio.run`` builds and tears down a loop per call, which throws away
+    the pooled session and cannot be used from a thread that already runs a
+    loop. The bridge instead starts a daemon thread with its own loop on first
+    use and hands every coroutine to it, so sync callers share one loop, one
+    connection pool and the poller/receiver state bound to it.
+    """
+
+    def __init__(self, name: str = 'loop-bridge'):
+        self.name = name
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        self.calls = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self.is_running:
+                self._loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._serve, args=(self._loop, ready),
+                                                name=self.name, daemon=True)
+                self._thread.start()
+                ready.wait()
+            return self._loop
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """Run ``coro`` on the background loop and block until it returns.
+
+        Safe to call from any thread, including one running its own loop
+        (that loop is blocked meanwhile). Calling it from a coroutine already
+        on the bridge loop would deadlock and raises RuntimeError instead.
+        """
+
+        loop = self._ensure_started()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("LoopBridge.run called from its own loop; await the coroutine instead")
+
+        self.calls += 1
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = 5) -> None:
+        """Stop the background loop and wait for its thread; the next ``run`` starts a new one."""
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {'running': self.is_running, 'calls': self.calls}
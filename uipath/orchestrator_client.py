@@ -0,0 +1,1198 @@
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import aiohttp
+
+from uipath.admission import AdmissionController
+from uipath.http_client import OrchestratorHttpClient
+from uipath.idempotency import IdempotencyStore
+from uipath.job_poller import (
+    FAILURE_STATES,
+    QUEUE_ITEM_RUNNING_STATES,
+    QUEUE_ITEM_SUCCESS_STATES,
+    QUEUE_ITEM_TERMINAL_STATES,
+    RUNNING_STATES,
+    SUCCESS_STATES,
+    TERMINAL_STATES,
+    JobPollTimeout,
+    JobStatusPoller,
+)
+from uipath.polling import FixedInterval, create_polling_strategy
+from uipath.release_cache import ReleaseKeyCache, ReleaseNotFoundError
+from uipath.resilience import CircuitBreaker, CircuitOpenError, RetryBudget
+from uipath.token_manager import TokenManager
+from uipath.webhooks import JOB_WEBHOOK_EVENTS, WebhookReceiver
+
+# Handles kept per client, so tools can hand out an id and look the handle up later
+MAX_JOB_HANDLES = 1000
+
+
+def process_terminal_job(job_data: Dict) -> Dict:
+    """Annotate a terminal job payload with parsed outputs, error details and IsSuccess."""
+
+    job_status = job_data.get('State', 'Unknown')
+    print(f"Job reached terminal state: {job_status}")
+
+    # Handle successful completion
+    if job_status in SUCCESS_STATES:
+        print("Job completed successfully")
+
+        # Parse output arguments if they exist
+        output_args = job_data.get('OutputArguments')
+        if output_args:
+            try:
+                parsed_outputs = json.loads(output_args)
+                job_data['ParsedOutputArguments'] = parsed_outputs
+                print("Job outputs retrieved successfully")
+            except json.JSONDecodeError:
+                print("Warning: Could not parse output arguments as JSON")
+
+    # Handle failure states (including Faulted)
+    elif job_status in FAILURE_STATES:
+        print(f"Job failed with status: {job_status}")
+
+        # Extract error information
+        error_info = {
+            'status': job_status,
+            'error_message': job_data.get('Info', 'No error details available'),
+            'creation_time': job_data.get('CreationTime'),
+            'start_time': job_data.get('StartTime'),
+            'end_time': job_data.get('EndTime'),
+            'host_machine_name': job_data.get('HostMachineName'),
+            'robot_name': job_data.get('Robot', {}).get('Name') if job_data.get('Robot') else None
+        }
+
+        # Add error details to job_data for caller to handle
+        job_data['ErrorDetails'] = error_info
+
+        # Log specific error information based on status
+        if job_status == 'Faulted':
+            print(f"Job faulted. Error: {error_info['error_message']}")
+        elif job_status == 'Stopped':
+            print("Job was manually stopped")
+        elif job_status == 'Suspended':
+            print("Job was suspended")
+        elif job_status == 'Canceled':
+            print("Job was canceled")
+
+    # Return job data for both success and failure cases
+    job_data['IsSuccess'] = job_status in SUCCESS_STATES
+    return job_data
+
+
+def process_queue_item(item: Dict) -> Dict:
+    """Give a queue item the job payload shape: State, ParsedOutputArguments, ErrorDetails and flags."""
+
+    status = item.get('Status', 'Unknown')
+    item['State'] = status
+
+    output = item.get('Output')
+    if isinstance(output, str):
+        try:
+            output = json.loads(output)
+        except json.JSONDecodeError:
+            print("Warning: Could not parse queue item output as JSON")
+            output = None
+    if status in QUEUE_ITEM_SUCCESS_STATES:
+        item['ParsedOutputArguments'] = output or {}
+    elif status in QUEUE_ITEM_TERMINAL_STATES:
+        exception = item.get('ProcessingException') or {}
+        item['ErrorDetails'] = {
+            'status': status,
+            'error_message': exception.get('Reason') or 'No error details available',
+            'exception_type': exception.get('Type'),
+            'start_time': item.get('StartProcessing'),
+            'end_time': item.get('EndProcessing'),
+        }
+
+    item['IsTerminal'] = status in QUEUE_ITEM_TERMINAL_STATES
+    item['IsSuccess'] = status in QUEUE_ITEM_SUCCESS_STATES
+    item['IsRunning'] = status in QUEUE_ITEM_RUNNING_STATES
+    return item
+
+
+# === Job handles: submit now, collect the result later ===
+@dataclass
+class JobHandle:
+    """Lightweight reference to a started UiPath job.
+
+    Returned by ``OrchestratorClient.submit_job`` as soon as Orchestrator
+    accepted the job; the result is collected later with ``await handle.result()``.
+    """
+
+    job_id: int
+    release_key: str
+    process_name: str
+    client: 'OrchestratorClient' = field(repr=False)
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    _result: Optional[Dict] = field(default=None, repr=False)
+
+    async def result(self, timeout: int = 300) -> Optional[Dict]:
+        """Wait up to ``timeout`` seconds for the job to finish and return its payload.
+
+        Returns the same payload as ``OrchestratorClient.wait_for_job``
+        (flagged ``IsTimeout`` when the job is still running); terminal
+        results are cached on the handle.
+        """
+
+        if self._result is not None:
+            return self._result
+        job_data = await self.client.wait_for_job(self.job_id, timeout=timeout,
+                                                  process_name=self.process_name)
+        if job_data is not None and not job_data.get('IsTimeout'):
+            self._result = job_data
+        return job_data
+
+    async def status(self) -> Optional[Dict]:
+        """Return the job's current status without waiting."""
+
+        if self._result is not None:
+            return self._result
+        return await self.client.get_job_status(self.job_id)
+
+    async def cancel(self, strategy: str = "SoftStop") -> bool:
+        """Stop the job; returns False when Orchestrator refused the request."""
+        return await self.client.stop_job(self.job_id, strategy)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "release_key": self.release_key,
+            "process_name": self.process_name,
+            "started_at": self.started_at.isoformat(),
+        }
+
+
+@dataclass
+class QueueItemHandle:
+    """Reference to work added to an Orchestrator queue, the queue counterpart of JobHandle.
+
+    The item is identified by its Reference, which survives Orchestrator
+    retries; ``result`` waits for the latest attempt to reach a final status.
+    """
+
+    reference: str
+    queue_name: str
+    process_name: str
+    client: 'OrchestratorClient' = field(repr=False)
+    started_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    _result: Optional[Dict] = field(default=None, repr=False)
+
+    async def result(self, timeout: int = 300) -> Optional[Dict]:
+        """Wait up to ``timeout`` seconds for the item to be processed and return it in job payload shape."""
+
+        if self._result is not None:
+            return self._result
+        try:
+            item = await self.client.queue_item_poller.wait(self.reference, timeout=timeout,
+                                                            process_name=self.process_name)
+        except JobPollTimeout as e:
+            if e.last_seen is None:
+                return None
+            item = process_queue_item(dict(e.last_seen))
+            item['IsTimeout'] = True
+            return item
+
+        self._result = process_queue_item(item)
+        return self._result
+
+    async def status(self) -> Optional[Dict]:
+        """Return the item's current status without waiting."""
+
+        if self._result is not None:
+            return self._result
+        try:
+            items = await self.client.fetch_queue_items([self.reference])
+        except Exception as e:
+            print(f"Error checking queue item status: {e}")
+            return None
+        return process_queue_item(items[0]) if items else None
+
+    async def cancel(self, strategy: str = "SoftStop") -> bool:
+        """Delete the item if no robot picked it up yet; ``strategy`` is accepted for JobHandle parity."""
+
+        item = await self.status()
+        if item is None or item.get('Status') != 'New':
+            return False
+        return await self.client.delete_queue_item(item['Id'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "reference": self.reference,
+            "queue_name": self.queue_name,
+            "process_name": self.process_name,
+            "started_at": self.started_at.isoformat(),
+        }
+
+
+@dataclass
+class JobStatusEvent:
+    """One state transition of a job, as yielded by ``OrchestratorClient.watch_job``."""
+
+    job_id: int
+    state: str
+    previous_state: Optional[str]
+    elapsed: float
+    is_terminal: bool
+    is_timeout: bool = False
+    job: Optional[Dict[str, Any]] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "previous_state": self.previous_state,
+            "elapsed": round(self.elapsed, 1),
+            "is_terminal": self.is_terminal,
+            "is_timeout": self.is_timeout,
+        }
+
+
+@dataclass
+class BulkSubmission:
+    """Outcome of one item of a bulk submission: a handle, or the error that prevented the start."""
+
+    index: int
+    input_args: Optional[Dict[str, Any]]
+    handle: Optional[Any] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.handle is not None:
+            return {"index": self.index, "status": "Submitted", **self.handle.to_dict()}
+        return {"index": self.index, "status": "error", "message": self.error}
+
+
+class OrchestratorClient:
+    """Async UiPath Orchestrator client shared by every caller in the process.
+
+    One instance owns the pooled transport (with circuit breaker and retry
+    budget), the token and release key caches, the batched job and queue item
+    pollers, admission control and the webhook receiver, all configured from
+    ``get_uipath_config()``. Sync code reaches it through the background loop
+    in ``uipath.call_uipath_process`` rather than a second implementation.
+    """
+
+    def __init__(self, cfg: Dict[str, Any]):
+        self.cfg = cfg
+        self.client_id = cfg["client_id"]
+        self.client_secret = cfg["client_secret"]
+        self.tenant_logical_name = cfg["tenant_logical_name"]
+        self.folder_id = cfg["folder_id"]
+        self.base_url = cfg["base_url"]
+        self.auth_url = f'{self.base_url}/identity_/connect/token'
+        self.orchestrator_base = f'{self.base_url}/{cfg["account_logical_name"]}/{self.tenant_logical_name}/'
+
+        # Also renews the token when Orchestrator refuses it (401)
+        self.token_manager = TokenManager(self.fetch_access_token,
+                                          expiry_margin=cfg["token_expiry_margin"],
+                                          refresh_ahead=cfg["token_refresh_ahead"])
+
+        # One pooled session per loop shared by every Orchestrator call (see close)
+        self.http = OrchestratorHttpClient(limit=cfg["http_pool_limit"],
+                                           limit_per_host=cfg["http_pool_limit_per_host"],
+                                           keepalive_timeout=cfg["http_keepalive_timeout"],
+                                           dns_cache_ttl=cfg["http_dns_cache_ttl"],
+                                           timeout=cfg["http_timeout"],
+                                           breaker=CircuitBreaker(cfg["circuit_failure_threshold"],
+                                                                  cfg["circuit_recovery_timeout"]),
+                                           retry_budget=RetryBudget(cfg["retry_budget_ratio"],
+                                                                    cfg["retry_budget_min_per_second"]),
+                                           max_retries=cfg["http_max_retries"],
+                                           retry_base=cfg["http_retry_base"],
+                                           retry_cap=cfg["http_retry_cap"],
+                                           token_manager=self.token_manager)
+
+        self.release_cache = ReleaseKeyCache(ttl=cfg["release_cache_ttl"],
+                                             persist_path=cfg["release_cache_path"])
+
+        # Decides when each job is checked: fast at first, backing off for long-running jobs
+        self.polling_strategy = create_polling_strategy(cfg["job_poll_strategy"],
+                                                        initial=cfg["job_poll_initial"],
+                                                        factor=cfg["job_poll_factor"],
+                                                        cap=cfg["job_poll_cap"],
+                                                        jitter=cfg["job_poll_jitter"],
+                                                        interval=cfg["job_poll_interval"])
+
+        # One poller multiplexes the status checks of every in-flight job
+        self.job_poller = JobStatusPoller(self.fetch_jobs,
+                                          strategy=self.polling_strategy,
+                                          batch_size=cfg["job_poll_batch_size"],
+                                          fail_fast_errors=(CircuitOpenError,))
+
+        # Queue items share the polling strategy but are tracked by Reference and queue item Status
+        self.queue_item_poller = JobStatusPoller(self.fetch_queue_items,
+                                                 strategy=self.polling_strategy,
+                                                 batch_size=cfg["job_poll_batch_size"],
+                                                 id_field='Reference',
+                                                 state_field='Status',
+                                                 terminal_states=QUEUE_ITEM_TERMINAL_STATES,
+                                                 item_name='Queue item',
+                                                 fail_fast_errors=(CircuitOpenError,))
+
+        self.admission = AdmissionController(
+            fetch_capacity=None if cfg["robot_capacity"] else self.fetch_robot_capacity,
+            capacity=cfg["robot_capacity"] or None,
+            process_limits=cfg["process_concurrency"],
+            refresh_interval=cfg["robot_capacity_refresh"],
+        ) if cfg["admission_control"] else None
+
+        # Receives job.completed/job.faulted webhooks when completion_mode is "webhook"
+        self.webhook_receiver = WebhookReceiver(host=cfg["webhook_host"], port=cfg["webhook_port"],
+                                                secret=cfg["webhook_secret"])
+
+        # Repeated identical calls (same idempotency key) reuse the job of the first one
+        self.idempotency = IdempotencyStore(cfg["idempotency_path"], cfg["idempotency_ttl"]) \
+            if cfg["idempotency_ttl"] > 0 else None
+        self._idempotent_calls: Dict[str, asyncio.Task] = {}
+        # Release lookups in flight, so concurrent cache misses for one process share a single GET
+        self._release_lookups: Dict[Any, asyncio.Task] = {}
+
+        self._webhook_start_task: Optional[asyncio.Task] = None
+        # Slot release tasks, referenced so they are not garbage collected while waiting
+        self._slot_release_tasks: set = set()
+        self._job_handles: Dict[Any, Any] = {}
+
+    def _headers(self, access_token: str, folder: Optional[str] = None) -> Dict[str, str]:
+        return {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json',
+            'X-UIPATH-OrganizationUnitId': str(folder or self.folder_id),
+            'X-UIPATH-TenantName': self.tenant_logical_name
+        }
+
+    # === Authentication ===
+    async def fetch_access_token(self) -> Dict[str, Any]:
+        """Request a new client-credentials token from the identity server."""
+
+        headers = {
+            'Content-Type': 'application/x-www-form-urlencoded'
+        }
+        data = {
+            'grant_type': 'client_credentials',
+            'client_id': self.client_id,
+            'client_secret': self.client_secret,
+            'scope': 'OR.Folders OR.Robots OR.Machines OR.Execution OR.Assets OR.Jobs OR.Queues'
+        }
+
+        # Client-credentials token requests are safe to repeat
+        async with self.http.request('POST', self.auth_url, headers=headers, data=data, retry=True) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def get_access_token(self) -> str:
+        """Return the cached access token, refreshing it only when it is about to expire."""
+        return await self.token_manager.get_token()
+
+    # === Folders and releases ===
+    async def get_folder_id(self) -> Optional[str]:
+        access_token = await self.get_access_token()
+        headers = {"Authorization": f"Bearer {access_token}"}
+
+        async with self.http.request('GET', f"{self.orchestrator_base}odata/Folders", headers=headers) as response:
+            response.raise_for_status()
+            results = (await response.json())["value"]
+            return results[0]["Id"] if results else None
+
+    async def get_release_key(self, process_key: str, use_cache: bool = True) -> str:
+        if use_cache:
+            cached_key = self.release_cache.get(self.folder_id, process_key)
+            if cached_key is not None:
+                return cached_key
+
+        lookup = (self.folder_id, process_key)
+        task = self._release_lookups.get(lookup)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._release_lookups[lookup] = asyncio.ensure_future(self._fetch_release_key(process_key))
+
+            def forget(done: asyncio.Task) -> None:
+                if self._release_lookups.get(lookup) is done:
+                    del self._release_lookups[lookup]
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    async def _fetch_release_key(self, process_key: str) -> str:
+        access_token = await self.get_access_token()
+        url = f"{self.orchestrator_base}odata/Releases?$filter=ProcessKey eq '{process_key}'"
+        async with self.http.request('GET', url, headers=self._headers(access_token)) as response:
+            response.raise_for_status()
+            results = (await response.json()).get('value', [])
+            if not results:
+                raise ReleaseNotFoundError(f"No process found with name: {process_key}")
+
+            self.release_cache.set(self.folder_id, process_key, results[0]['Key'])
+            return results[0]['Key']
+
+    async def preload_release_keys(self, page_size: int = 100) -> int:
+        """Fetch every release of the folder in one paged query and warm the release key cache."""
+
+        access_token = await self.get_access_token()
+        release_keys = {}
+        skip = 0
+        while True:
+            url = (f"{self.orchestrator_base}odata/Releases?$select=Key,ProcessKey&$orderby=Id"
+                   f"&$top={page_size}&$skip={skip}")
+            async with self.http.request('GET', url, headers=self._headers(access_token)) as response:
+                response.raise_for_status()
+                result = await response.json()
+            page = result.get('value', [])
+            for release in page:
+                # Keep the first release per process, matching get_release_key
+                release_keys.setdefault(release['ProcessKey'], release['Key'])
+            if len(page) < page_size:
+                break
+            skip += page_size
+
+        self.release_cache.set_many(self.folder_id, release_keys)
+        print(f"Preloaded {len(release_keys)} release keys")
+        return len(release_keys)
+
+    async def _with_release_key(self, process_name: str, start):
+        """Run ``start(release_key)``, refreshing a stale cached release key once."""
+
+        release_key = await self.get_release_key(process_name)
+        try:
+            return release_key, await start(release_key)
+        except ReleaseNotFoundError:
+            # Stale cache entry: look the release up again and retry once
+            self.release_cache.invalidate(self.folder_id, process_name)
+            release_key = await self.get_release_key(process_name, use_cache=False)
+            return release_key, await start(release_key)
+
+    # === Jobs ===
+    async def start_jobs(self, process_release_key: str, input_args: Optional[Dict[str, Any]] = None,
+                         jobs_count: int = 1, process_name: Optional[str] = None, priority: int = 0) -> Dict:
+        """Start ``jobs_count`` jobs of a release.
+
+        With admission control on (UIPATH_ADMISSION_CONTROL) the call first
+        waits for free robot capacity, higher ``priority`` first; each slot is
+        given back when its job finishes. ``process_name`` applies per-process limits.
+        """
+
+        if self.admission is not None:
+            await self.admission.acquire(self.folder_id, process_name, jobs_count, priority)
+
+        started = 0
+        try:
+            result = await self._post_start_jobs(process_release_key, input_args, jobs_count)
+            for job in result.get('value', []):
+                started += 1
+                if self.admission is not None:
+                    self._release_slot_on_completion(job['Id'], process_name)
+            return result
+        finally:
+            if self.admission is not None:
+                self.admission.release(self.folder_id, process_name, jobs_count - started)
+
+    async def _post_start_jobs(self, process_release_key: str, input_args: Optional[Dict[str, Any]],
+                               jobs_count: int) -> Dict:
+        url = f"{self.orchestrator_base}odata/Jobs/UiPath.Server.Configuration.OData.StartJobs"
+        payload = {
+            "startInfo": {
+                "ReleaseKey": process_release_key,
+                "Strategy": "ModernJobsCount",
+                "JobsCount": jobs_count,
+                "InputArguments": json.dumps(input_args),
+                "FolderId": int(self.folder_id)
+            }
+        }
+
+        try:
+            # Token fetched here so time spent waiting for admission cannot age it
+            headers = self._headers(await self.get_access_token())
+            async with self.http.request('POST', url, headers=headers, json=payload) as response:
+                if response.status == 404:
+                    # The cached release was deleted or redeployed under a new key
+                    raise ReleaseNotFoundError(f"Release not found: {process_release_key}")
+                response.raise_for_status()
+                return await response.json()
+        except (ReleaseNotFoundError, CircuitOpenError):
+            raise
+        except aiohttp.ClientError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+        return {}
+
+    async def fetch_jobs(self, job_ids: List[int]) -> List[Dict]:
+        """Fetch several jobs with a single OData query."""
+
+        access_token = await self.get_access_token()
+        id_list = ','.join(str(job_id) for job_id in job_ids)
+        url = f"{self.orchestrator_base}odata/Jobs?$filter=Id in ({id_list})"
+        async with self.http.request('GET', url, headers=self._headers(access_token)) as response:
+            response.raise_for_status()
+            return (await response.json()).get('value', [])
+
+    async def get_job_status(self, job_id: int) -> Optional[Dict]:
+        """Get current job status without polling - returns immediately."""
+
+        try:
+            access_token = await self.get_access_token()
+            url = f"{self.orchestrator_base}odata/Jobs({job_id})"
+            async with self.http.request('GET', url, headers=self._headers(access_token)) as response:
+                response.raise_for_status()
+                job_data = await response.json()
+        except aiohttp.ClientError as e:
+            print(f"Error checking job status: {e}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return None
+
+        job_status = job_data.get('State', 'Unknown')
+        print(f"Job {job_id} current status: {job_status}")
+
+        # Parse output arguments if they exist and job is successful
+        if job_status in SUCCESS_STATES:
+            output_args = job_data.get('OutputArguments')
+            if output_args:
+                try:
+                    job_data['ParsedOutputArguments'] = json.loads(output_args)
+                except json.JSONDecodeError:
+                    print("Warning: Could not parse output arguments as JSON")
+
+        # Add convenience flags
+        job_data['IsTerminal'] = job_status in TERMINAL_STATES
+        job_data['IsSuccess'] = job_status in SUCCESS_STATES
+        job_data['IsRunning'] = job_status in RUNNING_STATES
+        return job_data
+
+    async def watch_job(self, job_id: int, timeout: int = 300, process_name: Optional[str] = None,
+                        poll_interval: Optional[float] = None) -> AsyncIterator[JobStatusEvent]:
+        """Yield a JobStatusEvent for every state change of a job until it finishes.
+
+        Transitions come from the shared poller, so watching adds no requests
+        of its own. After ``timeout`` seconds a last event flagged
+        ``is_timeout`` is yielded with the state seen so far.
+        """
+
+        strategy = FixedInterval(poll_interval) if poll_interval else None
+        started = time.monotonic()
+        previous_state = None
+        try:
+            async for job_data in self.job_poller.watch(int(job_id), timeout=timeout, strategy=strategy,
+                                                        process_name=process_name):
+                job_state = job_data.get('State', 'Unknown')
+                yield JobStatusEvent(job_id=int(job_id), state=job_state, previous_state=previous_state,
+                                     elapsed=time.monotonic() - started,
+                                     is_terminal=job_state in TERMINAL_STATES, job=job_data)
+                previous_state = job_state
+        except JobPollTimeout as e:
+            last_seen = e.last_seen or {}
+            yield JobStatusEvent(job_id=int(job_id), state=last_seen.get('State', previous_state or 'Unknown'),
+                                 previous_state=previous_state, elapsed=time.monotonic() - started,
+                                 is_terminal=False, is_timeout=True, job=e.last_seen)
+
+    async def _wait_with_status(self, job_id: int, timeout: int, process_name: Optional[str],
+                                poll_interval: Optional[float],
+                                on_status: Callable[[JobStatusEvent], None]) -> Dict:
+        job_data = None
+        async for event in self.watch_job(job_id, timeout, process_name, poll_interval):
+            on_status(event)
+            if event.is_timeout:
+                raise JobPollTimeout(int(job_id), event.job)
+            job_data = event.job
+        return job_data
+
+    async def wait_for_job(self, job_id: int, poll_interval: Optional[float] = None, timeout: int = 300,
+                           process_name: Optional[str] = None, completion_mode: Optional[str] = None,
+                           on_status: Optional[Callable[[JobStatusEvent], None]] = None) -> Optional[Dict]:
+        """Get job outputs, waiting until the job is complete or faulted.
+
+        Passing ``poll_interval`` forces a fixed interval instead of the
+        configured polling strategy; ``process_name`` lets the strategy learn
+        job durations. ``completion_mode`` ("poll" or "webhook") overrides
+        UIPATH_COMPLETION_MODE. ``on_status`` is called with every state
+        change; transitions are only visible to the poller, so it always polls.
+        """
+
+        strategy = FixedInterval(poll_interval) if poll_interval else None
+        try:
+            if on_status is not None:
+                job_data = await self._wait_with_status(job_id, timeout, process_name, poll_interval, on_status)
+            elif (completion_mode or self.cfg["completion_mode"]) == 'webhook':
+                job_data = await self.wait_for_job_webhook(int(job_id), timeout, process_name)
+            else:
+                job_data = await self.job_poller.wait(int(job_id), timeout=timeout,
+                                                      strategy=strategy, process_name=process_name)
+            return process_terminal_job(job_data)
+
+        except JobPollTimeout as e:
+            if e.last_seen is None:
+                print("Timeout reached during error condition")
+                return None
+
+            print(f"Timeout reached ({timeout}s). Job status: {e.last_seen.get('State', 'Unknown')}")
+            # Return current job data with timeout flag
+            job_data = dict(e.last_seen)
+            job_data['IsTimeout'] = True
+            job_data['IsSuccess'] = False
+            return job_data
+
+        except CircuitOpenError as e:
+            print(f"Stopped waiting for job {job_id}: {e}")
+            return None
+        except asyncio.CancelledError:
+            print("Polling cancelled")
+            return None
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return None
+
+    async def start_job_and_wait_for_completion(self, process_release_key: str, input_args: Dict[str, Any],
+                                                poll_interval: Optional[float] = None, timeout: int = 300,
+                                                completion_mode: Optional[str] = None,
+                                                process_name: Optional[str] = None,
+                                                on_status: Optional[Callable[[JobStatusEvent], None]] = None
+                                                ) -> Optional[Dict]:
+        """Start a job and wait for its completion, by polling or webhook.
+
+        Returns the parsed output arguments on success, otherwise the full job
+        payload so the caller can handle the error.
+        """
+
+        start_result = await self.start_jobs(process_release_key, input_args, process_name=process_name)
+        if not start_result.get('value'):
+            print("Could not extract job ID from start response")
+            return None
+
+        job_id = start_result['value'][0]['Id']
+        print(f"Started job with ID: {job_id}")
+
+        result = await self.wait_for_job(job_id, poll_interval=poll_interval, timeout=timeout,
+                                         process_name=process_name, completion_mode=completion_mode,
+                                         on_status=on_status)
+        return self._job_outcome(result)
+
+    @staticmethod
+    def _job_outcome(result: Optional[Dict]) -> Optional[Dict]:
+        """Log a waited-for job and reduce it to its outputs on success, or the full payload otherwise."""
+
+        if result is None:
+            print("Failed to get job result")
+            return None
+
+        if result.get('IsSuccess', False):
+            print("Job completed successfully!")
+            return result.get('ParsedOutputArguments', {})
+
+        print("Job failed!")
+        if 'ErrorDetails' in result:
+            error_details = result['ErrorDetails']
+            print(f"Error Status: {error_details['status']}")
+            print(f"Error Message: {error_details['error_message']}")
+        elif result.get('IsTimeout', False):
+            print("Job timed out")
+        return result
+
+    async def stop_job(self, job_id: int, strategy: str = "SoftStop") -> bool:
+        """Ask Orchestrator to stop a job ("SoftStop" or "Kill")."""
+
+        url = f"{self.orchestrator_base}odata/Jobs/UiPath.Server.Configuration.OData.StopJobs"
+        payload = {"strategy": strategy, "jobIds": [int(job_id)]}
+
+        try:
+            headers = self._headers(await self.get_access_token())
+            async with self.http.request('POST', url, headers=headers, json=payload) as response:
+                response.raise_for_status()
+                return True
+        except aiohttp.ClientError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+        return False
+
+    # === Admission control: only start as many jobs as there are robots to run them ===
+    async def fetch_robot_capacity(self, folder: str) -> Optional[int]:
+        """Count the robot runtimes connected to a folder, from odata/Sessions."""
+
+        access_token = await self.get_access_token()
+        url = f"{self.orchestrator_base}odata/Sessions"
+        async with self.http.request('GET', url, headers=self._headers(access_token, folder)) as response:
+            response.raise_for_status()
+            result = await response.json()
+
+        connected = [s for s in result.get('value', [])
+                     if s.get('State') in ('Available', 'Busy') and not s.get('IsUnresponsive')]
+        return sum(s.get('Runtimes') or 1 for s in connected)
+
+    def _release_slot_on_completion(self, job_id: int, process_name: Optional[str]) -> None:
+        """Give the job's admission slot back once it reaches a terminal state (or the slot times out)."""
+
+        slot_timeout = self.cfg["admission_slot_timeout"]
+
+        async def wait_and_release() -> None:
+            try:
+                if self.cfg["completion_mode"] == 'webhook':
+                    await self.wait_for_job_webhook(job_id, slot_timeout, process_name)
+                else:
+                    await self.job_poller.wait(job_id, timeout=slot_timeout, process_name=process_name)
+            except Exception as e:
+                print(f"Releasing robot slot of job {job_id} without completion: {e}")
+            finally:
+                self.admission.release(self.folder_id, process_name)
+
+        task = asyncio.get_running_loop().create_task(wait_and_release())
+        self._slot_release_tasks.add(task)
+        task.add_done_callback(self._slot_release_tasks.discard)
+
+    # === Webhooks ===
+    async def ensure_webhook_subscription(self) -> Dict:
+        """Subscribe the receiver's public URL to job completion webhooks, unless already subscribed."""
+
+        public_url = self.cfg["webhook_public_url"]
+        if not public_url:
+            raise ValueError("UIPATH_WEBHOOK_PUBLIC_URL must be set to use webhook completion mode")
+
+        access_token = await self.get_access_token()
+        headers = {
+            'Authorization': f'Bearer {access_token}',
+            'Content-Type': 'application/json',
+            'X-UIPATH-TenantName': self.tenant_logical_name
+        }
+
+        url = f"{self.orchestrator_base}odata/Webhooks?$filter=Url eq '{public_url}'"
+        async with self.http.request('GET', url, headers=headers) as response:
+            response.raise_for_status()
+            existing = (await response.json()).get('value', [])
+        if existing:
+            return existing[0]
+
+        payload = {
+            "Name": "LangGraph job completion",
+            "Url": public_url,
+            "Enabled": True,
+            "Secret": self.cfg["webhook_secret"],
+            "SubscribeToAllEvents": False,
+            "AllowInsecureSsl": False,
+            "Events": [{"EventType": event} for event in JOB_WEBHOOK_EVENTS]
+        }
+        url = f"{self.orchestrator_base}odata/Webhooks"
+        async with self.http.request('POST', url, headers=headers, json=payload) as response:
+            response.raise_for_status()
+            print(f"Subscribed {public_url} to UiPath job webhooks")
+            return await response.json()
+
+    async def _start_webhook_receiver(self) -> None:
+        await self.webhook_receiver.start()
+        try:
+            await self.ensure_webhook_subscription()
+        except Exception:
+            # Stop again so the next call retries the subscription
+            await self.webhook_receiver.stop()
+            raise
+
+    async def start_webhook_receiver(self) -> None:
+        """Start the embedded webhook receiver and make sure Orchestrator calls it.
+
+        Concurrent callers share one start-up so the port is bound only once.
+        """
+
+        task = self._webhook_start_task
+        if self.webhook_receiver.is_running and (task is None or task.done()):
+            return
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._webhook_start_task = asyncio.ensure_future(self._start_webhook_receiver())
+        await asyncio.shield(task)
+
+    async def wait_for_job_webhook(self, job_id: int, timeout: int, process_name: Optional[str] = None) -> Dict:
+        """Wait for a job's completion webhook, polling slowly in case the event gets lost.
+
+        Raises ``JobPollTimeout`` like ``JobStatusPoller.wait`` when neither path
+        sees the job finish in time.
+        """
+
+        try:
+            await self.start_webhook_receiver()
+        except Exception as e:
+            print(f"Webhook receiver unavailable, falling back to polling: {e}")
+            return await self.job_poller.wait(job_id, timeout=timeout, process_name=process_name)
+
+        webhook_future = self.webhook_receiver.register(job_id)
+        fallback = FixedInterval(self.cfg["webhook_fallback_interval"])
+        poll_task = asyncio.ensure_future(
+            self.job_poller.wait(job_id, timeout=timeout, strategy=fallback, process_name=process_name))
+        try:
+            await asyncio.wait({webhook_future, poll_task}, return_when=asyncio.FIRST_COMPLETED)
+            if webhook_future.done():
+                return webhook_future.result()
+            return poll_task.result()
+        finally:
+            self.webhook_receiver.unregister(job_id, webhook_future)
+            webhook_future.cancel()
+            poll_task.cancel()
+
+    # === Queue dispatch: enqueue work for a long-running robot instead of starting jobs ===
+    def get_dispatch_queue(self, process_name: str) -> Optional[str]:
+        """Return the queue a process is dispatched through (UIPATH_DISPATCH_QUEUES), or None for jobs."""
+        return self.cfg["dispatch_queues"].get(process_name)
+
+    async def add_queue_items(self, queue_name: str, queue_items: List[Dict[str, Any]]) -> List[Dict]:
+        """Add queue items in one BulkAddQueueItems call and return the items Orchestrator rejected."""
+
+        access_token = await self.get_access_token()
+        url = f"{self.orchestrator_base}odata/Queues/UiPathODataSvc.BulkAddQueueItems"
+        payload = {
+            "commitType": "ProcessAllIndependently",
+            "queueName": queue_name,
+            "queueItems": queue_items
+        }
+        async with self.http.request('POST', url, headers=self._headers(access_token), json=payload) as response:
+            response.raise_for_status()
+            return (await response.json()).get('value', [])
+
+    async def fetch_queue_items(self, references: List[str]) -> List[Dict]:
+        """Fetch queue items by Reference with a single OData query, keeping the latest retry of each."""
+
+        access_token = await self.get_access_token()
+        reference_list = ','.join(f"'{reference}'" for reference in references)
+        url = f"{self.orchestrator_base}odata/QueueItems?$filter=Reference in ({reference_list})"
+        async with self.http.request('GET', url, headers=self._headers(access_token)) as response:
+            response.raise_for_status()
+            result = await response.json()
+
+        # A retried item is cloned under the same Reference; the newest clone carries the status
+        latest: Dict[str, Dict] = {}
+        for item in result.get('value', []):
+            reference = item.get('Reference')
+            if reference not in latest or item.get('Id', 0) > latest[reference].get('Id', 0):
+                latest[reference] = item
+        return list(latest.values())
+
+    async def delete_queue_item(self, queue_item_id: int) -> bool:
+        """Delete a queue item; Orchestrator only allows this while it is still New."""
+
+        url = f"{self.orchestrator_base}odata/QueueItems({queue_item_id})"
+        try:
+            headers = self._headers(await self.get_access_token())
+            async with self.http.request('DELETE', url, headers=headers) as response:
+                response.raise_for_status()
+                return True
+        except aiohttp.ClientError as http_err:
+            print(f"HTTP error occurred: {http_err}")
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+        return False
+
+    async def enqueue_items(self, process_name: str, input_args_list: List[Optional[Dict[str, Any]]],
+                            queue_name: Optional[str] = None,
+                            max_concurrency: Optional[int] = None) -> List[BulkSubmission]:
+        """Add one queue item per input-argument set for the robot serving ``process_name``.
+
+        Items are sent with BulkAddQueueItems in chunks of UIPATH_QUEUE_BULK_SIZE
+        and each gets a unique Reference used to track it. Returns one
+        BulkSubmission (holding a QueueItemHandle) per item, in input order.
+        """
+
+        queue_name = queue_name or self.get_dispatch_queue(process_name)
+        if not queue_name:
+            raise ValueError(f"No dispatch queue configured for process '{process_name}'")
+
+        submissions = [BulkSubmission(index=i, input_args=args) for i, args in enumerate(input_args_list)]
+        references = [f"{process_name}-{uuid.uuid4().hex}" for _ in submissions]
+        queue_items = [
+            {
+                "Name": queue_name,
+                "Priority": "Normal",
+                "Reference": reference,
+                "SpecificContent": submission.input_args or {}
+            }
+            for submission, reference in zip(submissions, references)
+        ]
+
+        semaphore = asyncio.Semaphore(max_concurrency or self.cfg["bulk_submit_concurrency"])
+        chunk_size = self.cfg["queue_bulk_size"]
+
+        async def add_chunk(start: int) -> None:
+            chunk = submissions[start:start + chunk_size]
+            async with semaphore:
+                try:
+                    rejected = await self.add_queue_items(queue_name, queue_items[start:start + chunk_size])
+                except Exception as e:
+                    for submission in chunk:
+                        submission.error = str(e)
+                    return
+
+            rejected_by_reference = {r.get('Reference'): r.get('ErrorMessage') or 'Rejected by Orchestrator'
+                                     for r in rejected}
+            for submission, reference in zip(chunk, references[start:start + chunk_size]):
+                if reference in rejected_by_reference:
+                    submission.error = rejected_by_reference[reference]
+                    continue
+                submission.handle = QueueItemHandle(reference=reference, queue_name=queue_name,
+                                                    process_name=process_name, client=self)
+                self._remember_job_handle(submission.handle)
+
+        await asyncio.gather(*(add_chunk(start) for start in range(0, len(submissions), chunk_size)))
+
+        queued = sum(1 for s in submissions if s.handle is not None)
+        print(f"Queued {queued}/{len(submissions)} items on queue '{queue_name}'")
+        return submissions
+
+    # === Handles ===
+    def _remember_job_handle(self, handle: Any) -> None:
+        key = handle.reference if isinstance(handle, QueueItemHandle) else handle.job_id
+        self._job_handles[key] = handle
+        while len(self._job_handles) > MAX_JOB_HANDLES:
+            # Dicts keep insertion order, so this drops the oldest handle
+            del self._job_handles[next(iter(self._job_handles))]
+
+    def get_job_handle(self, job_id: Any, process_name: str = "") -> Any:
+        """Return the handle of a submitted job, rebuilding a bare one if it is not known.
+
+        ``job_id`` may also be the Reference of a queue item, giving a QueueItemHandle.
+        """
+
+        if isinstance(job_id, str) and not job_id.isdigit():
+            handle = self._job_handles.get(job_id)
+            if handle is None:
+                handle = QueueItemHandle(reference=job_id, queue_name="", process_name=process_name, client=self)
+                self._remember_job_handle(handle)
+            return handle
+
+        handle = self._job_handles.get(int(job_id))
+        if handle is None:
+            handle = JobHandle(job_id=int(job_id), release_key="", process_name=process_name, client=self)
+            self._remember_job_handle(handle)
+        return handle
+
+    async def get_job_result(self, job_id: Any, timeout: int = 0) -> Optional[Dict]:
+        """Return a submitted job's (or queue item's) result, waiting at most ``timeout`` seconds (0 = status only)."""
+
+        handle = self.get_job_handle(job_id)
+        if timeout <= 0:
+            return await handle.status()
+        return await handle.result(timeout=timeout)
+
+    # === Submission ===
+    async def submit_job(self, process_name: str, input_args: Optional[Dict[str, Any]] = None,
+                         priority: int = 0) -> Any:
+        """Start a UiPath process and return a JobHandle immediately, without waiting for the job.
+
+        The call only waits for admission control, if robots are busy, ahead of
+        lower ``priority`` submissions. Processes configured in
+        UIPATH_DISPATCH_QUEUES are queued instead and give a QueueItemHandle.
+        """
+
+        if self.get_dispatch_queue(process_name):
+            submission = (await self.enqueue_items(process_name, [input_args]))[0]
+            if submission.handle is None:
+                raise RuntimeError(submission.error)
+            return submission.handle
+
+        release_key, start_result = await self._with_release_key(
+            process_name, lambda key: self.start_jobs(key, input_args, process_name=process_name,
+                                                      priority=priority))
+        if not start_result.get('value'):
+            raise RuntimeError(f"Could not start process '{process_name}'")
+
+        handle = JobHandle(job_id=start_result['value'][0]['Id'], release_key=release_key,
+                           process_name=process_name, client=self)
+        self._remember_job_handle(handle)
+        print(f"Submitted job with ID: {handle.job_id}")
+        return handle
+
+    async def submit_jobs(self, process_name: str, input_args_list: List[Optional[Dict[str, Any]]],
+                          max_concurrency: Optional[int] = None, priority: int = 0) -> List[BulkSubmission]:
+        """Start one job per input-argument set with as few StartJobs calls as possible.
+
+        Items with identical arguments are started together through the
+        StartJobs ``JobsCount``; distinct argument sets are submitted concurrently,
+        at most ``max_concurrency`` (UIPATH_BULK_SUBMIT_CONCURRENCY) at a time.
+        Returns one BulkSubmission per item, in input order; a failed StartJobs
+        call only fails the items it carried. Processes configured in
+        UIPATH_DISPATCH_QUEUES are enqueued with ``enqueue_items`` instead.
+        """
+
+        if self.get_dispatch_queue(process_name):
+            return await self.enqueue_items(process_name, input_args_list, max_concurrency=max_concurrency)
+
+        submissions = [BulkSubmission(index=i, input_args=args) for i, args in enumerate(input_args_list)]
+        if not submissions:
+            return submissions
+
+        groups: Dict[str, List[BulkSubmission]] = {}
+        for submission in submissions:
+            groups.setdefault(json.dumps(submission.input_args, sort_keys=True), []).append(submission)
+
+        release_key = await self.get_release_key(process_name)
+        release_lock = asyncio.Lock()
+        semaphore = asyncio.Semaphore(max_concurrency or self.cfg["bulk_submit_concurrency"])
+
+        async def refresh_release_key(stale_key: str) -> str:
+            nonlocal release_key
+            async with release_lock:
+                # Only the first group to hit the stale key looks the release up again
+                if release_key == stale_key:
+                    self.release_cache.invalidate(self.folder_id, process_name)
+                    release_key = await self.get_release_key(process_name, use_cache=False)
+                return release_key
+
+        async def submit_group(group: List[BulkSubmission]) -> None:
+            async with semaphore:
+                used_key = release_key
+                try:
+                    try:
+                        start_result = await self.start_jobs(used_key, group[0].input_args, jobs_count=len(group),
+                                                             process_name=process_name, priority=priority)
+                    except ReleaseNotFoundError:
+                        used_key = await refresh_release_key(used_key)
+                        start_result = await self.start_jobs(used_key, group[0].input_args, jobs_count=len(group),
+                                                             process_name=process_name, priority=priority)
+                except Exception as e:
+                    for submission in group:
+                        submission.error = str(e)
+                    return
+
+            jobs = start_result.get('value') or []
+            for submission, job in zip(group, jobs):
+                submission.handle = JobHandle(job_id=job['Id'], release_key=used_key,
+                                              process_name=process_name, client=self)
+                self._remember_job_handle(submission.handle)
+            for submission in group[len(jobs):]:
+                submission.error = f"Could not start process '{process_name}'"
+
+        await asyncio.gather(*(submit_group(group) for group in groups.values()))
+
+        submitted = sum(1 for s in submissions if s.handle is not None)
+        print(f"Submitted {submitted}/{len(submissions)} jobs in {len(groups)} StartJobs calls")
+        return submissions
+
+    async def call_process(self, process_name: str, input_args: Optional[Dict[str, Any]] = None,
+                           completion_mode: Optional[str] = None,
+                           on_status: Optional[Callable[[JobStatusEvent], None]] = None,
+                           idempotency_key: Optional[str] = None) -> Dict:
+        """Call a UiPath process by name and wait for the job to finish.
+
+        ``completion_mode="webhook"`` waits for the job's completion webhook
+        instead of polling; it defaults to UIPATH_COMPLETION_MODE. ``on_status``
+        receives the job's state transitions while waiting. Calls repeating an
+        ``idempotency_key`` (see ``make_idempotency_key``) within
+        UIPATH_IDEMPOTENCY_TTL wait for the first call's job, or return its
+        response once it succeeded, instead of starting another job. Processes
+        configured in UIPATH_DISPATCH_QUEUES are added to their queue instead,
+        and the call waits for the queue item to be processed.
+        """
+
+        if idempotency_key and self.idempotency is not None and not self.get_dispatch_queue(process_name):
+            try:
+                return await self._call_process_once(idempotency_key, process_name, input_args,
+                                                     completion_mode, on_status)
+            except Exception as e:
+                return {
+                    "status": "error",
+                    "message": str(e)
+                }
+
+        try:
+            queue_name = self.get_dispatch_queue(process_name)
+            if queue_name:
+                submission = (await self.enqueue_items(process_name, [input_args], queue_name))[0]
+                if submission.handle is None:
+                    return {"status": "error", "message": submission.error}
+                # Wait for a robot to process the item, as job mode waits for the job
+                self._job_outcome(await submission.handle.result())
+                return {
+                    "status": "Running",
+                    "message": f"Queued '{process_name}' on queue '{queue_name}'",
+                    "reference": submission.handle.reference
+                }
+
+            await self._with_release_key(
+                process_name, lambda key: self.start_job_and_wait_for_completion(
+                    key, input_args, completion_mode=completion_mode, process_name=process_name,
+                    on_status=on_status))
+
+            return {
+                "status": "Running",
+                "message": f"Started process '{process_name}'",
+                # "orchestrator_response": result
+            }
+        except Exception as e:
+            return {
+                "status": "error",
+                "message": str(e)
+            }
+
+    async def _call_process_once(self, key: str, process_name: str, input_args: Optional[Dict[str, Any]],
+                                 completion_mode: Optional[str],
+                                 on_status: Optional[Callable[[JobStatusEvent], None]]) -> Dict:
+        """Share one execution between concurrent calls with the same key on this loop."""
+
+        task = self._idempotent_calls.get(key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._idempotent_calls[key] = asyncio.ensure_future(
+                self._run_idempotent(key, process_name, input_args, completion_mode, on_status))
+
+            def forget(done: asyncio.Task) -> None:
+                if self._idempotent_calls.get(key) is done:
+                    del self._idempotent_calls[key]
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    async def _run_idempotent(self, key: str, process_name: str, input_args: Optional[Dict[str, Any]],
+                              completion_mode: Optional[str],
+                              on_status: Optional[Callable[[JobStatusEvent], None]]) -> Dict:
+        response = {
+            "status": "Running",
+            "message": f"Started process '{process_name}'",
+        }
+
+        record = self.idempotency.get(key)
+        if record is not None and record['response'] is not None:
+            print(f"Reusing the result of job {record['job_id']} for a repeated '{process_name}' call")
+            return record['response']
+
+        if record is not None:
+            job_id = record['job_id']
+            print(f"Waiting for job {job_id} started by an earlier identical call")
+        else:
+            _, start_result = await self._with_release_key(
+                process_name, lambda release_key: self.start_jobs(release_key, input_args,
+                                                                  process_name=process_name))
+            if not start_result.get('value'):
+                raise RuntimeError(f"Could not start process '{process_name}'")
+            job_id = start_result['value'][0]['Id']
+            print(f"Started job with ID: {job_id}")
+            self.idempotency.record_start(key, process_name, job_id)
+
+        result = await self.wait_for_job(job_id, process_name=process_name, completion_mode=completion_mode,
+                                         on_status=on_status)
+        self._job_outcome(result)
+
+        if result is not None and result.get('IsSuccess', False):
+            self.idempotency.record_response(key, response)
+        elif result is not None and not result.get('IsTimeout', False):
+            # The job failed: let the next identical call try again
+            self.idempotency.discard(key)
+        return response
+
+    # === Lifecycle ===
+    async def close(self) -> None:
+        """Stop the webhook receiver and close the pooled Orchestrator sessions."""
+        await self.webhook_receiver.stop()
+        await self.http.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of every shared component, for diagnostics and benchmarks."""
+        return {
+            'http': self.http.stats(),
+            'token': self.token_manager.stats(),
+            'release_cache': self.release_cache.stats(),
+            'job_poller': self.job_poller.stats(),
+            'queue_item_poller': self.queue_item_poller.stats(),
+            'admission': self.admission.stats() if self.admission is not None else None,
+            'webhooks': self.webhook_receiver.stats(),
+            'idempotency': self.idempotency.stats() if self.idempotency is not None else None,
+        }
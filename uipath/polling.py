@@ -0,0 +1,136 @@
+import random
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+
+
+class PollingStrategy(ABC):
+    """Decides how long to wait before the next status check of a job.
+
+    ``attempt`` is the number of checks already made for the job and
+    ``elapsed`` the seconds since it was submitted.
+    """
+
+    @abstractmethod
+    def next_delay(self, attempt: int, elapsed: float, process_name: Optional[str] = None) -> float:
+        """Seconds to wait before the next check of the job."""
+
+    def record_duration(self, process_name: Optional[str], duration: float) -> None:
+        """Feed back how long a finished job took; ignored by non-learning strategies."""
+
+
+class FixedInterval(PollingStrategy):
+    """Check every ``interval`` seconds (the original behaviour)."""
+
+    def __init__(self, interval: float = 5):
+        self.interval = interval
+
+    def next_delay(self, attempt: int, elapsed: float, process_name: Optional[str] = None) -> float:
+        return self.interval
+
+
+class ExponentialBackoff(PollingStrategy):
+    """Poll quickly at first and back off exponentially up to ``cap`` seconds.
+
+    Short jobs are noticed within about ``initial`` seconds while long jobs
+    settle at one request every ``cap`` seconds. ``jitter`` spreads the checks
+    of jobs started together by up to that fraction of the delay.
+    """
+
+    def __init__(self, initial: float = 1, factor: float = 1.5, cap: float = 15, jitter: float = 0.1):
+        self.initial = initial
+        self.factor = factor
+        self.cap = cap
+        self.jitter = jitter
+
+    def _jittered(self, delay: float) -> float:
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def next_delay(self, attempt: int, elapsed: float, process_name: Optional[str] = None) -> float:
+        return self._jittered(min(self.cap, self.initial * self.factor ** attempt))
+
+
+class DurationModel:
+    """Per-process running estimate of job duration learned from finished jobs.
+
+    Keeps an exponentially weighted mean and mean absolute deviation so the
+    estimate follows redeployments that make a process faster or slower.
+    """
+
+    def __init__(self, alpha: float = 0.2, min_samples: int = 3):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        # process_name -> (mean, deviation, samples)
+        self._estimates: Dict[str, Tuple[float, float, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, process_name: str, duration: float) -> None:
+        with self._lock:
+            estimate = self._estimates.get(process_name)
+            if estimate is None:
+                self._estimates[process_name] = (duration, 0.0, 1)
+                return
+            mean, deviation, samples = estimate
+            deviation += self.alpha * (abs(duration - mean) - deviation)
+            mean += self.alpha * (duration - mean)
+            self._estimates[process_name] = (mean, deviation, samples + 1)
+
+    def expected(self, process_name: Optional[str]) -> Optional[Tuple[float, float]]:
+        """Return (mean, deviation) once enough samples were seen, else None."""
+
+        with self._lock:
+            estimate = self._estimates.get(process_name) if process_name else None
+            if estimate is None or estimate[2] < self.min_samples:
+                return None
+            return estimate[0], estimate[1]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {'mean': mean, 'deviation': deviation, 'samples': samples}
+                for name, (mean, deviation, samples) in self._estimates.items()
+            }
+
+
+class LearnedBackoff(ExponentialBackoff):
+    """Exponential backoff that sleeps through the part of a job that is known to take time.
+
+    Until the earliest likely finish (mean minus deviation of past runs of the
+    same process) the job is left alone; after that it is polled quickly and
+    the delay grows with how far the job is overdue. Processes without enough
+    history fall back to plain exponential backoff.
+    """
+
+    def __init__(self, model: Optional[DurationModel] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.model = model or DurationModel()
+
+    def next_delay(self, attempt: int, elapsed: float, process_name: Optional[str] = None) -> float:
+        expected = self.model.expected(process_name)
+        if expected is None:
+            return super().next_delay(attempt, elapsed, process_name)
+
+        mean, deviation = expected
+        earliest_finish = max(0.0, mean - deviation)
+        if elapsed < earliest_finish:
+            return min(self.cap, max(self.initial, earliest_finish - elapsed))
+
+        overdue = elapsed - earliest_finish
+        return self._jittered(min(self.cap, max(self.initial, overdue * (self.factor - 1))))
+
+    def record_duration(self, process_name: Optional[str], duration: float) -> None:
+        if process_name:
+            self.model.record(process_name, duration)
+
+
+def create_polling_strategy(name: str, initial: float = 1, factor: float = 1.5,
+                            cap: float = 15, jitter: float = 0.1, interval: float = 5) -> PollingStrategy:
+    """Build a strategy from its configuration name: fixed, backoff or learned."""
+
+    if name == 'fixed':
+        return FixedInterval(interval)
+    if name == 'backoff':
+        return ExponentialBackoff(initial=initial, factor=factor, cap=cap, jitter=jitter)
+    if name == 'learned':
+        return LearnedBackoff(initial=initial, factor=factor, cap=cap, jitter=jitter)
+    raise ValueError(f"Unknown polling strategy: {name}")
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class ReleaseNotFoundError(Exception):
+    """Raised when Orchestrator has no release for the requested process."""
+
+
+class ReleaseKeyCache:
+    """In-memory cache of process release keys keyed by folder and process name.
+
+    Release keys only change when a process is redeployed, so entries are kept
+    for ``ttl`` seconds and dropped early through ``invalidate`` when
+    Orchestrator reports the release as missing. When ``persist_path`` is set
+    the cache is also written to a JSON file so restarts start warm.
+    """
+
+    def __init__(self, ttl: float = 3600, persist_path: Optional[str] = None):
+        self.ttl = ttl
+        self.persist_path = persist_path
+
+        # (folder_id, process_name) -> (release_key, cached_at wall-clock time)
+        self._entries: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        if persist_path:
+            self._load()
+
+    def get(self, folder_id: str, process_name: str) -> Optional[str]:
+        """Return the cached release key, or None when missing or expired."""
+
+        with self._lock:
+            entry = self._entries.get((str(folder_id), process_name))
+            if entry is None or time.time() - entry[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[0]
+
+    def set(self, folder_id: str, process_name: str, release_key: str) -> None:
+        self.set_many(folder_id, {process_name: release_key})
+
+    def set_many(self, folder_id: str, release_keys: Dict[str, str]) -> None:
+        """Store several release keys of one folder at once (used by the preload)."""
+
+        now = time.time()
+        with self._lock:
+            for process_name, release_key in release_keys.items():
+                self._entries[(str(folder_id), process_name)] = (release_key, now)
+            self._save()
+
+    def invalidate(self, folder_id: str, process_name: Optional[str] = None) -> None:
+        """Drop one process, or the whole folder when no process name is given."""
+
+        with self._lock:
+            keys = [k for k in self._entries
+                    if k[0] == str(folder_id) and (process_name is None or k[1] == process_name)]
+            for k in keys:
+                del self._entries[k]
+            self.invalidations += len(keys)
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
+
+    def _load(self) -> None:
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Warning: Could not load release key cache: {e}")
+            return
+
+        for entry in data:
+            self._entries[(entry['folder_id'], entry['process_name'])] = (entry['release_key'], entry['cached_at'])
+
+    def _save(self) -> None:
+        """Write the cache to disk (lock held); the file is replaced atomically."""
+
+        if not self.persist_path:
+            return
+
+        data = [
+            {'folder_id': k[0], 'process_name': k[1], 'release_key': v[0], 'cached_at': v[1]}
+            for k, v in self._entries.items()
+        ]
+        tmp_path = f"{self.persist_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.persist_path)
+        except OSError as e:
+            print(f"Warning: Could not persist release key cache: {e}")
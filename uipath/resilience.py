@@ -0,0 +1,138 @@
+import random
+import threading
+import time
+from typing import Any, Dict
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Orchestrator while the circuit breaker is open."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Orchestrator unavailable (circuit open), retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Fails calls fast after ``failure_threshold`` consecutive failures.
+
+    Once open, calls raise ``CircuitOpenError`` for ``recovery_timeout``
+    seconds; then a single trial call is let through (half-open) and its
+    outcome closes the circuit again or re-opens it for another period.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise ``CircuitOpenError`` unless a call may go out now."""
+
+        with self._lock:
+            if self._state == 'closed':
+                return
+            remaining = self._opened_at + self.recovery_timeout - time.monotonic()
+            if self._state == 'open' and remaining <= 0:
+                self._state = 'half_open'
+            if self._state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(max(0.0, remaining))
+
+    def release_trial(self) -> None:
+        """Let another trial call through when one ended without an outcome (e.g. cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = 'closed'
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == 'half_open' or self._failures >= self.failure_threshold:
+                if self._state != 'open':
+                    self.opened += 1
+                    print(f"Orchestrator circuit opened after {self._failures} failures")
+                self._state = 'open'
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'opened': self.opened,
+                'rejected': self.rejected,
+            }
+
+
+class RetryBudget:
+    """Token bucket that caps retries to a fraction of the traffic.
+
+    Every request deposits ``ratio`` tokens and every retry spends one, with a
+    floor of ``min_per_second`` retries so a quiet client can still retry.
+    When Orchestrator is struggling, retries therefore add at most ``ratio``
+    extra load instead of multiplying it.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1, max_tokens: float = 20):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.retries = 0
+        self.exhausted = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated_at) * self.min_per_second)
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for one retry; False when the budget is used up."""
+
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                self.exhausted += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {'tokens': round(self._tokens, 2), 'retries': self.retries, 'exhausted': self.exhausted}
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8) -> float:
+    """Full-jitter exponential backoff for retry number ``attempt`` (starting at 0)."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class TokenManager:
+    """Process-wide cache for the Orchestrator client-credentials token.
+
+    The token is served from memory until ``expiry_margin`` seconds before it
+    expires. Once it enters the ``refresh_ahead`` window callers still get the
+    cached token while a single background refresh replaces it, so concurrent
+    callers never stampede the identity endpoint.
+    """
+
+    def __init__(self, fetch_token: Callable[[], Awaitable[Dict[str, Any]]],
+                 expiry_margin: float = 60, refresh_ahead: float = 300):
+        self._fetch_token = fetch_token
+        self.expiry_margin = expiry_margin
+        self.refresh_ahead = refresh_ahead
+
+        self._access_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.background_refreshes = 0
+        self.failures = 0
+
+    def _is_valid(self, now: float) -> bool:
+        return self._access_token is not None and now < self._expires_at - self.expiry_margin
+
+    def _needs_refresh(self, now: float) -> bool:
+        return now >= self._expires_at - self.refresh_ahead
+
+    async def get_token(self) -> str:
+        """Return a valid access token, fetching one only when the cache cannot serve it."""
+
+        now = time.monotonic()
+        with self._lock:
+            if self._is_valid(now):
+                self.hits += 1
+                if self._needs_refresh(now):
+                    self._ensure_refresh(background=True)
+                return self._access_token
+            self.misses += 1
+            task = self._ensure_refresh(background=False)
+
+        # Shield the shared refresh so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    def _ensure_refresh(self, background: bool) -> asyncio.Task:
+        """Return the in-flight refresh task for this loop, starting one if needed (lock held)."""
+
+        loop = asyncio.get_running_loop()
+        task = self._refresh_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            if background:
+                self.background_refreshes += 1
+            task = loop.create_task(self._refresh())
+            # Failures are counted and logged in _refresh; retrieve them so background runs stay quiet
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._refresh_task = task
+        return task
+
+    async def _refresh(self) -> str:
+        try:
+            result = await self._fetch_token()
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            print(f"Token refresh failed: {e}")
+            raise
+
+        expires_in = float(result.get('expires_in', 3600))
+        with self._lock:
+            self.refreshes += 1
+            self._access_token = result['access_token']
+            self._expires_at = time.monotonic() + expires_in
+            return self._access_token
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop the cached token, e.g. after Orchestrator rejected it with a 401.
+
+        With ``token`` given, the cache is only dropped while it still holds
+        that token, so a late rejection does not discard its replacement.
+        """
+
+        with self._lock:
+            if token is None or self._access_token == token:
+                self._access_token = None
+                self._expires_at = 0.0
+
+    async def renew(self, rejected_token: str) -> str:
+        """Return a fresh token after ``rejected_token`` was refused (401), e.g. because it was revoked.
+
+        Only the first caller to report a given token drops it; callers
+        rejected concurrently share the one refresh that follows.
+        """
+
+        self.invalidate(rejected_token)
+        return await self.get_token()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/refresh counters and the remaining token lifetime."""
+
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'background_refreshes': self.background_refreshes,
+                'failures': self.failures,
+                'expires_in': max(0.0, self._expires_at - time.monotonic()) if self._access_token else 0.0,
+            }
+
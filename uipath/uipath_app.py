@@ -11,7 +11,7 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from uipath.call_uipath_process import call_uipath_process
+    from uipath.call_uipath_process_sync import call_uipath_process
 except ImportError as e:
     st.error(f"Import error: {e}")
     st.error("Please make sure the utils and uipath modules are available")
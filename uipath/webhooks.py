@@ -0,0 +1,161 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+JOB_WEBHOOK_EVENTS = ['job.completed', 'job.faulted']
+
+
+def sign_webhook_body(secret: str, body: bytes) -> str:
+    """Compute the X-UiPath-Signature value (base64 HMAC-SHA256 of the raw body)."""
+    return base64.b64encode(hmac.new(secret.encode('utf-8'), body, hashlib.sha256).digest()).decode('ascii')
+
+
+def job_from_webhook(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a job webhook event into the same shape as an odata/Jobs payload."""
+
+    job_data = dict(event.get('Job') or {})
+    # Webhooks deliver output arguments as an object, OData as a JSON string
+    output_args = job_data.get('OutputArguments')
+    if output_args is not None and not isinstance(output_args, str):
+        job_data['OutputArguments'] = json.dumps(output_args)
+    if 'State' not in job_data:
+        job_data['State'] = 'Successful' if event.get('Type') == 'job.completed' else 'Faulted'
+    return job_data
+
+
+class WebhookReceiver:
+    """Small embedded HTTP server that receives Orchestrator job webhooks.
+
+    Callers ``register`` a job id and await the returned future, which is
+    resolved with the job payload when a ``job.completed`` or ``job.faulted``
+    event arrives. Events for jobs nobody waits on yet are kept for
+    ``retention`` seconds, so a job finishing before its waiter registers is
+    not lost.
+    """
+
+    def __init__(self, host: str = '0.0.0.0', port: int = 8765, path: str = '/uipath/webhooks',
+                 secret: Optional[str] = None, retention: float = 600):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret = secret
+        self.retention = retention
+
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiters: Dict[int, List[asyncio.Future]] = {}
+        self._recent: Dict[int, Tuple[Dict[str, Any], float]] = {}
+        self._lock = threading.Lock()
+
+        self.events_received = 0
+        self.events_rejected = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._runner is not None and self._loop is not None and not self._loop.is_closed()
+
+    async def start(self) -> None:
+        """Start listening on the running loop; a no-op when already running."""
+
+        if self.is_running:
+            return
+        app = web.Application()
+        app.router.add_post(self.path, self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self._loop = asyncio.get_running_loop()
+        print(f"UiPath webhook receiver listening on {self.host}:{self.port}{self.path}")
+
+    async def stop(self) -> None:
+        """Stop listening; the runner is cleaned up on the loop that started it."""
+
+        runner, loop = self._runner, self._loop
+        self._runner = None
+        self._loop = None
+        if runner is None or loop is None or loop.is_closed():
+            return
+        if loop is asyncio.get_running_loop():
+            await runner.cleanup()
+        elif loop.is_running():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(runner.cleanup(), loop))
+
+    def register(self, job_id: int) -> asyncio.Future:
+        """Return a future resolved with the job payload once its terminal webhook arrives."""
+
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            recent = self._recent.pop(job_id, None)
+            if recent is None:
+                self._waiters.setdefault(job_id, []).append(future)
+        if recent is not None:
+            future.set_result(dict(recent[0]))
+        return future
+
+    def unregister(self, job_id: int, future: asyncio.Future) -> None:
+        with self._lock:
+            waiters = self._waiters.get(job_id, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._waiters.pop(job_id, None)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        if self.secret:
+            signature = request.headers.get('X-UiPath-Signature', '')
+            if not hmac.compare_digest(signature, sign_webhook_body(self.secret, body)):
+                self.events_rejected += 1
+                return web.Response(status=401)
+
+        try:
+            event = json.loads(body)
+        except json.JSONDecodeError:
+            self.events_rejected += 1
+            return web.Response(status=400)
+
+        self.events_received += 1
+        if event.get('Type') in JOB_WEBHOOK_EVENTS:
+            self.dispatch(job_from_webhook(event))
+        # Orchestrator only needs a 2xx; other event types are acknowledged and ignored
+        return web.Response(status=202)
+
+    def dispatch(self, job_data: Dict[str, Any]) -> None:
+        """Resolve the waiters of a terminal job, or keep the event for a late waiter."""
+
+        job_id = job_data.get('Id')
+        now = time.monotonic()
+        with self._lock:
+            waiters = self._waiters.pop(job_id, [])
+            if not waiters:
+                self._recent[job_id] = (job_data, now)
+            for stale_id in [k for k, (_, at) in self._recent.items() if now - at > self.retention]:
+                del self._recent[stale_id]
+
+        for future in waiters:
+            # Waiters may live on another loop (e.g. a sync caller's background loop)
+            loop = future.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._resolve, future, dict(job_data))
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, job_data: Dict[str, Any]) -> None:
+        if not future.done():
+            future.set_result(job_data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'running': self.is_running,
+                'waiting_jobs': len(self._waiters),
+                'buffered_events': len(self._recent),
+                'events_received': self.events_received,
+                'events_rejected': self.events_rejected,
+            }
@@ -1,3 +1,4 @@
+import json
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -12,6 +13,8 @@ def get_uipath_config():
     """
     # Get the root directory of the project (adjust if needed)
     BASE_DIR = Path(__file__).resolve().parent.parent
+    # Per-user directory for files the app keeps across restarts
+    STATE_DIR = Path(os.getenv("XDG_STATE_HOME") or Path.home() / '.local' / 'state') / 'react_agent'
 
     # Load environment variables from `.env`
     load_dotenv(BASE_DIR / 'venv' / '.env')
@@ -23,6 +26,71 @@ def get_uipath_config():
         "tenant_logical_name": os.getenv("UIPATH_OAUTH_TENANT"),
         "base_url": os.getenv("UIPATH_CLOUD_URL", "https://cloud.uipath.com"),
         "folder_id": os.getenv("UIPATH_FOLDER_ID"),
+        # Seconds before expiry at which a cached token is no longer handed out
+        "token_expiry_margin": float(os.getenv("UIPATH_TOKEN_EXPIRY_MARGIN", "60")),
+        # Seconds before expiry at which the cached token is refreshed in the background
+        "token_refresh_ahead": float(os.getenv("UIPATH_TOKEN_REFRESH_AHEAD", "300")),
+        # Connection pool shared by all Orchestrator requests
+        "http_pool_limit": int(os.getenv("UIPATH_HTTP_POOL_LIMIT", "100")),
+        "http_pool_limit_per_host": int(os.getenv("UIPATH_HTTP_POOL_LIMIT_PER_HOST", "20")),
+        "http_keepalive_timeout": float(os.getenv("UIPATH_HTTP_KEEPALIVE_TIMEOUT", "30")),
+        "http_dns_cache_ttl": int(os.getenv("UIPATH_HTTP_DNS_CACHE_TTL", "300")),
+        "http_timeout": float(os.getenv("UIPATH_HTTP_TIMEOUT", "60")),
+        # Idempotent requests are retried with jittered backoff while the retry budget allows
+        "http_max_retries": int(os.getenv("UIPATH_HTTP_MAX_RETRIES", "3")),
+        "http_retry_base": float(os.getenv("UIPATH_HTTP_RETRY_BASE", "0.5")),
+        "http_retry_cap": float(os.getenv("UIPATH_HTTP_RETRY_CAP", "8")),
+        # Retries allowed per request made (plus a floor per second)
+        "retry_budget_ratio": float(os.getenv("UIPATH_RETRY_BUDGET_RATIO", "0.2")),
+        "retry_budget_min_per_second": float(os.getenv("UIPATH_RETRY_BUDGET_MIN_PER_SECOND", "1")),
+        # Fail fast for this many seconds after this many consecutive Orchestrator failures
+        "circuit_failure_threshold": int(os.getenv("UIPATH_CIRCUIT_FAILURE_THRESHOLD", "5")),
+        "circuit_recovery_timeout": float(os.getenv("UIPATH_CIRCUIT_RECOVERY_TIMEOUT", "30")),
+        # Release keys only change on deployment; set a path to persist them across restarts
+        "release_cache_ttl": float(os.getenv("UIPATH_RELEASE_CACHE_TTL", "3600")),
+        "release_cache_path": os.getenv("UIPATH_RELEASE_CACHE_PATH"),
+        "preload_releases": os.getenv("UIPATH_PRELOAD_RELEASES", "true").lower() == "true",
+        # Shared job status poller: one batched Jobs query per tick for all in-flight jobs
+        "job_poll_batch_size": int(os.getenv("UIPATH_JOB_POLL_BATCH_SIZE", "50")),
+        # Polling schedule: "fixed", "backoff" or "learned" (backoff tuned by past job durations)
+        "job_poll_strategy": os.getenv("UIPATH_JOB_POLL_STRATEGY", "backoff"),
+        "job_poll_interval": float(os.getenv("UIPATH_JOB_POLL_INTERVAL", "5")),
+        "job_poll_initial": float(os.getenv("UIPATH_JOB_POLL_INITIAL", "1")),
+        "job_poll_factor": float(os.getenv("UIPATH_JOB_POLL_FACTOR", "1.5")),
+        "job_poll_cap": float(os.getenv("UIPATH_JOB_POLL_CAP", "15")),
+        "job_poll_jitter": float(os.getenv("UIPATH_JOB_POLL_JITTER", "0.1")),
+        # "poll" or "webhook": wait for job.completed/job.faulted webhooks instead of polling
+        "completion_mode": os.getenv("UIPATH_COMPLETION_MODE", "poll"),
+        "webhook_host": os.getenv("UIPATH_WEBHOOK_HOST", "0.0.0.0"),
+        "webhook_port": int(os.getenv("UIPATH_WEBHOOK_PORT", "8765")),
+        # URL Orchestrator posts to; must reach the receiver (e.g. https://agent.example.com/uipath/webhooks)
+        "webhook_public_url": os.getenv("UIPATH_WEBHOOK_PUBLIC_URL"),
+        "webhook_secret": os.getenv("UIPATH_WEBHOOK_SECRET"),
+        # Slow safety-net polling while waiting for a webhook that may never arrive
+        "webhook_fallback_interval": float(os.getenv("UIPATH_WEBHOOK_FALLBACK_INTERVAL", "30")),
+        # Bulk submission: identical inputs share one StartJobs call, distinct ones run this many at a time
+        "bulk_submit_concurrency": int(os.getenv("UIPATH_BULK_SUBMIT_CONCURRENCY", "10")),
+        # Processes dispatched through an Orchestrator queue instead of one job per call,
+        # as JSON mapping process name to queue name, e.g. {"Create.Authority.to.Trade.Form": "ATT_Forms"}
+        "dispatch_queues": json.loads(os.getenv("UIPATH_DISPATCH_QUEUES", "{}")),
+        # Items per BulkAddQueueItems request
+        "queue_bulk_size": int(os.getenv("UIPATH_QUEUE_BULK_SIZE", "1000")),
+        # Jobs per folder allowed to run at once; 0 learns it from the connected robots (odata/Sessions)
+        "robot_capacity": int(os.getenv("UIPATH_ROBOT_CAPACITY", "0")),
+        # Admission control: hold job starts locally until a robot is free to run them.
+        # On by default only when UIPATH_ROBOT_CAPACITY gives the capacity; set to true to learn it
+        "admission_control": os.getenv("UIPATH_ADMISSION_CONTROL",
+                                       "true" if int(os.getenv("UIPATH_ROBOT_CAPACITY", "0")) > 0
+                                       else "false").lower() == "true",
+        "robot_capacity_refresh": float(os.getenv("UIPATH_ROBOT_CAPACITY_REFRESH", "60")),
+        # Optional per-process caps as JSON, e.g. {"Create.Authority.to.Trade.Form": 2}
+        "process_concurrency": json.loads(os.getenv("UIPATH_PROCESS_CONCURRENCY", "{}")),
+        # Seconds after which the slot of a job never seen finishing is given back
+        "admission_slot_timeout": float(os.getenv("UIPATH_ADMISSION_SLOT_TIMEOUT", "3600")),
+        # Repeated identical process calls reuse the first job for this many seconds (0 disables)
+        "idempotency_ttl": float(os.getenv("UIPATH_IDEMPOTENCY_TTL", "3600")),
+        # SQLite file keeping idempotency keys across restarts, opened on the first keyed call
+        "idempotency_path": os.getenv("UIPATH_IDEMPOTENCY_PATH", str(STATE_DIR / 'uipath_idempotency.sqlite3')),
     }
 
     # Optionally validate required keys